@@ -1,18 +1,34 @@
 import yfinance as yf
 import os
+import pandas as pd
 
-# Dossier data
+from utils.partitioned_store import PartitionedStore
+
+# Dossier data : historique partitionné data/partitions/<symbole>/<année>/<mois>
 os.makedirs("data", exist_ok=True)
+store = PartitionedStore(os.path.join("data", "partitions"))
 
 symbols = ['XAUUSD=X', 'EURUSD=X']
+HISTORY_START = '2023-01-01'
+
 for sym in symbols:
+    name = sym.replace('=X', '')
+
+    # Mise à jour incrémentale : on reprend à la dernière bougie stockée
+    last = store.last_timestamp(name)
+    start = last.strftime('%Y-%m-%d') if last is not None else HISTORY_START
+
     # Télécharger les données
-    data = yf.download(sym, start='2023-01-01', end='2025-01-01', interval='15m')
+    data = yf.download(sym, start=start, interval='15m')
+    if data.empty:
+        print(f"ℹ️  Pas de nouvelles données pour {sym}")
+        continue
 
     # Nettoyer le DataFrame
     data = data.reset_index()  # datetime en colonne
     data.rename(columns={
         'Date': 'datetime',
+        'Datetime': 'datetime',
         'Open': 'open',
         'High': 'high',
         'Low': 'low',
@@ -27,7 +43,11 @@ for sym in symbols:
     # Convertir en float si nécessaire
     data[['open', 'high', 'low', 'close', 'volume']] = data[['open', 'high', 'low', 'close', 'volume']].astype(float)
 
-    # Sauvegarder CSV
-    filename = f"data/{sym.replace('=X','')}.csv"
-    data.to_csv(filename, index=False)
-    print(f"✅ Données enregistrées pour {sym} → {filename}")
+    # Index datetime UTC sans fuseau (clé de déduplication des partitions)
+    data['datetime'] = pd.to_datetime(data['datetime'], utc=True).dt.tz_localize(None)
+    data = data.set_index('datetime')
+
+    # Ajouter aux partitions (seules les partitions touchées sont réécrites)
+    stats = store.append(name, data)
+    print(f"✅ {sym}: {stats['new_rows']} nouvelles bougies → {len(stats['partitions_written'])} partition(s) "
+          f"dans {os.path.join('data', 'partitions', name)}")
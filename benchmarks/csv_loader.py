@@ -0,0 +1,107 @@
+"""
+CSV Loader Benchmark
+--------------------
+Compare sur un export MT5 synthétique (10M bougies par défaut) :
+
+    generic       ancien chemin de FileManager (read_csv sans dtypes + to_datetime inféré)
+    typed         utils.mt5_csv.read_mt5_csv (dtypes et formats explicites)
+    typed_ohlc    read_mt5_csv avec usecols=open/high/low/close
+    chunked_ohlc  iter_mt5_csv par blocs (mémoire bornée), OHLC uniquement
+
+Usage :
+    python -m benchmarks.csv_loader
+    python -m benchmarks.csv_loader --bars 1M --chunk-size 250k --no-memory
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from benchmarks.pipeline import DEFAULT_RESULTS_DIR, _measure, format_size, synthetic_csv
+from utils.file_manager import FileManager
+from utils.mt5_csv import PRICE_COLUMNS, PYARROW_AVAILABLE, iter_mt5_csv, read_mt5_csv
+from utils.synthetic_data import parse_bars
+
+
+def _count_chunks(path: str, chunk_size: int) -> int:
+    return sum(len(chunk) for chunk in iter_mt5_csv(path, chunksize=chunk_size, usecols=PRICE_COLUMNS))
+
+
+def run_loader_benchmark(n: int, chunk_size: int = 1_000_000, repeat: int = 1, memory: bool = True,
+                         seed: int = 42) -> Dict[str, Any]:
+    data_dir, symbol = synthetic_csv(n, seed)
+    path = os.path.join(data_dir, f"{symbol}.csv")
+    fm = FileManager(data_dir=data_dir, cache=None)
+
+    loaders = {
+        "generic": lambda: fm._parse_generic(path),
+        "typed": lambda: read_mt5_csv(path, engine="c"),
+        "typed_ohlc": lambda: read_mt5_csv(path, usecols=PRICE_COLUMNS, engine="c"),
+        "chunked_ohlc": lambda: _count_chunks(path, chunk_size),
+    }
+    if PYARROW_AVAILABLE:
+        loaders["typed_pyarrow"] = lambda: read_mt5_csv(path, engine="pyarrow")
+
+    results: List[Dict[str, Any]] = []
+    for name, loader in loaders.items():
+        print(f"⏱️  {name}...")
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            result, metrics = _measure(loader, repeat, memory)
+        rows = result if isinstance(result, int) else len(result)
+        row = {"loader": name, "rows": rows, **metrics,
+               "rows_per_second": round(rows / metrics["wall_seconds"], 1) if metrics["wall_seconds"] > 0 else None}
+        if isinstance(result, pd.DataFrame):
+            row["frame_memory_mb"] = round(result.memory_usage(deep=True).sum() / 2**20, 1)
+        results.append(row)
+        del result
+
+    generic = results[0]["wall_seconds"]
+    for row in results:
+        row["speedup_vs_generic"] = round(generic / row["wall_seconds"], 2) if row["wall_seconds"] > 0 else None
+        memory_text = f" | pic {row['peak_memory_mb']:.0f} MB" if "peak_memory_mb" in row else ""
+        print(f"   {row['loader']:<14} {row['wall_seconds']:>8.2f}s | x{row['speedup_vs_generic']:<5} | "
+              f"{row['rows_per_second']:>12,.0f} lignes/s{memory_text}")
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "bars": n,
+            "file_size_mb": round(os.path.getsize(path) / 2**20, 1),
+            "chunk_size": chunk_size,
+            "pandas": pd.__version__,
+            "pyarrow": PYARROW_AVAILABLE,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark des lecteurs CSV MT5 (générique vs typé)")
+    parser.add_argument("--bars", default="10M", help="Taille du fichier synthétique (10k, 1M, 10M...)")
+    parser.add_argument("--chunk-size", default="1M", help="Lignes par bloc pour la lecture par blocs")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--no-memory", action="store_true", help="Sans passe tracemalloc")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    n = parse_bars(args.bars)
+    report = run_loader_benchmark(n, parse_bars(args.chunk_size), args.repeat, not args.no_memory, args.seed)
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, f"csv_loader_{format_size(n)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Résultats: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Executor Benchmark
+------------------
+Accélération de ConcurrentExecutor (pool de process) par rapport à l'exécution
+séquentielle du même pipeline, sur de nombreux symboles synthétiques.
+
+Usage :
+    python -m benchmarks.executor --symbols 16 --bars 100k --workers 1 2 4
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from benchmarks.pipeline import DEFAULT_RESULTS_DIR, SYNTHETIC_DIR, format_size
+from utils.concurrent_executor import ConcurrentExecutor, run_symbol_job
+from utils.synthetic_data import parse_bars, write_symbols
+
+
+def prepare_symbols(n_symbols: int, n_bars: int, seed: int = 42) -> tuple:
+    """CSV synthétiques (générés une seule fois) ; retourne (data_dir, symboles)"""
+    data_dir = os.path.join(SYNTHETIC_DIR, f"executor_{format_size(n_bars)}_{seed}")
+    symbols = [f"SYM{i:03d}" for i in range(n_symbols)]
+    missing = [s for s in symbols if not os.path.exists(os.path.join(data_dir, f"{s}.csv"))]
+    if missing:
+        print(f"🧪 Génération de {len(missing)} symboles ({n_bars:,} bougies chacun)...")
+        write_symbols(missing, n_bars, data_dir, seed=seed, regime_switching=True, volatility_clustering=True)
+    return data_dir, symbols
+
+
+def run_serial(data_dir: str, symbols: List[str], trace_memory: bool = False) -> float:
+    start = time.perf_counter()
+    for symbol in symbols:
+        run_symbol_job(data_dir, symbol, trace_memory=trace_memory)
+    return time.perf_counter() - start
+
+
+def run_pool(data_dir: str, symbols: List[str], workers: int, trace_memory: bool = False) -> float:
+    executor = ConcurrentExecutor(data_dir=data_dir, demo_mode=False, trace_memory=trace_memory,
+                                  max_workers=workers, show_activity=False)
+    start = time.perf_counter()
+    results = asyncio.run(executor.run_multiple_strategies_async(symbols))
+    elapsed = time.perf_counter() - start
+    errors = [r for r in results if "error" in r]
+    if errors:
+        raise RuntimeError(f"{len(errors)} job(s) en erreur: {errors[0]['error']}")
+    return elapsed
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Benchmark du pool de process de ConcurrentExecutor")
+    parser.add_argument("--symbols", type=int, default=16)
+    parser.add_argument("--bars", default="100k", help="Bougies par symbole")
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="Tailles de pool (défaut : 1, 2, 4... cœurs)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Pic mémoire par étape (tracemalloc, ralentit les deux modes)")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    cpus = os.cpu_count() or 1
+    workers = args.workers or sorted({min(w, cpus) for w in (1, 2, 4, 8, cpus)})
+    data_dir, symbols = prepare_symbols(args.symbols, parse_bars(args.bars), args.seed)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        serial = run_serial(data_dir, symbols, args.trace_memory)
+    print(f"⏱️  Séquentiel: {serial:.2f}s ({len(symbols)} symboles x {args.bars} bougies)")
+
+    rows = [{"mode": "serial", "workers": 1, "wall_seconds": round(serial, 4), "speedup": 1.0}]
+    for n in workers:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            elapsed = run_pool(data_dir, symbols, n, args.trace_memory)
+        rows.append({"mode": "process_pool", "workers": n, "wall_seconds": round(elapsed, 4),
+                     "speedup": round(serial / elapsed, 2)})
+        print(f"⚙️  Pool {n:>2} workers: {elapsed:.2f}s | accélération x{serial / elapsed:.2f}")
+
+    document = {
+        "meta": {"created": datetime.now().isoformat(timespec="seconds"), "cpu_count": cpus,
+                 "symbols": len(symbols), "bars": parse_bars(args.bars), "seed": args.seed,
+                 "trace_memory": args.trace_memory},
+        "results": rows,
+    }
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, f"executor_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"💾 Résultats: {output}")
+    return document
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Pipeline Benchmark
+------------------
+Mesure des étapes du pipeline de backtest sur les CSV fournis (data/) et sur des séries
+synthétiques de 10k / 1M / 10M bougies :
+
+    load_csv (parsing) | load_csv_cached (cache parsé) -> generate_trading_signals -> execute_trading_strategy
+             -> generate_money_management_report
+
+Pour chaque étape : temps réel (meilleur de --repeat passes), temps CPU, pic mémoire
+(tracemalloc, passe séparée pour ne pas fausser les temps) et bougies / seconde.
+Les étapes signaux / exécution enregistrent aussi leur résultat (nombre de signaux,
+de trades, profit net) : une optimisation qui change les trades est signalée comme
+régression face à une baseline prise avant la réécriture.
+Les résultats sont écrits en JSON et comparés à une baseline avec des seuils de régression.
+
+La baseline dépend de la machine : elle n'est pas versionnée (benchmarks/baseline.json).
+
+Usage :
+    python -m benchmarks.pipeline                              # CSV fournis + 10k / 1M / 10M
+    python -m benchmarks.pipeline --sizes 10k 1M --save-baseline
+    python -m benchmarks.pipeline --sizes 10k 1M --time-threshold 0.2
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.strategy import BBKeltnerStrategy
+from utils.data_cache import ParsedDataCache
+from utils.file_manager import FileManager
+from utils.synthetic_data import SyntheticMarket, parse_bars
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+SYNTHETIC_DIR = os.path.join(BENCH_DIR, "data")
+
+STAGES = ["load_csv", "load_csv_cached", "generate_trading_signals", "execute_trading_strategy",
+          "generate_money_management_report"]
+# Champs de résultat comparés à l'identique avec la baseline (parité du pipeline)
+RESULT_FIELDS = ["signals", "trades", "net_profit"]
+
+
+def format_size(n: int) -> str:
+    for suffix, factor in (("M", 10**6), ("k", 10**3)):
+        if n >= factor and n % factor == 0:
+            return f"{n // factor}{suffix}"
+    return str(n)
+
+
+def synthetic_csv(n: int, seed: int = 42) -> Tuple[str, str]:
+    """Écrit (une seule fois, puis réutilise) un CSV synthétique ; retourne (data_dir, symbol)"""
+    symbol = f"SYNTH_{format_size(n)}_{seed}"
+    path = os.path.join(SYNTHETIC_DIR, f"{symbol}.csv")
+    if not os.path.exists(path):
+        os.makedirs(SYNTHETIC_DIR, exist_ok=True)
+        print(f"🧪 Génération de {symbol} ({n:,} bougies)...")
+        SyntheticMarket(seed=seed, regime_switching=True, volatility_clustering=True).write_csv(path, n)
+    return SYNTHETIC_DIR, symbol
+
+
+def _measure(func: Callable[[], Any], repeat: int, memory: bool) -> Tuple[Any, Dict[str, float]]:
+    """Meilleur temps réel / CPU sur `repeat` passes, puis pic mémoire sur une passe tracée"""
+    best_wall, best_cpu, result = float("inf"), float("inf"), None
+    for _ in range(repeat):
+        wall, cpu = time.perf_counter(), time.process_time()
+        result = func()
+        best_wall = min(best_wall, time.perf_counter() - wall)
+        best_cpu = min(best_cpu, time.process_time() - cpu)
+
+    metrics = {"wall_seconds": round(best_wall, 6), "cpu_seconds": round(best_cpu, 6)}
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        metrics["peak_memory_mb"] = round(peak / 2**20, 3)
+    return result, metrics
+
+
+def bench_dataset(name: str, data_dir: str, symbol: str, repeat: int = 1,
+                  memory: bool = True) -> List[Dict[str, Any]]:
+    """Chronomètre chaque étape du pipeline sur un CSV ; une ligne de résultat par étape"""
+    fm = FileManager(data_dir=data_dir, cache=None)
+    cached_fm = FileManager(data_dir=data_dir, cache=ParsedDataCache())
+    rows = []
+
+    def record(stage: str, func: Callable[[], Any],
+               summary: Optional[Callable[[Any], Dict[str, Any]]] = None) -> Any:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            result, metrics = _measure(func, repeat, memory)
+        rows.append({"dataset": name, "stage": stage, **metrics, **(summary(result) if summary else {})})
+        return result
+
+    df = record("load_csv", lambda: fm.load_csv(symbol))
+    bars = len(df)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        cached_fm.load_csv(symbol)  # écrit / valide le cache parsé avant la mesure
+    record("load_csv_cached", lambda: cached_fm.load_csv(symbol))
+
+    signal_strategy = BBKeltnerStrategy(indicator_cache=None)
+    signals = record("generate_trading_signals", lambda: signal_strategy.generate_trading_signals(df),
+                     lambda result: {"signals": int(np.count_nonzero(result["signal"].to_numpy()))})
+
+    # Chaque passe repart d'une stratégie neuve (l'exécution modifie capital et ledgers)
+    strategies = []
+
+    def execute():
+        strategy = BBKeltnerStrategy(indicator_cache=None)
+        strategies.append(strategy)
+        return strategy.execute_trading_strategy(signals)
+
+    record("execute_trading_strategy", execute,
+           lambda trades: {"trades": len(trades),
+                           "net_profit": round(float(trades.column("pnl").sum()), 2) if len(trades) else 0.0})
+    strategy = strategies[0]
+    record("generate_money_management_report", lambda: strategy.generate_money_management_report(symbol))
+
+    for row in rows:
+        row["bars"] = bars
+        row["bars_per_second"] = round(bars / row["wall_seconds"], 1) if row["wall_seconds"] > 0 else None
+    return rows
+
+
+def run_benchmarks(symbols: List[str], sizes: List[int], data_dir: str = "data", repeat: int = 1,
+                   memory: bool = True, seed: int = 42) -> Dict[str, Any]:
+    """CSV fournis puis séries synthétiques ; retourne le document JSON complet"""
+    datasets = [(symbol, data_dir, symbol) for symbol in symbols]
+    for n in sizes:
+        synth_dir, synth_symbol = synthetic_csv(n, seed)
+        datasets.append((f"synthetic_{format_size(n)}", synth_dir, synth_symbol))
+
+    results = []
+    for name, directory, symbol in datasets:
+        print(f"⏱️  {name}...")
+        rows = bench_dataset(name, directory, symbol, repeat=repeat, memory=memory)
+        results.extend(rows)
+        for row in rows:
+            memory_text = f" | {row['peak_memory_mb']:.1f} MB" if "peak_memory_mb" in row else ""
+            print(f"   {row['stage']:<34} {row['wall_seconds']:>9.3f}s | "
+                  f"{row['bars_per_second'] or 0:>14,.0f} bougies/s{memory_text}")
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(current: Dict[str, Any], baseline: Dict[str, Any], time_threshold: float = 0.25,
+                        memory_threshold: float = 0.25, min_seconds: float = 0.01) -> List[Dict[str, Any]]:
+    """
+    Compare (dataset, étape) présents dans les deux documents.
+    Régression si temps > baseline * (1 + time_threshold) (au-delà de min_seconds d'écart),
+    pic mémoire > baseline * (1 + memory_threshold) ou résultat différent (RESULT_FIELDS).
+    """
+    reference = {(row["dataset"], row["stage"]): row for row in baseline.get("results", [])}
+    comparisons = []
+    for row in current.get("results", []):
+        base = reference.get((row["dataset"], row["stage"]))
+        if base is None:
+            continue
+        time_ratio = row["wall_seconds"] / base["wall_seconds"] if base["wall_seconds"] > 0 else None
+        slower = (row["wall_seconds"] - base["wall_seconds"] > min_seconds
+                  and row["wall_seconds"] > base["wall_seconds"] * (1 + time_threshold))
+        memory_ratio, heavier = None, False
+        if "peak_memory_mb" in row and base.get("peak_memory_mb"):
+            memory_ratio = row["peak_memory_mb"] / base["peak_memory_mb"]
+            heavier = memory_ratio > 1 + memory_threshold
+        changed = [field for field in RESULT_FIELDS
+                   if field in row and field in base and row[field] != base[field]]
+        comparisons.append({
+            "dataset": row["dataset"],
+            "stage": row["stage"],
+            "time_ratio": round(time_ratio, 3) if time_ratio is not None else None,
+            "memory_ratio": round(memory_ratio, 3) if memory_ratio is not None else None,
+            "result_changed": changed,
+            "regression": slower or heavier or bool(changed),
+        })
+    return comparisons
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark du pipeline signaux / exécution / rapport")
+    parser.add_argument("--symbols", nargs="*", default=["XAUUSD", "EURUSD"], help="CSV fournis (data/)")
+    parser.add_argument("--sizes", nargs="*", default=["10k", "1M", "10M"], help="Tailles synthétiques (10k, 1M...)")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes chronométrées par étape (meilleur temps)")
+    parser.add_argument("--no-memory", action="store_true", help="Sans passe tracemalloc")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Fichier JSON des résultats")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Enregistre les résultats comme baseline")
+    parser.add_argument("--time-threshold", type=float, default=0.25, help="Régression de temps tolérée (0.25 = +25%%)")
+    parser.add_argument("--memory-threshold", type=float, default=0.25, help="Régression mémoire tolérée")
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.symbols, [parse_bars(s) for s in args.sizes], data_dir=args.data_dir,
+                             repeat=args.repeat, memory=not args.no_memory, seed=args.seed)
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(current, f, indent=2)
+    print(f"\n💾 Résultats: {output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"📌 Baseline enregistrée: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("ℹ️  Pas de baseline (lancer avec --save-baseline pour en créer une)")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    comparisons = compare_to_baseline(current, baseline, args.time_threshold, args.memory_threshold)
+    print(f"\n📊 Comparaison à la baseline ({baseline['meta'].get('created', '?')}):")
+    for c in comparisons:
+        flag = "❌" if c["regression"] else "✅"
+        memory_text = f" | mémoire x{c['memory_ratio']}" if c["memory_ratio"] is not None else ""
+        changed_text = f" | résultat différent: {', '.join(c['result_changed'])}" if c["result_changed"] else ""
+        print(f"   {flag} {c['dataset']:<18} {c['stage']:<34} temps x{c['time_ratio']}{memory_text}{changed_text}")
+
+    regressions = [c for c in comparisons if c["regression"]]
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) au-delà des seuils")
+        return 1
+    print("\n✅ Aucune régression")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Backtest Worker
+---------------
+État partagé des process workers du balayage de paramètres (core.parameter_sweep)
+et du walk-forward (core.walk_forward).
+
+Chaque worker charge les CSV une seule fois (init_worker) et garde en mémoire les
+colonnes d'indicateurs déjà calculées : une combinaison qui ne change que
+risk_reward_ratio ou la killzone réutilise les mêmes bandes BB / KC.
+"""
+
+import contextlib
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.strategy import BBKeltnerStrategy
+from utils.file_manager import FileManager
+
+
+class ColumnCache:
+    """
+    Mémo LRU, borné en octets, des colonnes d'indicateurs par (symbole, famille, paramètres).
+    Une grille qui parcourt beaucoup de valeurs d'indicateurs ne fait plus grossir
+    la mémoire du worker sans limite : les colonnes les moins récemment utilisées sont évincées.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[tuple, Tuple[Dict[str, Any], int]]" = OrderedDict()
+
+    @staticmethod
+    def _size(columns: Dict[str, Any]) -> int:
+        return sum(np.asarray(values).nbytes for values in columns.values())
+
+    def get(self, key: tuple, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        columns = compute()
+        size = self._size(columns)
+        if size <= self.max_bytes:
+            self._entries[key] = (columns, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted
+                self.evictions += 1
+        return columns
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# État propre à chaque process worker
+WORKER_DATA: Dict[str, pd.DataFrame] = {}
+WORKER_COLUMNS = ColumnCache()
+
+
+def init_worker(data_dir: str, symbols: List[str], start=None, end=None):
+    """Chargement unique des données dans chaque process worker (initializer du pool), bornées à start / end"""
+    WORKER_DATA.clear()
+    WORKER_COLUMNS.clear()
+    fm = FileManager(data_dir=data_dir)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for symbol in symbols:
+            WORKER_DATA[symbol] = fm.load_period(symbol, start, end)
+
+
+def signal_frame(strategy: BBKeltnerStrategy, symbol: str) -> pd.DataFrame:
+    """Équivalent de generate_trading_signals avec colonnes d'indicateurs partagées"""
+    base = WORKER_DATA[symbol]
+    columns = {}
+    columns.update(WORKER_COLUMNS.get((symbol, "bb", strategy.bb.period, strategy.bb.std_dev),
+                                      lambda: strategy.bollinger_columns(base)))
+    columns.update(WORKER_COLUMNS.get((symbol, "kc", strategy.kc.ema_period, strategy.kc.atr_period, strategy.kc.atr_multiplier),
+                                      lambda: strategy.keltner_columns(base)))
+    columns.update(WORKER_COLUMNS.get((symbol, "trend", strategy.ema_period, strategy.htf_timeframe, strategy.htf_ema_period),
+                                      lambda: strategy.trend_columns(base)))
+    columns.update(WORKER_COLUMNS.get((symbol, "stop_loss", strategy.sl_atr_period, strategy.sl_swing_window),
+                                      lambda: strategy.stop_loss_columns(base)))
+
+    df = base.copy()
+    for name, values in columns.items():
+        df[name] = values
+    return strategy.add_signal_columns(df)
+
+
+def flatten_report(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Métriques du rapport money management à plat (sans le détail des trades)"""
+    row = {}
+    for section in ("money_management", "performance"):
+        row.update(report.get(section, {}))
+    if "error" in report:
+        row["total_trades"] = 0
+    return row
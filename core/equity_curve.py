@@ -0,0 +1,118 @@
+"""
+Equity Curve
+------------
+Courbe de capital bougie par bougie (mark-to-market) et statistiques de drawdown.
+
+La courbe est calculée à partir du ledger et des prix, sans objet Python par bougie :
+  - PnL réalisé : bincount des PnL sur la bougie de sortie, puis cumsum
+  - PnL latent : pour les trades ouverts, sum(dir * units * (prix - entrée))
+    = prix * A(t) - B(t), où A et B sont des sommes cumulées de différences
+    (+ à l'entrée, - à la sortie)
+Le drawdown et la durée sous l'eau se déduisent de maximum.accumulate.
+"""
+
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from core.trade_ledger import TradeLedger
+
+PRICE_MODES = ("close", "worst")
+
+
+def _bar_positions(index: pd.DatetimeIndex, times: np.ndarray) -> np.ndarray:
+    return np.searchsorted(index.values, times.astype(index.values.dtype), side="left")
+
+
+def _open_exposure(n: int, entry: np.ndarray, exit: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Somme des poids des trades ouverts à chaque bougie (entrée incluse, sortie exclue)"""
+    delta = np.bincount(entry, weights=weights, minlength=n + 1)
+    delta -= np.bincount(exit, weights=weights, minlength=n + 1)
+    return np.cumsum(delta[:n])
+
+
+def equity_curve(trades: TradeLedger, df: pd.DataFrame, initial_capital: float,
+                 price: str = "close") -> pd.Series:
+    """
+    Capital mark-to-market à chaque bougie de `df` (colonnes high / low / close).
+    price="close" valorise les positions au close ; price="worst" au plus défavorable
+    de la bougie (low pour un LONG, high pour un SHORT), pour le drawdown intra-trade.
+    """
+    if price not in PRICE_MODES:
+        raise ValueError(f"Mode de prix inconnu: {price} (attendu {', '.join(PRICE_MODES)})")
+
+    n = len(df)
+    equity = np.full(n, float(initial_capital))
+    if n == 0 or len(trades) == 0:
+        return pd.Series(equity, index=df.index, name="equity")
+
+    entry = _bar_positions(df.index, trades.column("entry_time"))
+    exit = np.minimum(_bar_positions(df.index, trades.column("exit_time")), n)
+    pnl = trades.column("pnl")
+
+    # Réalisé : PnL ajouté à la bougie de sortie
+    realized = np.bincount(np.minimum(exit, n - 1), weights=pnl, minlength=n)
+    equity += np.cumsum(realized)
+
+    # Latent : prix * A(t) - B(t) par sens (valorisation au close ou au pire prix)
+    units = trades.column("units").astype(float)
+    entry_price = trades.column("entry_price")
+    is_long = trades.mask_equal("direction", "LONG")
+    close = df["close"].to_numpy(dtype=float)
+    for side, sign, bar_price in ((is_long, 1.0, "low"), (~is_long, -1.0, "high")):
+        if not side.any():
+            continue
+        marks = close if price == "close" else df[bar_price].to_numpy(dtype=float)
+        weights = sign * units[side]
+        exposure = _open_exposure(n, entry[side], exit[side], weights)
+        cost = _open_exposure(n, entry[side], exit[side], weights * entry_price[side])
+        equity += marks * exposure - cost
+
+    return pd.Series(equity, index=df.index, name="equity")
+
+
+def drawdown_stats(equity: pd.Series) -> Dict[str, Any]:
+    """
+    Drawdown maximal (montant et %), date du creux, durée sous l'eau (bougies et temps),
+    part du temps sous l'eau et nombre de périodes de drawdown
+    """
+    values = equity.to_numpy(dtype=float)
+    n = len(values)
+    if n == 0:
+        return {"max_drawdown": 0.0, "max_drawdown_amount": 0.0, "time_under_water_percent": 0.0,
+                "drawdown_periods": 0, "max_underwater_bars": 0}
+
+    peak = np.maximum.accumulate(values)
+    drawdown_amount = peak - values
+    drawdown = drawdown_amount / peak * 100
+    trough = int(np.argmax(drawdown))
+    peak_bar = int(np.flatnonzero(values[:trough + 1] == peak[trough])[0])
+
+    # Périodes sous l'eau : segments consécutifs où le capital est sous son dernier pic
+    underwater = values < peak
+    edges = np.diff(np.concatenate(([0], underwater.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)  # exclusif : bougie de retour au pic (ou n)
+    lengths = ends - starts
+
+    times = equity.index
+    stats = {
+        "max_drawdown": round(float(drawdown[trough]), 2),
+        "max_drawdown_amount": round(float(drawdown_amount[trough]), 2),
+        "max_drawdown_peak": times[peak_bar],
+        "max_drawdown_trough": times[trough],
+        "current_drawdown": round(float(drawdown[-1]), 2),
+        "time_under_water_percent": round(float(underwater.mean()) * 100, 2),
+        "drawdown_periods": int(len(starts)),
+        "max_underwater_bars": int(lengths.max()) if len(lengths) else 0,
+        "avg_underwater_bars": round(float(lengths.mean()), 1) if len(lengths) else 0.0,
+    }
+    if len(lengths) and isinstance(times, pd.DatetimeIndex):
+        # Du pic précédant la période jusqu'au retour au pic (ou dernière bougie)
+        begin = times.values[np.maximum(starts - 1, 0)]
+        finish = times.values[np.minimum(ends, n - 1)]
+        durations = finish - begin
+        stats["max_underwater_duration"] = pd.Timedelta(durations.max())
+        stats["recovered"] = bool(ends[-1] < n)
+    return stats
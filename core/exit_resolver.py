@@ -0,0 +1,123 @@
+"""
+Exit Resolver
+-------------
+Résolution vectorisée des sorties Stop Loss / Take Profit.
+Pour chaque trade, trouve la première bougie après l'entrée qui touche le SL ou le TP
+(le SL est prioritaire si les deux sont touchés sur la même bougie).
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+STOP_LOSS = 0
+TAKE_PROFIT = 1
+TIME_EXIT = 2
+END_OF_DATA = 3
+
+EXIT_REASONS = np.array(["STOP_LOSS", "TAKE_PROFIT", "TIME_EXIT", "END_OF_DATA"])
+
+
+def resolve_exits(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    entry_idx: np.ndarray,
+    direction: np.ndarray,
+    stop_loss: np.ndarray,
+    take_profit: np.ndarray,
+    max_bars: Optional[int] = None,
+    chunk_size: int = 64,
+    max_cells: int = 4_000_000,
+) -> Dict[str, np.ndarray]:
+    """
+    Résout les sorties de tous les trades en un seul appel.
+
+    - direction : 1 pour LONG, -1 pour SHORT
+    - max_bars : si renseigné, sortie TIME_EXIT à la clôture de entry + max_bars
+      (bornée à la dernière bougie) quand ni SL ni TP n'est touché avant,
+      comme BBKeltnerStrategy.simulate_trade_execution de strategy_old.
+      Sinon la recherche va jusqu'à la fin des données (END_OF_DATA).
+    - chunk_size : largeur de la première fenêtre ; elle double à chaque passe
+      pour les trades non encore résolus.
+    - max_cells : taille maximale des matrices booléennes (trades x bougies) par lot.
+
+    Retourne {"exit_index", "exit_price", "exit_reason"} (raisons en codes, voir EXIT_REASONS).
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    entry_idx = np.asarray(entry_idx, dtype=np.int64)
+    direction = np.asarray(direction)
+    stop_loss = np.asarray(stop_loss, dtype=float)
+    take_profit = np.asarray(take_profit, dtype=float)
+
+    n = len(close)
+    m = len(entry_idx)
+    if m and (entry_idx.min() < 0 or entry_idx.max() >= n):
+        raise ValueError("Index d'entrée hors des données")
+
+    # Borne exclusive de la zone de recherche et bougie de sortie par défaut
+    if max_bars is None:
+        limit = np.full(m, n, dtype=np.int64)
+        fallback_idx = np.full(m, n - 1, dtype=np.int64)
+        fallback_reason = END_OF_DATA
+    else:
+        limit = np.minimum(entry_idx + max_bars, n)
+        fallback_idx = np.minimum(entry_idx + max_bars, n - 1)
+        fallback_reason = TIME_EXIT
+
+    exit_index = fallback_idx.copy()
+    exit_reason = np.full(m, fallback_reason, dtype=np.int8)
+
+    pending = np.arange(m)
+    offset = 1
+    width = max(1, chunk_size)
+    while pending.size:
+        starts = entry_idx[pending] + offset
+        active = starts < limit[pending]
+        pending, starts = pending[active], starts[active]
+        if not pending.size:
+            break
+
+        unresolved = []
+        batch = max(1, max_cells // width)
+        steps = np.arange(width)
+        for b in range(0, len(pending), batch):
+            ids = pending[b:b + batch]
+            cols = starts[b:b + batch, None] + steps
+            valid = cols < limit[ids, None]
+            np.minimum(cols, n - 1, out=cols)
+
+            h = high[cols]
+            lo = low[cols]
+            is_long = direction[ids, None] > 0
+            sl = stop_loss[ids, None]
+            tp = take_profit[ids, None]
+
+            sl_hit = np.where(is_long, lo <= sl, h >= sl) & valid
+            tp_hit = np.where(is_long, h >= tp, lo <= tp) & valid
+            hit = sl_hit | tp_hit
+
+            first = hit.argmax(axis=1)
+            rows = np.arange(len(ids))
+            found = hit[rows, first]
+
+            done = ids[found]
+            exit_index[done] = cols[rows[found], first[found]]
+            exit_reason[done] = np.where(sl_hit[rows[found], first[found]], STOP_LOSS, TAKE_PROFIT)
+            unresolved.append(ids[~found])
+
+        pending = np.concatenate(unresolved) if unresolved else pending[:0]
+        offset += width
+        width *= 2
+
+    exit_price = close[exit_index]
+    exit_price = np.where(exit_reason == STOP_LOSS, stop_loss, exit_price)
+    exit_price = np.where(exit_reason == TAKE_PROFIT, take_profit, exit_price)
+
+    return {
+        "exit_index": exit_index,
+        "exit_price": exit_price,
+        "exit_reason": exit_reason,
+    }
@@ -0,0 +1,251 @@
+"""
+Live Strategy Runner
+--------------------
+Exécution bougie par bougie de BBKeltnerStrategy (paper / live trading).
+Les indicateurs, les positions ouvertes et last_trade_time restent en mémoire :
+chaque nouvelle bougie coûte O(1), sans retraiter l'historique.
+"""
+
+import math
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.strategy import BBKeltnerStrategy
+from core.trade_ledger import TradeLedger
+from utils.resampler import timeframe_delta
+
+
+class _StreamingEMA:
+    """EMA récursive (équivalent de ewm(span, adjust=False))"""
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1)
+        self.value = None
+
+    def update(self, x: float) -> float:
+        self.value = x if self.value is None else (1 - self.alpha) * self.value + self.alpha * x
+        return self.value
+
+
+class _StreamingHTF:
+    """
+    Tendance HTF bougie par bougie, alignée comme align_to_base : un seau est pris en
+    compte dès que la bougie de base qui le termine est clôturée (ou au premier seau suivant).
+    Le pas de base est le plus petit écart observé entre deux bougies.
+    """
+
+    def __init__(self, timeframe: str, span: int):
+        self.delta = timeframe_delta(timeframe)
+        self._ema = _StreamingEMA(span)
+        self.step = None
+        self.bucket = None
+        self.close = None
+        self.pending = False
+        self.last_time = None
+        self.trend = 0
+
+    def _finalize(self):
+        ema = self._ema.update(self.close)
+        self.trend = int(np.sign(self.close - ema))
+        self.pending = False
+
+    def update(self, timestamp: pd.Timestamp, close: float) -> int:
+        if self.last_time is not None:
+            gap = timestamp - self.last_time
+            if gap > pd.Timedelta(0) and (self.step is None or gap < self.step):
+                self.step = gap
+        self.last_time = timestamp
+
+        bucket = timestamp.floor(self.delta)
+        if self.pending and bucket != self.bucket:
+            self._finalize()
+        self.bucket, self.close, self.pending = bucket, close, True
+        if self.step is not None and timestamp + self.step >= bucket + self.delta:
+            self._finalize()
+        return self.trend
+
+
+class LiveStrategyRunner:
+    """
+    Pilote une BBKeltnerStrategy avec des bougies reçues une à une.
+    on_bar() retourne les événements OPEN / CLOSE générés par la bougie.
+    Les trades fermés sont enregistrés dans strategy.closed_trades (rapport inchangé).
+    """
+
+    def __init__(self, strategy: BBKeltnerStrategy, symbol: str):
+        self.strategy = strategy
+        self.symbol = symbol
+        self.reset()
+
+    def reset(self):
+        """Repart d'un état vide (capital initial, indicateurs à chauffer)"""
+        strategy = self.strategy
+        strategy.current_capital = strategy.initial_capital
+        strategy.trades = TradeLedger()
+        strategy.closed_trades = TradeLedger()
+        strategy.portfolio_history = pd.Series(dtype=float, name="equity")
+        strategy.last_trade_time = None
+
+        strategy.bb.reset()
+        strategy.kc.reset()
+        self._ema_trend = _StreamingEMA(strategy.ema_period)
+        self._ema_20 = _StreamingEMA(20)
+        self._htf = _StreamingHTF(strategy.htf_timeframe, strategy.htf_ema_period) if strategy.htf_timeframe else None
+
+        # ATR du stop loss : premier True Range = high - low, puis moyenne glissante
+        self._sl_true_ranges = deque(maxlen=strategy.sl_atr_period)
+        self._recent_lows = deque(maxlen=strategy.sl_swing_window)
+        self._recent_highs = deque(maxlen=strategy.sl_swing_window)
+
+        self.bar_count = 0
+        self.prev_close = None
+        self.last_time = None
+        self.last_close = None
+        self.open_trades: List[Dict[str, Any]] = []
+
+    def _update_indicators(self, bar: Dict[str, float]) -> Dict[str, float]:
+        high, low, close = float(bar["high"]), float(bar["low"]), float(bar["close"])
+        strategy = self.strategy
+
+        _, bb_upper, bb_lower = strategy.bb.update(close)
+        _, kc_upper, kc_lower = strategy.kc.update(bar)
+        ema_50 = self._ema_trend.update(close)
+        ema_20 = self._ema_20.update(close)
+
+        if self.prev_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self._sl_true_ranges.append(true_range)
+        self._recent_lows.append(low)
+        self._recent_highs.append(high)
+
+        return {
+            "bb_upper": bb_upper,
+            "bb_lower": bb_lower,
+            "kc_upper": kc_upper,
+            "kc_lower": kc_lower,
+            "ema_50": ema_50,
+            "ema_20": ema_20,
+        }
+
+    def warm_up(self, df: pd.DataFrame):
+        """Alimente les indicateurs avec l'historique, sans ouvrir de trade"""
+        for timestamp, high, low, close in zip(df.index, df["high"].to_numpy(),
+                                               df["low"].to_numpy(), df["close"].to_numpy()):
+            bar = {"high": high, "low": low, "close": close}
+            self._update_indicators(bar)
+            if self._htf is not None:
+                self._htf.update(timestamp, float(close))
+            self.prev_close = float(close)
+            self.last_time = timestamp
+            self.last_close = float(close)
+            self.bar_count += 1
+
+    def _check_exits(self, timestamp: pd.Timestamp, high: float, low: float) -> List[Dict[str, Any]]:
+        events = []
+        for trade in self.open_trades[:]:
+            if trade["direction"] == "LONG":
+                sl_hit, tp_hit = low <= trade["stop_loss"], high >= trade["take_profit"]
+            else:
+                sl_hit, tp_hit = high >= trade["stop_loss"], low <= trade["take_profit"]
+            if not (sl_hit or tp_hit):
+                continue
+
+            reason = "STOP_LOSS" if sl_hit else "TAKE_PROFIT"
+            exit_price = trade["stop_loss"] if sl_hit else trade["take_profit"]
+            self.strategy.close_trade(trade, exit_price, reason, self.strategy.trade_pnl(trade, exit_price), timestamp)
+            self.open_trades.remove(trade)
+            events.append({"type": "CLOSE", "symbol": self.symbol, "time": timestamp,
+                           "trade": self.strategy.closed_trades[-1]})
+        return events
+
+    def _signal(self, close: float, levels: Dict[str, float], timestamp: pd.Timestamp) -> int:
+        """Équivalent bougie par bougie de add_signal_columns (raw_signal filtré killzone)"""
+        if self.bar_count < 50 or not self.strategy.in_killzone(timestamp):
+            return 0
+        if close > levels["bb_upper"] and levels["ema_20"] > levels["ema_50"]:
+            return 1
+        if close < levels["bb_lower"] and levels["ema_20"] < levels["ema_50"]:
+            return -1
+        return 0
+
+    def _should_enter(self, signal: int, close: float, levels: Dict[str, float], timestamp: pd.Timestamp) -> bool:
+        """Mêmes filtres que should_enter_trade / entry_candidates"""
+        strategy = self.strategy
+        if signal == 0 or self.bar_count < max(strategy.ema_period, 10, 50):
+            return False
+
+        ema_20, ema_50 = levels["ema_20"], levels["ema_50"]
+        if signal == 1:
+            ok = ema_20 > ema_50 and close > levels["bb_upper"] and close >= self.prev_close * 0.998
+        else:
+            ok = ema_20 < ema_50 and close < levels["bb_lower"] and close <= self.prev_close * 1.002
+        if not ok or abs(close - ema_50) / ema_50 > 0.03:
+            return False
+        if self._htf is not None and self._htf.trend != signal:
+            return False
+
+        if strategy.last_trade_time is not None:
+            if (timestamp - strategy.last_trade_time).total_seconds() < 900:
+                return False
+        if strategy.trades.any_equal('status', 'OPEN'):
+            return False
+        return True
+
+    def on_bar(self, timestamp: pd.Timestamp, bar: Dict[str, float]) -> List[Dict[str, Any]]:
+        """
+        Traite une bougie clôturée (mapping avec 'high', 'low', 'close').
+        Retourne la liste des événements {"type": "OPEN" | "CLOSE", "symbol", "time", "trade"}.
+        """
+        timestamp = pd.Timestamp(timestamp)
+        high, low, close = float(bar["high"]), float(bar["low"]), float(bar["close"])
+        strategy = self.strategy
+
+        levels = self._update_indicators(bar)
+        if self._htf is not None:
+            self._htf.update(timestamp, close)
+
+        # 1. Sorties SL / TP des trades ouverts sur les bougies précédentes
+        events = self._check_exits(timestamp, high, low)
+
+        # 2. Signal et entrée éventuelle
+        signal = self._signal(close, levels, timestamp)
+        if self._should_enter(signal, close, levels, timestamp):
+            direction = "LONG" if signal == 1 else "SHORT"
+            # Valeurs en float64 NumPy comme dans le backtest (même arrondi du stop loss)
+            stop_loss = strategy.stop_loss_from_levels(
+                np.float64(close), np.mean(self._sl_true_ranges),
+                np.float64(min(self._recent_lows)), np.float64(max(self._recent_highs)), direction)
+            inside_kc = not math.isnan(levels["kc_upper"]) and strategy.is_bb_inside_kc(
+                levels["bb_upper"], levels["bb_lower"], levels["kc_upper"], levels["kc_lower"])
+            phase = "CONTRACTION" if inside_kc else "EXPANSION"
+
+            trade = strategy.build_trade(timestamp, close, direction, stop_loss, phase, self.symbol)
+            if trade is not None:
+                strategy.trades.append(trade)
+                self.open_trades.append(trade)
+                strategy.last_trade_time = timestamp
+                events.append({"type": "OPEN", "symbol": self.symbol, "time": timestamp, "trade": trade})
+
+        self.prev_close = close
+        self.last_time = timestamp
+        self.last_close = close
+        self.bar_count += 1
+        return events
+
+    def close_all(self, reason: str = "END_OF_DATA", price: Optional[float] = None,
+                  timestamp: Optional[pd.Timestamp] = None) -> List[Dict[str, Any]]:
+        """Ferme toutes les positions (par défaut au dernier close reçu)"""
+        price = self.last_close if price is None else price
+        timestamp = self.last_time if timestamp is None else timestamp
+        events = []
+        for trade in self.open_trades:
+            self.strategy.close_trade(trade, price, reason, self.strategy.trade_pnl(trade, price), timestamp)
+            events.append({"type": "CLOSE", "symbol": self.symbol, "time": timestamp,
+                           "trade": self.strategy.closed_trades[-1]})
+        self.open_trades = []
+        return events
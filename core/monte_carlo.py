@@ -0,0 +1,183 @@
+"""
+Monte Carlo
+-----------
+Simulation vectorisée de séquences de trades (risque de ruine).
+
+Le vecteur de PnL des trades fermés est rééchantillonné (bootstrap avec remise) ou permuté
+des milliers de fois. Chaque bloc de chemins est une matrice NumPy (chemins x trades) :
+capital, pic et drawdown sont calculés par cumsum / maximum.accumulate, sans boucle Python
+par trade. La mémoire est bornée par `max_cells` (taille d'un bloc).
+
+Usage :
+    python -m core.monte_carlo --symbols XAUUSD --paths 100000 --method bootstrap
+"""
+
+import argparse
+import contextlib
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from core.strategy import BBKeltnerStrategy
+from core.trade_ledger import TradeLedger
+from utils.file_manager import FileManager
+
+METHODS = ("bootstrap", "permute")
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def _pnl_vector(trades: Union[TradeLedger, Sequence[Dict[str, Any]], np.ndarray]) -> np.ndarray:
+    if isinstance(trades, np.ndarray):
+        return trades.astype(float, copy=False)
+    if isinstance(trades, TradeLedger):
+        return trades.column("pnl")
+    return np.fromiter((t["pnl"] for t in trades), dtype=float, count=len(trades))
+
+
+def _simulate_chunk(pnl: np.ndarray, n_paths: int, method: str, initial_capital: float,
+                    rng: np.random.Generator) -> tuple:
+    """Capital final, drawdown max (%) et capital minimum d'un bloc de chemins"""
+    n_trades = len(pnl)
+    if method == "bootstrap":
+        equity = pnl[rng.integers(0, n_trades, size=(n_paths, n_trades))]
+    else:
+        equity = np.tile(pnl, (n_paths, 1))
+        rng.permuted(equity, axis=1, out=equity)
+
+    # Opérations en place : un seul tampon de taille bloc en plus de `equity`
+    np.cumsum(equity, axis=1, out=equity)
+    equity += initial_capital
+    final_capital = equity[:, -1].copy()
+    min_capital = np.minimum(equity.min(axis=1), initial_capital)
+
+    # Même convention que generate_money_management_report : le pic part du capital initial
+    peak = np.maximum(equity, initial_capital)
+    np.maximum.accumulate(peak, axis=1, out=peak)
+    np.divide(equity, peak, out=equity)
+    max_drawdown = (1 - equity.min(axis=1)) * 100
+    return final_capital, np.maximum(max_drawdown, 0.0), min_capital
+
+
+def simulate_trade_sequences(
+    trades: Union[TradeLedger, Sequence[Dict[str, Any]], np.ndarray],
+    initial_capital: float = 100000,
+    n_paths: int = 10000,
+    method: str = "bootstrap",
+    ruin_level: float = 0.5,
+    max_cells: int = 2_000_000,
+    seed: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Simule `n_paths` ordres de trades à partir des trades fermés (ledger ou dicts avec "pnl") ou d'un
+    vecteur de PnL. Un chemin est ruiné si son capital touche initial_capital * (1 - ruin_level).
+    Retourne les tableaux par chemin : final_capital, max_drawdown (%), min_capital, ruined.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Méthode inconnue: {method} (attendu {', '.join(METHODS)})")
+    if not 0 < ruin_level <= 1:
+        raise ValueError("ruin_level doit être dans ]0, 1]")
+
+    pnl = _pnl_vector(trades)
+    if len(pnl) == 0:
+        raise ValueError("Aucun trade à simuler")
+
+    rng = np.random.default_rng(seed)
+    chunk = max(1, max_cells // len(pnl))
+
+    final_capital = np.empty(n_paths)
+    max_drawdown = np.empty(n_paths)
+    min_capital = np.empty(n_paths)
+    for start in range(0, n_paths, chunk):
+        stop = min(start + chunk, n_paths)
+        final_capital[start:stop], max_drawdown[start:stop], min_capital[start:stop] = _simulate_chunk(
+            pnl, stop - start, method, initial_capital, rng)
+
+    return {
+        "final_capital": final_capital,
+        "max_drawdown": max_drawdown,
+        "min_capital": min_capital,
+        "ruined": min_capital <= initial_capital * (1 - ruin_level),
+    }
+
+
+def _distribution(values: np.ndarray) -> Dict[str, float]:
+    stats = {"mean": round(float(values.mean()), 2), "std": round(float(values.std()), 2)}
+    for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        stats[f"p{p}"] = round(float(v), 2)
+    return stats
+
+
+def monte_carlo_report(
+    trades: Union[TradeLedger, Sequence[Dict[str, Any]], np.ndarray],
+    initial_capital: float = 100000,
+    n_paths: int = 10000,
+    method: str = "bootstrap",
+    ruin_level: float = 0.5,
+    max_cells: int = 2_000_000,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Résumé des distributions (percentiles) et probabilité de ruine"""
+    sims = simulate_trade_sequences(trades, initial_capital=initial_capital, n_paths=n_paths, method=method,
+                                    ruin_level=ruin_level, max_cells=max_cells, seed=seed)
+    return {
+        "method": method,
+        "paths": n_paths,
+        "trades_per_path": len(_pnl_vector(trades)),
+        "initial_capital": initial_capital,
+        "final_capital": _distribution(sims["final_capital"]),
+        "max_drawdown": _distribution(sims["max_drawdown"]),
+        "probability_of_loss": round(float((sims["final_capital"] < initial_capital).mean()) * 100, 2),
+        "ruin_level_percent": ruin_level * 100,
+        "risk_of_ruin": round(float(sims["ruined"].mean()) * 100, 2),
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Monte Carlo des séquences de trades (risque de ruine)")
+    parser.add_argument("--symbols", nargs="+", default=["XAUUSD", "EURUSD"])
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--start", default=None, help="Début de la période (lue dans data/partitions si présent)")
+    parser.add_argument("--end", default=None, help="Fin de la période")
+    parser.add_argument("--paths", type=int, default=10000)
+    parser.add_argument("--method", choices=METHODS, default="bootstrap")
+    parser.add_argument("--ruin-level", type=float, default=0.5, help="Perte (fraction du capital) = ruine")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    fm = FileManager(data_dir=args.data_dir)
+    reports = {}
+    for symbol in args.symbols:
+        strategy = BBKeltnerStrategy()
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                df = fm.load_period(symbol, args.start, args.end)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"⚠️  {symbol} ignoré: {e}")
+            continue
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            strategy.execute_trading_strategy(strategy.generate_trading_signals(df))
+        if not strategy.closed_trades:
+            print(f"⚠️  {symbol}: aucun trade à simuler")
+            continue
+
+        start = time.perf_counter()
+        report = monte_carlo_report(strategy.closed_trades, initial_capital=strategy.initial_capital,
+                                    n_paths=args.paths, method=args.method, ruin_level=args.ruin_level,
+                                    seed=args.seed)
+        elapsed = time.perf_counter() - start
+        reports[symbol] = report
+
+        fc, dd = report["final_capital"], report["max_drawdown"]
+        print(f"\n🎲 {symbol}: {report['paths']:,} chemins x {report['trades_per_path']} trades ({args.method})")
+        print(f"   💰 Capital final: p5 {fc['p5']:,.2f}€ | médiane {fc['p50']:,.2f}€ | p95 {fc['p95']:,.2f}€")
+        print(f"   ⚠️  Drawdown max: médiane {dd['p50']}% | p95 {dd['p95']}%")
+        print(f"   📉 Probabilité de perte: {report['probability_of_loss']}%")
+        print(f"   💀 Risque de ruine (-{report['ruin_level_percent']:.0f}%): {report['risk_of_ruin']}%")
+        print(f"   ⏱️  {elapsed:.2f}s")
+    return reports
+
+
+if __name__ == "__main__":
+    main()
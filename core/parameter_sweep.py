@@ -0,0 +1,172 @@
+"""
+Parameter Sweep
+---------------
+Balayage parallèle des paramètres de BBKeltnerStrategy sur plusieurs symboles.
+
+Chaque process worker charge les CSV une seule fois (core.backtest_worker) et garde en
+mémoire les colonnes d'indicateurs déjà calculées : une combinaison qui ne change que
+risk_reward_ratio ou la killzone réutilise les mêmes bandes BB / KC.
+
+Usage :
+    python -m core.parameter_sweep --symbols XAUUSD EURUSD \\
+        --param bb_period=14,20,30 --param bb_std=1.5,2.0 --param risk_reward_ratio=1.5,1.8,2.5
+"""
+
+import argparse
+import contextlib
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, get_args, get_type_hints
+
+import pandas as pd
+
+from core.backtest_worker import WORKER_DATA, flatten_report, init_worker, signal_frame
+from core.strategy import BBKeltnerStrategy
+
+# Paramètres du constructeur qui influencent les indicateurs : placés en tête de grille
+# pour que les combinaisons consécutives (envoyées au même worker) les partagent.
+INDICATOR_PARAMS = ["bb_period", "bb_std", "kc_ema_period", "kc_atr_period", "kc_mult", "ema_filter_period"]
+
+
+def _is_scalar_param(annotation: Any) -> bool:
+    """bool / int / float / str, éventuellement Optional[...] (ex. htf_timeframe, broker_tz)"""
+    types = [t for t in get_args(annotation) if t is not type(None)] or [annotation]
+    return all(t in (bool, int, float, str) for t in types)
+
+
+# Paramètres scalaires du constructeur, lus depuis les annotations (les objets injectés
+# comme resampler, session_calendar, indicator_cache ou event_log sont exclus)
+SWEEPABLE_PARAMS = [
+    name for name, annotation in get_type_hints(BBKeltnerStrategy.__init__).items()
+    if name != "return" and _is_scalar_param(annotation)
+]
+
+
+def expand_grid(param_grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Produit cartésien de la grille, paramètres d'indicateurs en premier"""
+    unknown = set(param_grid) - set(SWEEPABLE_PARAMS)
+    if unknown:
+        raise ValueError(f"Paramètres inconnus: {sorted(unknown)}")
+
+    names = sorted(param_grid, key=lambda n: (n not in INDICATOR_PARAMS, INDICATOR_PARAMS.index(n) if n in INDICATOR_PARAMS else 0))
+    values = [list(param_grid[name]) for name in names]
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def _run_combination(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Backtest d'une combinaison de paramètres sur tous les symboles du worker"""
+    rows = []
+    for symbol in WORKER_DATA:
+        # Les colonnes sont déjà mémorisées par clé de paramètres : pas de double stockage
+        strategy = BBKeltnerStrategy(**params, indicator_cache=None)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            df_signals = signal_frame(strategy, symbol)
+            strategy.execute_trading_strategy(df_signals)
+            report = strategy.generate_money_management_report(symbol)
+        rows.append({"symbol": symbol, **params, **flatten_report(report)})
+    return rows
+
+
+def run_parameter_sweep(
+    param_grid: Dict[str, List[Any]],
+    symbols: List[str],
+    data_dir: str = "data",
+    max_workers: Optional[int] = None,
+    sort_by: str = "net_profit",
+    ascending: bool = False,
+    start=None,
+    end=None,
+) -> pd.DataFrame:
+    """
+    Lance le balayage et retourne un tableau classé (une ligne par combinaison et symbole)
+    des métriques de generate_money_management_report. start / end bornent les données
+    (FileManager.load_period).
+    """
+    combos = expand_grid(param_grid)
+    if not combos:
+        return pd.DataFrame()
+
+    max_workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, math.ceil(len(combos) / (max_workers * 4)))
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                             initargs=(data_dir, symbols, start, end)) as executor:
+        for combo_rows in executor.map(_run_combination, combos, chunksize=chunksize):
+            rows.extend(combo_rows)
+
+    table = pd.DataFrame(rows)
+    if sort_by in table.columns:
+        table = table.sort_values(sort_by, ascending=ascending, na_position="last", kind="stable")
+    table.insert(0, "rank", range(1, len(table) + 1))
+    return table.reset_index(drop=True)
+
+
+def _parse_value(raw: str) -> Any:
+    if raw.lower() == "none":
+        return None  # ex. htf_timeframe=None,1h
+    if raw.lower() in ("true", "false"):
+        return raw.lower() == "true"  # ex. killzone_wraps_midnight=true
+    for cast in (int, float):
+        try:
+            return cast(raw)
+        except ValueError:
+            pass
+    return raw
+
+
+def parse_grid(specs: List[str]) -> Dict[str, List[Any]]:
+    """Convertit ["bb_period=14,20", "killzone_start=02:00,03:00"] en grille"""
+    grid = {}
+    for spec in specs:
+        if "=" not in spec:
+            raise ValueError(f"Paramètre invalide (attendu nom=v1,v2): {spec}")
+        name, raw_values = spec.split("=", 1)
+        grid[name.strip()] = [_parse_value(v.strip()) for v in raw_values.split(",") if v.strip()]
+    return grid
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Balayage parallèle des paramètres BB/Keltner")
+    parser.add_argument("--symbols", nargs="+", default=["XAUUSD", "EURUSD"])
+    parser.add_argument("--param", action="append", default=[], metavar="NOM=V1,V2",
+                        help=f"Valeurs à tester ({', '.join(SWEEPABLE_PARAMS)})")
+    parser.add_argument("--grid-file", help="Grille au format JSON {nom: [valeurs]}")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--start", default=None, help="Début de la période (lue dans data/partitions si présent)")
+    parser.add_argument("--end", default=None, help="Fin de la période")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--sort-by", default="net_profit")
+    parser.add_argument("--ascending", action="store_true")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--output", help="Chemin CSV pour le tableau complet")
+    args = parser.parse_args(argv)
+
+    grid = {}
+    if args.grid_file:
+        with open(args.grid_file, encoding="utf-8") as f:
+            grid.update(json.load(f))
+    grid.update(parse_grid(args.param))
+
+    n_combos = len(expand_grid(grid))
+    print(f"🔬 BALAYAGE: {n_combos} combinaisons x {len(args.symbols)} symboles")
+    start = time.perf_counter()
+    table = run_parameter_sweep(grid, args.symbols, data_dir=args.data_dir, max_workers=args.workers,
+                                sort_by=args.sort_by, ascending=args.ascending, start=args.start, end=args.end)
+    elapsed = time.perf_counter() - start
+
+    print(table.head(args.top).to_string(index=False))
+    print(f"⏱️  {len(table)} backtests en {elapsed:.2f}s ({len(table) / elapsed:.1f} backtests/s)")
+
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"💾 Résultats sauvegardés: {args.output}")
+    return table
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Portfolio Backtester
+--------------------
+Backtest multi-symboles à capital partagé.
+
+Chaque symbole produit sa table de candidats (signaux, stop loss, take profit et sortie
+SL / TP résolue en lot par core.exit_resolver). Les tables sont fusionnées en un seul flux
+trié par horodatage (concaténation + lexsort, sans boucles imbriquées), puis parcourues
+dans l'ordre : les positions sont dimensionnées sur le current_capital commun et
+les limites d'exposition inter-symboles sont appliquées à chaque entrée.
+
+Le risque ouvert est la perte si tous les stop loss étaient touchés, dans l'unité du PnL :
+|entrée - SL| x units par position (voir position_risk).
+
+Usage :
+    python -m core.portfolio --symbols XAUUSD EURUSD --max-open 3 --max-risk 3.0
+"""
+
+import argparse
+import contextlib
+import heapq
+import os
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.exit_resolver import resolve_exits, EXIT_REASONS, END_OF_DATA
+from core.equity_curve import equity_curve
+from core.strategy import BBKeltnerStrategy
+from core.trade_ledger import TradeLedger
+from utils.event_log import EventLog, NULL_EVENT_LOG, INFO
+from utils.file_manager import FileManager
+
+
+class PortfolioBacktester:
+    """
+    Exécute BBKeltnerStrategy sur N symboles avec un seul capital.
+    Les trades fermés (clé "symbol" ajoutée) sont enregistrés dans strategy.closed_trades,
+    ce qui permet de réutiliser generate_money_management_report pour le portefeuille.
+    """
+
+    def __init__(
+        self,
+        strategy: Optional[BBKeltnerStrategy] = None,
+        max_open_positions: int = 3,
+        max_positions_per_symbol: int = 1,
+        max_total_risk_percent: float = 3.0,
+        min_gap_seconds: int = 900,
+        event_log: Optional[EventLog] = None,
+    ):
+        self.strategy = strategy or BBKeltnerStrategy()
+        self.max_open_positions = max_open_positions
+        self.max_positions_per_symbol = max_positions_per_symbol
+        self.max_total_risk_percent = max_total_risk_percent
+        self.min_gap = np.timedelta64(min_gap_seconds, "s")
+        self.event_log = event_log or NULL_EVENT_LOG
+        self.symbols: List[str] = []
+        self.rejections: Counter = Counter()
+        self.max_concurrent_positions = 0
+        self.max_open_risk_percent = 0.0
+
+    @staticmethod
+    def position_risk(trade: Dict[str, Any]) -> float:
+        """
+        Perte de la position si le stop loss est touché, comme trade_pnl : |entrée - SL| x units
+        (égale au risk_amount de calculate_position_size, aux arrondis près).
+        """
+        return abs(trade["entry_price"] - trade["stop_loss"]) * trade["units"]
+
+    def candidate_table(self, symbol: str, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Candidats d'entrée d'un symbole (filtres statiques de entry_candidates) avec
+        stop loss, take profit et sortie déjà résolus. Ne dépend pas du capital.
+        """
+        strategy = self.strategy
+        df_signals = strategy.generate_trading_signals(df)
+        candidates = strategy.entry_candidates(df_signals)
+
+        close = df_signals["close"].to_numpy()
+        signal = df_signals["signal"].to_numpy()
+        directions = np.where(signal[candidates] == 1, "LONG", "SHORT")
+
+        stop_loss = np.array([strategy.calculate_stop_loss_optimized(df_signals, i, d)
+                              for i, d in zip(candidates, directions)], dtype=float)
+        # Mêmes arrondis que build_trade
+        take_profit = np.array([round(strategy.take_profit_price(float(close[i]), sl, d), 5)
+                                for i, sl, d in zip(candidates, stop_loss, directions)], dtype=float)
+
+        exits = resolve_exits(
+            df_signals["high"].to_numpy(), df_signals["low"].to_numpy(), close,
+            entry_idx=candidates,
+            direction=np.where(directions == "LONG", 1, -1),
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+        )
+        timestamps = df_signals.index.values
+        end_of_data = exits["exit_reason"] == END_OF_DATA
+        exit_index = np.where(end_of_data, len(df_signals) - 1, exits["exit_index"])
+
+        return {
+            "time": timestamps[candidates],
+            "entry_price": close[candidates],
+            "direction": directions,
+            "stop_loss": stop_loss,
+            "phase": df_signals["phase"].to_numpy()[candidates],
+            "exit_time": timestamps[exit_index],
+            "exit_price": np.where(end_of_data, close[-1], exits["exit_price"]),
+            "exit_reason": EXIT_REASONS[exits["exit_reason"]],
+        }
+
+    @staticmethod
+    def merge_candidates(tables: Dict[str, Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        """Fusion vectorisée des tables par horodatage (ordre des symboles en cas d'égalité)"""
+        symbols = list(tables)
+        merged = {"symbol_id": np.concatenate(
+            [np.full(len(tables[s]["time"]), k, dtype=np.int32) for k, s in enumerate(symbols)]
+        ) if symbols else np.empty(0, dtype=np.int32)}
+        for column in ("time", "entry_price", "direction", "stop_loss", "phase",
+                       "exit_time", "exit_price", "exit_reason"):
+            merged[column] = np.concatenate([tables[s][column] for s in symbols]) if symbols else np.empty(0)
+
+        order = np.lexsort((merged["symbol_id"], merged["time"]))
+        return {column: values[order] for column, values in merged.items()}
+
+    def _reject(self, reason: str) -> bool:
+        self.rejections[reason] += 1
+        return False
+
+    def _can_open(self, symbol: str, time: np.datetime64, open_positions: Dict[str, int],
+                  open_risk: float, last_entry: Dict[str, np.datetime64]) -> bool:
+        """Limites par symbole puis limites inter-symboles"""
+        last = last_entry.get(symbol)
+        if last is not None and time - last < self.min_gap:
+            return self._reject("min_gap")
+        if open_positions.get(symbol, 0) >= self.max_positions_per_symbol:
+            return self._reject("symbol_position_limit")
+        if sum(open_positions.values()) >= self.max_open_positions:
+            return self._reject("portfolio_position_limit")
+        if open_risk >= self.strategy.current_capital * self.max_total_risk_percent / 100:
+            return self._reject("portfolio_risk_limit")
+        return True
+
+    def run(self, data: Dict[str, pd.DataFrame]) -> TradeLedger:
+        """Backtest du portefeuille {symbole: OHLC} ; retourne le ledger commun"""
+        strategy = self.strategy
+        strategy.current_capital = strategy.initial_capital
+        strategy.trades = TradeLedger()
+        strategy.closed_trades = TradeLedger()
+        strategy.portfolio_history = pd.Series(dtype=float, name="equity")
+        strategy.last_trade_time = None
+        self.symbols = list(data)
+        self.rejections = Counter()
+        self.max_concurrent_positions = 0
+        self.max_open_risk_percent = 0.0
+
+        tables = {symbol: self.candidate_table(symbol, df) for symbol, df in data.items()}
+        events = self.merge_candidates(tables)
+
+        # Positions ouvertes : tas (horodatage de sortie, ordre d'ouverture, ...)
+        open_heap = []
+        open_positions: Dict[str, int] = {}
+        last_entry: Dict[str, np.datetime64] = {}
+        open_risk = 0.0
+
+        def close_until(time: Optional[np.datetime64]):
+            nonlocal open_risk
+            while open_heap and (time is None or open_heap[0][0] <= time):
+                exit_time, _, symbol, trade, exit_price, reason = heapq.heappop(open_heap)
+                strategy.close_trade(trade, exit_price, reason, strategy.trade_pnl(trade, exit_price),
+                                     pd.Timestamp(exit_time))
+                open_positions[symbol] -= 1
+                open_risk = open_risk - self.position_risk(trade) if open_heap else 0.0
+
+        for k in range(len(events["time"])):
+            time = events["time"][k]
+            symbol = self.symbols[events["symbol_id"][k]]
+            close_until(time)
+
+            if not self._can_open(symbol, time, open_positions, open_risk, last_entry):
+                continue
+
+            trade = strategy.build_trade(pd.Timestamp(time), float(events["entry_price"][k]),
+                                         str(events["direction"][k]), float(events["stop_loss"][k]),
+                                         str(events["phase"][k]), symbol)
+            if trade is None:
+                self._reject("risk_filter")
+                continue
+            risk = self.position_risk(trade)
+            if open_risk + risk > strategy.current_capital * self.max_total_risk_percent / 100:
+                self._reject("portfolio_risk_limit")
+                continue
+
+            trade["symbol"] = symbol
+            strategy.trades.append(trade)
+            heapq.heappush(open_heap, (events["exit_time"][k], len(strategy.trades), symbol, trade,
+                                       float(events["exit_price"][k]), str(events["exit_reason"][k])))
+            open_positions[symbol] = open_positions.get(symbol, 0) + 1
+            open_risk += risk
+            last_entry[symbol] = time
+            strategy.last_trade_time = trade["entry_time"]
+            self.max_concurrent_positions = max(self.max_concurrent_positions, len(open_heap))
+            self.max_open_risk_percent = max(self.max_open_risk_percent,
+                                             open_risk / strategy.current_capital * 100)
+
+            if self.event_log.enabled_for(INFO):
+                self.event_log.info("portfolio_open", "🎯 {symbol} OPEN {direction} | {time} | Lots: {lots}",
+                                    symbol=symbol, direction=trade["direction"], time=trade["entry_time"],
+                                    lots=trade["lots"], open_positions=len(open_heap), open_risk=open_risk)
+
+        close_until(None)
+        strategy.portfolio_history = self.equity_curve(data)
+        return strategy.closed_trades
+
+    def equity_curve(self, data: Dict[str, pd.DataFrame]) -> pd.Series:
+        """Capital mark-to-market du portefeuille sur l'union des horodatages des symboles"""
+        ledger = self.strategy.closed_trades
+        index = pd.DatetimeIndex(np.unique(np.concatenate([df.index.values for df in data.values()])))
+        equity = np.full(len(index), float(self.strategy.initial_capital))
+        if not len(ledger):
+            return pd.Series(equity, index=index, name="equity")
+        for symbol, df in data.items():
+            # PnL (réalisé + latent) du symbole, prolongé sur les horodatages des autres symboles
+            pnl = equity_curve(ledger.take(ledger.mask_equal("symbol", symbol)), df, 0.0)
+            equity += pnl.reindex(index, method="ffill").fillna(0.0).to_numpy()
+        return pd.Series(equity, index=index, name="equity")
+
+    def generate_report(self) -> Dict[str, Any]:
+        """Rapport money management du portefeuille + détail par symbole et exposition"""
+        report = self.strategy.generate_money_management_report("PORTFOLIO")
+        if "error" in report:
+            return report
+
+        ledger = self.strategy.closed_trades
+        all_pnl = ledger.column("pnl")
+        by_symbol = {}
+        for symbol in self.symbols:
+            pnl = all_pnl[ledger.mask_equal("symbol", symbol)]
+            by_symbol[symbol] = {
+                "total_trades": int(len(pnl)),
+                "net_profit": round(float(pnl.sum()), 2),
+                "win_rate": round(float((pnl > 0).mean()) * 100, 1) if len(pnl) else 0,
+            }
+        report["by_symbol"] = by_symbol
+        report["exposure"] = {
+            "max_open_positions": self.max_open_positions,
+            "max_positions_per_symbol": self.max_positions_per_symbol,
+            "max_total_risk_percent": self.max_total_risk_percent,
+            "max_concurrent_positions": self.max_concurrent_positions,
+            "max_open_risk_percent": round(self.max_open_risk_percent, 2),
+            "rejected_entries": dict(self.rejections),
+        }
+        return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Backtest multi-symboles à capital partagé")
+    parser.add_argument("--symbols", nargs="+", default=["XAUUSD", "EURUSD"])
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--start", default=None, help="Début de la période (lue dans data/partitions si présent)")
+    parser.add_argument("--end", default=None, help="Fin de la période")
+    parser.add_argument("--max-open", type=int, default=3, help="Positions ouvertes max (tous symboles)")
+    parser.add_argument("--max-per-symbol", type=int, default=1)
+    parser.add_argument("--max-risk", type=float, default=3.0, help="Risque ouvert max (% du capital)")
+    args = parser.parse_args(argv)
+
+    fm = FileManager(data_dir=args.data_dir)
+    data = {}
+    for symbol in args.symbols:
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                data[symbol] = fm.load_period(symbol, args.start, args.end)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"⚠️  {symbol} ignoré: {e}")
+
+    backtester = PortfolioBacktester(max_open_positions=args.max_open, max_positions_per_symbol=args.max_per_symbol,
+                                     max_total_risk_percent=args.max_risk)
+    backtester.run(data)
+    report = backtester.generate_report()
+    if "error" in report:
+        print(f"⚠️  {report['error']}")
+        return report
+
+    mm, perf = report["money_management"], report["performance"]
+    print(f"💼 PORTEFEUILLE {' + '.join(data)} (capital partagé {mm['initial_capital']:,.0f}€)")
+    print(f"   📈 Profit Net: {mm['net_profit']:+,.2f}€ ({mm['return_percent']:+.2f}%)")
+    print(f"   🎯 Trades: {perf['total_trades']} (✅ {perf['winning_trades']} | ❌ {perf['losing_trades']})")
+    print(f"   ⚠️  Drawdown: {mm['max_drawdown']}%")
+    for symbol, stats in report["by_symbol"].items():
+        print(f"   • {symbol}: {stats['net_profit']:+,.2f}€ | {stats['total_trades']} trades | {stats['win_rate']}%")
+    exposure = report["exposure"]
+    print(f"   🔒 Positions simultanées max: {exposure['max_concurrent_positions']} | "
+          f"Risque ouvert max: {exposure['max_open_risk_percent']}% | Rejets: {exposure['rejected_entries']}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
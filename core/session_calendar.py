@@ -0,0 +1,180 @@
+"""
+Session Calendar
+----------------
+Sessions de trading nommées (Asia / London / NY, killzone...) converties en masques
+booléens sur un index de bougies, en une passe vectorisée sur l'heure du jour entière.
+
+- Bornes "HH:MM" inclusives (comme l'ancien killzone_start <= t <= killzone_end).
+  Sessions à cheval sur minuit (start > end) : acceptées par défaut ; avec
+  wrap_midnight=False, une telle session ne correspond à aucune bougie (comportement
+  de l'ancienne comparaison killzone_start <= t <= killzone_end).
+- Une session peut être exprimée dans son propre fuseau (ex. Europe/London) : l'index,
+  naïf dans le fuseau du broker, est converti avec les changements d'heure (DST).
+  Sans fuseau de session, les heures sont lues directement dans l'heure du broker.
+  broker_tz=None suppose des horodatages naïfs en UTC : les exports MT5 sont en général
+  dans l'heure du serveur (souvent UTC+2 / UTC+3), à renseigner explicitement.
+- Masques mis en cache par index (empreinte), LRU borné en nombre d'entrées.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from core.trade_ledger import TradeLedger
+from indicators.cache import IndicatorCache
+
+# Horaires locaux des grandes places (convertis dans l'heure du broker)
+DEFAULT_SESSIONS = {
+    "Asia": ("09:00", "18:00", "Asia/Tokyo"),
+    "London": ("08:00", "17:00", "Europe/London"),
+    "NY": ("08:00", "17:00", "America/New_York"),
+}
+
+_NS_PER_MINUTE = 60 * 10**9
+_NS_PER_DAY = 24 * 60 * _NS_PER_MINUTE
+
+SessionSpec = Union[Tuple[str, str], Tuple[str, str, Optional[str]]]
+
+
+def _minute_of_day(value: str) -> int:
+    hours, minutes = map(int, value.split(":"))
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(f"Heure invalide: {value}")
+    return hours * 60 + minutes
+
+
+def _time_of_day_ns(stamps: np.ndarray) -> np.ndarray:
+    """Heure du jour en nanosecondes (entiers) pour des datetime64 de n'importe quelle unité"""
+    return stamps.astype("datetime64[ns]").view(np.int64) % _NS_PER_DAY
+
+
+class SessionCalendar:
+    """
+    Calendrier de sessions : {nom: (début, fin)} ou {nom: (début, fin, fuseau)}.
+    broker_tz = fuseau des horodatages naïfs des CSV (None : UTC pour les conversions).
+    wrap_midnight = sessions start > end à cheval sur minuit (False : jamais actives).
+    """
+
+    def __init__(self, sessions: Optional[Dict[str, SessionSpec]] = None,
+                 broker_tz: Optional[str] = None, max_entries: int = 32, wrap_midnight: bool = True):
+        sessions = DEFAULT_SESSIONS if sessions is None else sessions
+        if not sessions:
+            raise ValueError("Au moins une session est requise")
+        self.broker_tz = broker_tz
+        self.wrap_midnight = wrap_midnight
+        self.sessions: Dict[str, Tuple[int, int, Optional[str]]] = {}
+        for name, spec in sessions.items():
+            start, end = spec[0], spec[1]
+            tz = spec[2] if len(spec) > 2 else None
+            self.sessions[name] = (_minute_of_day(start), _minute_of_day(end), tz)
+        self.max_entries = max_entries
+        self._masks: "OrderedDict[str, Dict[str, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def names(self) -> Sequence[str]:
+        return list(self.sessions)
+
+    def settings(self) -> Dict[str, Any]:
+        """Fuseaux et bornes effectifs (joints aux rapports : hypothèse UTC visible)"""
+        return {
+            "broker_tz": self.broker_tz or "UTC",
+            "broker_tz_assumed": self.broker_tz is None,
+            "wrap_midnight": self.wrap_midnight,
+            "sessions": {name: {"start": f"{start // 60:02d}:{start % 60:02d}", "end": f"{end // 60:02d}:{end % 60:02d}",
+                                "tz": tz or self.broker_tz or "UTC"}
+                         for name, (start, end, tz) in self.sessions.items()},
+        }
+
+    def _local_time_of_day(self, index: pd.DatetimeIndex, tz: Optional[str]) -> np.ndarray:
+        """Heure du jour dans le fuseau de la session (heures inexistantes / ambiguës -> -1)"""
+        if tz is None or tz == self.broker_tz:
+            return _time_of_day_ns(index.values)
+        localized = index.tz_localize(self.broker_tz or "UTC", ambiguous="NaT", nonexistent="NaT")
+        local = localized.tz_convert(tz).tz_localize(None)
+        tod = _time_of_day_ns(local.values)
+        tod[np.isnat(local.values)] = -1
+        return tod
+
+    def _window(self, tod: np.ndarray, start: int, end: int) -> np.ndarray:
+        lower = start * _NS_PER_MINUTE
+        upper = end * _NS_PER_MINUTE
+        if start <= end:
+            return (tod >= lower) & (tod <= upper)
+        if not self.wrap_midnight:
+            return np.zeros_like(tod, dtype=bool)  # ancien comportement : jamais dans la session
+        return (tod >= lower) | ((tod >= 0) & (tod <= upper))  # session à cheval sur minuit
+
+    def masks(self, index: pd.DatetimeIndex) -> Dict[str, np.ndarray]:
+        """Masque booléen par session (calculé une fois par index, puis servi depuis le cache)"""
+        key = IndicatorCache.fingerprint(index.values.view(np.int64))
+        with self._lock:
+            cached = self._masks.get(key)
+            if cached is not None:
+                self._masks.move_to_end(key)
+                self.hits += 1
+                return cached
+
+        # Une seule conversion par fuseau, puis des comparaisons d'entiers
+        by_tz: Dict[Optional[str], np.ndarray] = {}
+        masks = {}
+        for name, (start, end, tz) in self.sessions.items():
+            if tz not in by_tz:
+                by_tz[tz] = self._local_time_of_day(index, tz)
+            masks[name] = self._window(by_tz[tz], start, end)
+
+        with self._lock:
+            self.misses += 1
+            self._masks[key] = masks
+            while len(self._masks) > self.max_entries:
+                self._masks.popitem(last=False)
+        return masks
+
+    def mask(self, index: pd.DatetimeIndex, name: Optional[str] = None) -> np.ndarray:
+        """Masque d'une session, ou union de toutes les sessions si name est None"""
+        masks = self.masks(index)
+        if name is not None:
+            return masks[name]
+        return np.logical_or.reduce(list(masks.values()))
+
+    def _timestamp_time_of_day(self, timestamp: pd.Timestamp, tz: Optional[str]) -> int:
+        if tz is None or tz == self.broker_tz:
+            return pd.Timestamp(timestamp).value % _NS_PER_DAY
+        return int(self._local_time_of_day(pd.DatetimeIndex([timestamp]), tz)[0])
+
+    def contains(self, timestamp: pd.Timestamp, name: Optional[str] = None) -> bool:
+        """Version bougie par bougie (live) : même arithmétique entière, sans cache"""
+        names = [name] if name is not None else self.names
+        for session in names:
+            start, end, tz = self.sessions[session]
+            if self._window(self._timestamp_time_of_day(timestamp, tz), start, end):
+                return True
+        return False
+
+    def trade_stats(self, trades: TradeLedger) -> Dict[str, Dict[str, Any]]:
+        """Statistiques des trades par session d'entrée (un trade peut compter dans plusieurs sessions)"""
+        if len(trades) == 0:
+            return {name: {"total_trades": 0} for name in self.sessions}
+
+        entry_index = pd.DatetimeIndex(trades.column("entry_time"))
+        pnl = trades.column("pnl").astype(float)
+        stats = {}
+        for name, mask in self.masks(entry_index).items():
+            session_pnl = pnl[mask]
+            count = len(session_pnl)
+            stats[name] = {
+                "total_trades": count,
+                "win_rate": round(float((session_pnl > 0).mean()) * 100, 2) if count else 0.0,
+                "total_pnl": round(float(session_pnl.sum()), 2),
+                "avg_pnl": round(float(session_pnl.mean()), 2) if count else 0.0,
+            }
+        return stats
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._masks), "hits": self.hits, "misses": self.misses}
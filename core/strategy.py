@@ -1,11 +1,19 @@
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from datetime import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from enum import Enum
 
 from indicators.bollinger_bands import BollingerBands
 from indicators.keltner_channel import KeltnerChannel
+from indicators.cache import IndicatorCache, default_cache
+from core.exit_resolver import resolve_exits, EXIT_REASONS, END_OF_DATA
+from core.trade_ledger import TradeLedger
+from core.equity_curve import equity_curve, drawdown_stats
+from core.session_calendar import SessionCalendar
+from utils.event_log import EventLog, NULL_EVENT_LOG, DEBUG, INFO
+from utils.resampler import TimeframeResampler, default_resampler, align_to_base, base_step
 
 class TradeStatus(Enum):
     OPEN = "OPEN"
@@ -31,17 +39,26 @@ class BBKeltnerStrategy:
         killzone_end: str = "06:30",
         risk_reward_ratio: float = 1.8,
         ema_filter_period: int = 50,
-        confirmation_candles: int = 1  # Réduit de 2 à 1
+        confirmation_candles: int = 1,  # Réduit de 2 à 1
+        htf_timeframe: Optional[str] = None,  # "1h" / "4h" / "D" : filtre de tendance HTF
+        htf_ema_period: int = 50,
+        resampler: Optional[TimeframeResampler] = None,
+        broker_tz: Optional[str] = None,  # fuseau des horodatages CSV (ex. "Europe/Athens")
+        killzone_wraps_midnight: bool = False,  # killzone start > end à cheval sur minuit (sinon jamais active)
+        session_calendar: Optional[SessionCalendar] = None,
+        indicator_cache: Optional[IndicatorCache] = default_cache,
+        event_log: Optional[EventLog] = None
     ):
         self.initial_capital = initial_capital
         self.current_capital = initial_capital
         self.risk_per_trade = risk_per_trade
         
-        self.bb = BollingerBands(period=bb_period, std_dev=bb_std)
+        self.bb = BollingerBands(period=bb_period, std_dev=bb_std, cache=indicator_cache)
         self.kc = KeltnerChannel(
             ema_period=kc_ema_period,
             atr_period=kc_atr_period,
-            atr_multiplier=kc_mult
+            atr_multiplier=kc_mult,
+            cache=indicator_cache
         )
 
         # Killzone
@@ -49,30 +66,50 @@ class BBKeltnerStrategy:
         h_end, m_end = map(int, killzone_end.split(":"))
         self.killzone_start = time(h_start, m_start)
         self.killzone_end = time(h_end, m_end)
+        self.killzone = SessionCalendar({"killzone": (killzone_start, killzone_end)}, broker_tz=broker_tz,
+                                        wrap_midnight=killzone_wraps_midnight)
+        # Sessions Asia / London / NY pour les statistiques par session du rapport
+        self.session_calendar = session_calendar or SessionCalendar(broker_tz=broker_tz)
         self.risk_reward_ratio = risk_reward_ratio
         self.ema_period = ema_filter_period
         self.confirmation_candles = confirmation_candles
+        self.sl_atr_period = 14
+        self.sl_swing_window = 3
+
+        # Tendance sur timeframe supérieur (désactivée par défaut)
+        self.htf_timeframe = htf_timeframe
+        self.htf_ema_period = htf_ema_period
+        self.resampler = resampler or default_resampler
+
+        # Journal d'événements (inactif par défaut : aucune sortie console dans les boucles)
+        self.event_log = event_log or NULL_EVENT_LOG
         
-        # Suivi des trades
-        self.trades = []
-        self.portfolio_history = []
-        self.closed_trades = []
+        # Suivi des trades (ledgers en colonnes typées)
+        self.trades = TradeLedger()
+        self.portfolio_history = pd.Series(dtype=float, name="equity")  # capital mark-to-market par bougie
+        self.closed_trades = TradeLedger()
         self.last_trade_time = None
 
     def in_killzone(self, dt: pd.Timestamp) -> bool:
-        t = dt.time()
-        return self.killzone_start <= t <= self.killzone_end
+        return self.killzone.contains(dt)
+
+    def killzone_mask(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """Masque killzone de tout un index (vectorisé, mis en cache par index)"""
+        return self.killzone.mask(index, "killzone")
 
     def calculate_position_size(self, entry_price: float, stop_loss: float, symbol: str) -> Dict[str, float]:
         """Calcul des lots avec risk management strict"""
         risk_amount = self.current_capital * self.risk_per_trade
         
+        # Unités par lot : risk_amount = |entrée - SL| x units, la perte réelle de trade_pnl au SL
         if "XAU" in symbol:
             pip_value = 1.0
             pip_distance = abs(entry_price - stop_loss) / 0.01
+            units_per_lot = 100  # 1 lot = 100 onces, 1$ par pip de 0.01
         else:  # EURUSD
             pip_value = 1.0
             pip_distance = abs(entry_price - stop_loss) / 0.0001
+            units_per_lot = 10000
         
         if pip_distance == 0:
             return {"lots": 0, "risk_amount": 0, "units": 0, "risk_percent": 0}
@@ -82,7 +119,7 @@ class BBKeltnerStrategy:
         
         actual_risk = pip_distance * pip_value * lots
         risk_percent = (actual_risk / self.current_capital) * 100
-        units = lots * 10000
+        units = lots * units_per_lot
         
         return {
             "lots": lots,
@@ -96,8 +133,8 @@ class BBKeltnerStrategy:
         return (bb_upper > kc_upper) or (bb_lower < kc_lower)
 
     def is_bb_inside_kc(self, bb_upper: float, bb_lower: float, kc_upper: float, kc_lower: float, tolerance: float = 0.03) -> bool:
-        """Vérifie si BB est RENTRÉ dans le KC (tolérance 3%)"""
-        return (bb_upper <= kc_upper * (1 + tolerance)) and (bb_lower >= kc_lower * (1 - tolerance))
+        """Vérifie si BB est RENTRÉ dans le KC (tolérance 3%) - scalaires ou tableaux NumPy"""
+        return (bb_upper <= kc_upper * (1 + tolerance)) & (bb_lower >= kc_lower * (1 - tolerance))
 
     def calculate_ema(self, df: pd.DataFrame, period: int) -> pd.Series:
         return df['close'].ewm(span=period, adjust=False).mean()
@@ -111,8 +148,11 @@ class BBKeltnerStrategy:
 
         current_time = df.index[current_index]
         
-        # 1. Killzone uniquement
-        if not self.in_killzone(current_time):
+        # 1. Killzone uniquement (masque précalculé par add_signal_columns)
+        if 'in_killzone' in df.columns:
+            if not df['in_killzone'].iloc[current_index]:
+                return False
+        elif not self.in_killzone(current_time):
             return False
 
         # FILTRE TENDANCE - Évite les trades contre-tendance
@@ -137,8 +177,7 @@ class BBKeltnerStrategy:
             return False
             
         # 6. Un seul trade maximum
-        open_trades = [t for t in self.trades if t.get('status') == 'OPEN']
-        if len(open_trades) >= 1:
+        if self.trades.any_equal('status', 'OPEN'):
             return False
             
         return True
@@ -169,8 +208,18 @@ class BBKeltnerStrategy:
     
         current_signal = df['signal'].iloc[i]
     
-        print(f"🎯 Trend Check: Signal={current_signal}, EMA20={ema_20:.2f}, EMA50={ema_50:.2f}, Trend_OK={ema_20 > ema_50 if current_signal == 1 else ema_20 < ema_50}")
+        if self.event_log.enabled_for(DEBUG):
+            self.event_log.debug(
+                "trend_check",
+                "🎯 Trend Check: Signal={signal}, EMA20={ema_20:.2f}, EMA50={ema_50:.2f}, Trend_OK={trend_ok}",
+                signal=current_signal, ema_20=ema_20, ema_50=ema_50,
+                trend_ok=ema_20 > ema_50 if current_signal == 1 else ema_20 < ema_50,
+            )
     
+        # Tendance HTF (bougies clôturées uniquement) dans le même sens que le signal
+        if 'htf_trend' in df.columns and df['htf_trend'].iloc[i] != current_signal:
+            return False
+
         # Pour LONG: EMA20 > EMA50 (tendance haussière)
         if current_signal == 1:
             return ema_20 > ema_50
@@ -212,36 +261,110 @@ class BBKeltnerStrategy:
             
         return False
 
+    def stop_loss_columns(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Colonnes utilisées par calculate_stop_loss_optimized, calculées en une passe :
+        - atr_14 : moyenne des 14 derniers True Range (moins en début de série),
+          le premier True Range valant high - low
+        - rolling_low_3 / rolling_high_3 : plus bas / plus haut des 3 dernières bougies
+        """
+        high = df["high"].to_numpy(dtype=float)
+        low = df["low"].to_numpy(dtype=float)
+        n = len(df)
+
+        true_range = KeltnerChannel.true_range(df).to_numpy(dtype=float, copy=True)
+        if n:
+            true_range[0] = high[0] - low[0]
+
+        period = self.sl_atr_period
+        atr = np.empty(n)
+        head = min(n, period - 1)
+        for i in range(head):
+            atr[i] = np.mean(true_range[:i + 1])
+        if n >= period:
+            atr[period - 1:] = sliding_window_view(true_range, period).mean(axis=1)
+
+        window = self.sl_swing_window
+        rolling_low = pd.Series(low).rolling(window, min_periods=1).min().to_numpy()
+        rolling_high = pd.Series(high).rolling(window, min_periods=1).max().to_numpy()
+
+        return {
+            f"atr_{period}": atr,
+            f"rolling_low_{window}": rolling_low,
+            f"rolling_high_{window}": rolling_high,
+        }
+
     def calculate_stop_loss_optimized(self, df: pd.DataFrame, i: int, direction: str) -> float:
         """
         STOP LOSS OPTIMISÉ - Basé sur ATR pour plus de robustesse
+        Lit les colonnes atr_14 / rolling_low_3 / rolling_high_3 produites par
+        generate_trading_signals (calculées à la volée si absentes).
         """
-        # Calcul ATR simplifié
-        true_ranges = []
-        for j in range(max(0, i-13), i+1):
-            tr1 = df['high'].iloc[j] - df['low'].iloc[j]
-            tr2 = abs(df['high'].iloc[j] - df['close'].iloc[j-1]) if j > 0 else 0
-            tr3 = abs(df['low'].iloc[j] - df['close'].iloc[j-1]) if j > 0 else 0
-            true_ranges.append(max(tr1, tr2, tr3))
-        atr = np.mean(true_ranges) if true_ranges else (df['high'].iloc[i] - df['low'].iloc[i])
-        
-        current_price = df['close'].iloc[i]
-        
+        atr_col = f"atr_{self.sl_atr_period}"
+        low_col = f"rolling_low_{self.sl_swing_window}"
+        high_col = f"rolling_high_{self.sl_swing_window}"
+
+        if {atr_col, low_col, high_col}.issubset(df.columns):
+            atr = df[atr_col].iat[i]
+            recent_low = df[low_col].iat[i]
+            recent_high = df[high_col].iat[i]
+        else:
+            columns = self.stop_loss_columns(df)
+            atr = columns[atr_col][i]
+            recent_low = columns[low_col][i]
+            recent_high = columns[high_col][i]
+
+        return self.stop_loss_from_levels(df['close'].iat[i], atr, recent_low, recent_high, direction)
+
+    def stop_loss_from_levels(self, current_price: float, atr: float, recent_low: float,
+                              recent_high: float, direction: str) -> float:
+        """Stop loss à partir de l'ATR et des extrêmes récents déjà calculés"""
         if direction == "LONG":
-            # Stop Loss: prix - 1.5 ATR
+            # Stop Loss: prix - 2.5 ATR
             stop_loss = current_price - (atr * 2.5)
             # Mais pas en dessous du plus bas récent
-            recent_low = min([df['low'].iloc[i-j] for j in range(min(3, i+1))])
             stop_loss = max(stop_loss, recent_low * 0.999)
         else:  # SHORT
-            # Stop Loss: prix + 1.5 ATR
+            # Stop Loss: prix + 2.5 ATR
             stop_loss = current_price + (atr * 2.5)
             # Mais pas au dessus du plus haut récent
-            recent_high = max([df['high'].iloc[i-j] for j in range(min(3, i+1))])
             stop_loss = min(stop_loss, recent_high * 1.001)
-            
+
         return round(stop_loss, 5)
 
+    def bollinger_columns(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
+        """Colonnes Bollinger (dépendent de bb_period / bb_std)"""
+        bb_mid, bb_up, bb_low = self.bb.calculate(df[["close"]])
+        return {"bb_middle": bb_mid, "bb_upper": bb_up, "bb_lower": bb_low}
+
+    def keltner_columns(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
+        """Colonnes Keltner (dépendent de kc_ema_period / kc_atr_period / kc_mult)"""
+        kc_mid, kc_up, kc_low = self.kc.calculate(df)
+        return {"kc_middle": kc_mid, "kc_upper": kc_up, "kc_lower": kc_low}
+
+    def trend_columns(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
+        """EMA de tendance (EMA50 selon ema_filter_period, EMA20 fixe) + tendance HTF si activée"""
+        columns = {
+            "ema_50": self.calculate_ema(df, self.ema_period),
+            "ema_20": df['close'].ewm(span=20, adjust=False).mean(),
+        }
+        if self.htf_timeframe:
+            columns["htf_trend"] = pd.Series(self.htf_trend(df), index=df.index)
+        return columns
+
+    def htf_trend(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Tendance sur le timeframe supérieur : +1 si close HTF > EMA HTF, -1 si inférieur,
+        0 tant qu'aucune bougie HTF n'est clôturée. Les bougies HTF viennent du cache du
+        resampler et ne sont visibles qu'une fois leur seau terminé (pas de look-ahead).
+        """
+        bars = self.resampler.for_frame(df, self.htf_timeframe)
+        htf_close = bars["close"]
+        htf_ema = htf_close.ewm(span=self.htf_ema_period, adjust=False).mean()
+        trend = np.sign(htf_close.to_numpy() - htf_ema.to_numpy())
+        aligned = align_to_base(trend, bars["end"].to_numpy(), df.index, base_step(df.index))
+        return np.nan_to_num(aligned, nan=0.0).astype(np.int64)
+
     def generate_trading_signals(self, df: pd.DataFrame) -> pd.DataFrame:
         """Génération des signaux avec logique améliorée"""
         df = df.copy()
@@ -251,189 +374,282 @@ class BBKeltnerStrategy:
             if col not in df.columns:
                 raise ValueError(f"Colonne manquante: {col}")
 
-        print("📈 Calcul des indicateurs avancés...")
-        
-        # Indicateurs de base
-        bb_mid, bb_up, bb_low = self.bb.calculate(df[["close"]])
-        kc_mid, kc_up, kc_low = self.kc.calculate(df)
+        self.event_log.info("indicators_start", "📈 Calcul des indicateurs avancés...", bars=len(df))
 
-        df["bb_middle"] = bb_mid
-        df["bb_upper"] = bb_up
-        df["bb_lower"] = bb_low
-        df["kc_middle"] = kc_mid
-        df["kc_upper"] = kc_up
-        df["kc_lower"] = kc_low
-        df["ema_50"] = self.calculate_ema(df, self.ema_period)
-
-        # Après le calcul EMA50, AJOUTE :
-        df["ema_20"] = df['close'].ewm(span=20, adjust=False).mean()
-
-        # Phase de volatilité
-        df["phase"] = "EXPANSION"
-        for i in range(len(df)):
-            if self.is_bb_inside_kc(df['bb_upper'].iloc[i], df['bb_lower'].iloc[i], 
-                                  df['kc_upper'].iloc[i], df['kc_lower'].iloc[i]):
-                df.iloc[i, df.columns.get_loc('phase')] = "CONTRACTION"
-
-        # Signaux bruts
-       # Signaux basés sur CASSURE + TENDANCE
-        df["raw_signal"] = 0
-        for i in range(50, len(df)):  # Besoin de EMA50
-        # SCÉNARIO HAUSSIER : Prix > BB supérieure + EMA20 > EMA50
-            if (df["close"].iloc[i] > df["bb_upper"].iloc[i] and 
-                df["ema_20"].iloc[i] > df["ema_50"].iloc[i]):
-                df.iloc[i, df.columns.get_loc('raw_signal')] = 1
-    
-        # SCÉNARIO BAISSIER : Prix < BB inférieure + EMA20 < EMA50  
-            elif (df["close"].iloc[i] < df["bb_lower"].iloc[i] and 
-                df["ema_20"].iloc[i] < df["ema_50"].iloc[i]):
-                df.iloc[i, df.columns.get_loc('raw_signal')] = -1
+        # Indicateurs de base, EMA de tendance, puis ATR et extrêmes récents
+        # pour le stop loss (lus en O(1) par trade)
+        for columns in (self.bollinger_columns(df), self.keltner_columns(df),
+                        self.trend_columns(df), self.stop_loss_columns(df)):
+            for name, values in columns.items():
+                df[name] = values
+
+        self.add_signal_columns(df)
+        return df
+
+    def add_signal_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ajoute phase / raw_signal / in_killzone / signal à un DataFrame qui contient déjà
+        les colonnes d'indicateurs (modifié sur place et retourné)
+        """
+        # Masques booléens NumPy (une seule passe vectorisée, même logique que les boucles d'origine)
+        close = df["close"].to_numpy()
+        bb_upper = df["bb_upper"].to_numpy()
+        bb_lower = df["bb_lower"].to_numpy()
+        ema_20 = df["ema_20"].to_numpy()
+        ema_50 = df["ema_50"].to_numpy()
+
+        # Phase de volatilité : BB rentré dans le KC (tolérance 3%)
+        inside_kc = self.is_bb_inside_kc(bb_upper, bb_lower,
+                                         df["kc_upper"].to_numpy(), df["kc_lower"].to_numpy())
+        df["phase"] = np.where(inside_kc, "CONTRACTION", "EXPANSION")
+
+        # Signaux basés sur CASSURE + TENDANCE (besoin de EMA50 donc i >= 50)
+        warmup = np.arange(len(df)) >= 50
+        long_mask = warmup & (close > bb_upper) & (ema_20 > ema_50)
+        short_mask = warmup & ~long_mask & (close < bb_lower) & (ema_20 < ema_50)
+        raw_signal = np.zeros(len(df), dtype=np.int64)
+        raw_signal[long_mask] = 1
+        raw_signal[short_mask] = -1
+        df["raw_signal"] = raw_signal
 
         # Filtrage Killzone
-        df["in_killzone"] = df.index.map(self.in_killzone)
-        df["signal"] = 0
-        for i in range(len(df)):
-            if df["in_killzone"].iloc[i]:
-                df.iloc[i, df.columns.get_loc('signal')] = df["raw_signal"].iloc[i]
+        in_killzone = self.killzone_mask(df.index)
+        df["in_killzone"] = in_killzone
+        df["signal"] = np.where(in_killzone, raw_signal, 0)
 
         return df
 
-    def execute_trading_strategy(self, df: pd.DataFrame) -> List[Dict]:
-        """Exécution de la stratégie optimisée"""
+    @property
+    def warmup_bars(self) -> int:
+        """Bougies de tête sans entrée possible (EMA50 de check_trend_filter, momentum)"""
+        return max(self.ema_period, 10, 50)
+
+    def entry_candidates(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Indices des bougies qui passent tous les filtres "statiques" de should_enter_trade
+        (warm-up, killzone, tendance, cassure, EMA, momentum), calculés en masques NumPy.
+        Les filtres dépendant de l'état (délai entre trades, trade ouvert) restent
+        évalués séquentiellement dans execute_trading_strategy.
+        """
+        n = len(df)
+        if n == 0:
+            return np.empty(0, dtype=np.int64)
+
+        signal = df["signal"].to_numpy()
+        close = df["close"].to_numpy()
+        bb_upper = df["bb_upper"].to_numpy()
+        bb_lower = df["bb_lower"].to_numpy()
+        ema_20 = df["ema_20"].to_numpy()
+        ema_50 = df["ema_50"].to_numpy()
+
+        prev_close = np.empty(n)
+        prev_close[0] = np.nan
+        prev_close[1:] = close[:-1]
+
+        positions = np.arange(n)
+        is_long = signal == 1
+        is_short = signal == -1
+
+        # Tendance + cassure + momentum (check_trend_filter / check_breakout_conditions / check_momentum_simple)
+        long_ok = is_long & (ema_20 > ema_50) & (close > bb_upper) & (close >= prev_close * 0.998)
+        short_ok = is_short & (ema_20 < ema_50) & (close < bb_lower) & (close <= prev_close * 1.002)
+
+        mask = (
+            (positions >= self.warmup_bars)
+            & (long_ok | short_ok)
+            & (np.abs(close - ema_50) / ema_50 <= 0.03)   # check_ema_filter_optimized
+        )
+        if "htf_trend" in df.columns:
+            mask &= df["htf_trend"].to_numpy() == signal
+        candidates = np.flatnonzero(mask)
+
+        # Killzone (masque déjà calculé pour signal, servi depuis le cache)
+        return candidates[self.killzone_mask(df.index)[candidates]]
+
+    def execute_trading_strategy(self, df: pd.DataFrame, history: int = 0) -> TradeLedger:
+        """
+        Exécution de la stratégie optimisée sur tableaux NumPy.
+        Saute directement d'un signal candidat au suivant : le coût dépend du nombre
+        de signaux et non du nombre de bougies.
+        Les `history` premières bougies ne servent que d'historique (warm-up des filtres) :
+        aucune entrée n'y est prise et la courbe de capital commence après elles.
+        """
         self.current_capital = self.initial_capital
-        self.trades = []
-        self.closed_trades = []
-        self.portfolio_history = []
+        self.trades = TradeLedger()
+        self.closed_trades = TradeLedger()
+        self.portfolio_history = pd.Series(dtype=float, name="equity")
         self.last_trade_time = None
-        
+
+        self.event_log.info("execution_start", "🔍 Analyse de {bars} bougies pour signaux optimisés...", bars=len(df))
+
+        n = len(df)
+        if n == 0:
+            self.event_log.info("execution_end", "\n✅ STRATÉGIE OPTIMISÉE TERMINÉE: {trades} trades exécutés", trades=0)
+            return self.closed_trades
+
+        index = df.index
+        timestamps = index.values
+        high = df["high"].to_numpy()
+        low = df["low"].to_numpy()
+        close = df["close"].to_numpy()
+        signal = df["signal"].to_numpy()
+        phase = df["phase"].to_numpy()
+
+        symbol = "XAUUSD" if "XAU" in str(index.name) else "EURUSD"
+        min_gap = np.timedelta64(900, 's')  # 15 minutes entre deux trades
+        last_trade_at = None
+
+        # Trades ouverts : (bougie de sortie ou None, ordre d'ouverture, trade, raison)
         open_trades = []
-        
-        print(f"🔍 Analyse de {len(df)} bougies pour signaux optimisés...")
-        
-        for i, (index, row) in enumerate(df.iterrows()):
-            # Gestion des trades ouverts
-            for trade in open_trades[:]:
-                if trade["direction"] == "LONG":
-                    if row["low"] <= trade["stop_loss"]:
-                        pnl = (trade["stop_loss"] - trade["entry_price"]) * trade["units"]
-                        self.close_trade(trade, trade["stop_loss"], "STOP_LOSS", pnl, index)
-                        open_trades.remove(trade)
-                    elif row["high"] >= trade["take_profit"]:
-                        pnl = (trade["take_profit"] - trade["entry_price"]) * trade["units"]
-                        self.close_trade(trade, trade["take_profit"], "TAKE_PROFIT", pnl, index)
-                        open_trades.remove(trade)
-                else:  # SHORT
-                    if row["high"] >= trade["stop_loss"]:
-                        pnl = (trade["entry_price"] - trade["stop_loss"]) * trade["units"]
-                        self.close_trade(trade, trade["stop_loss"], "STOP_LOSS", pnl, index)
-                        open_trades.remove(trade)
-                    elif row["low"] <= trade["take_profit"]:
-                        pnl = (trade["entry_price"] - trade["take_profit"]) * trade["units"]
-                        self.close_trade(trade, trade["take_profit"], "TAKE_PROFIT", pnl, index)
-                        open_trades.remove(trade)
-            
-            symbol = "XAUUSD" if "XAU" in str(df.index.name) else "EURUSD"
-            current_signal = row["signal"]
-            
+
+        def close_until(bar: int):
+            """Ferme, dans l'ordre chronologique, les trades dont la sortie a lieu à bar ou avant"""
+            due = sorted((t for t in open_trades if t[0] is not None and t[0] <= bar), key=lambda t: (t[0], t[1]))
+            for pending in due:
+                exit_i, _, trade, reason = pending
+                exit_price = trade["stop_loss"] if reason == "STOP_LOSS" else trade["take_profit"]
+                self.close_trade(trade, exit_price, reason, self.trade_pnl(trade, exit_price), index[exit_i])
+                open_trades.remove(pending)
+
+        candidates = self.entry_candidates(df)
+        for i in candidates[candidates >= history]:
+            # Gestion des trades ouverts jusqu'à cette bougie incluse
+            close_until(i)
+
+            # Filtres dépendant de l'état (should_enter_trade)
+            if last_trade_at is not None and timestamps[i] - last_trade_at < min_gap:
+                continue
+            if self.trades.any_equal('status', 'OPEN'):
+                continue
+
             # OUVERTURE DE TRADE
-            if current_signal != 0 and self.should_enter_trade(df, i, symbol):
-                entry_price = row["close"]
-                direction = "LONG" if current_signal == 1 else "SHORT"
-                
-                stop_loss = self.calculate_stop_loss_optimized(df, i, direction)
-                
-                if direction == "LONG":
-                    take_profit = entry_price + ((entry_price - stop_loss) * self.risk_reward_ratio)
-                else:
-                    take_profit = entry_price - ((stop_loss - entry_price) * self.risk_reward_ratio)
-                
-                position_info = self.calculate_position_size(entry_price, stop_loss, symbol)
-                
-                if (position_info["lots"] > 0 and 
-                    position_info["risk_percent"] <= 1.5 and
-                    position_info["risk_percent"] >= 0.3):
-                    
-                    trade = {
-                        "entry_time": index,
-                        "entry_price": round(entry_price, 5),
-                        "direction": direction,
-                        "stop_loss": round(stop_loss, 5),
-                        "take_profit": round(take_profit, 5),
-                        "risk_amount": position_info["risk_amount"],
-                        "units": position_info["units"],
-                        "lots": position_info["lots"],
-                        "risk_percent": position_info["risk_percent"],
-                        "phase": row["phase"],
-                        "status": "OPEN"
-                    }
-                    
-                    self.trades.append(trade)
-                    open_trades.append(trade)
-                    self.last_trade_time = index
-                    
-                    print(f"🎯 {'📈' if direction == 'LONG' else '📉'} OPEN {direction} | {index} | Prix: {entry_price:.2f} | Lots: {position_info['lots']} | Risk: {position_info['risk_percent']}%")
-                    print(f"   🛑 SL: {stop_loss:.2f} | 🎯 TP: {take_profit:.2f} | 📊 R/R: {self.risk_reward_ratio}")
-        
-        # Fermeture des trades restants
+            direction = "LONG" if signal[i] == 1 else "SHORT"
+            stop_loss = self.calculate_stop_loss_optimized(df, i, direction)
+            trade = self.build_trade(index[i], float(close[i]), direction, stop_loss, phase[i], symbol)
+
+            if trade is not None:
+                self.trades.append(trade)
+                exit_i, reason = self._resolve_exit(high, low, close, i, trade)
+                open_trades.append((exit_i, len(self.trades), trade, reason))
+                self.last_trade_time = index[i]
+                last_trade_at = timestamps[i]
+
+                if self.event_log.enabled_for(INFO):
+                    self.event_log.info(
+                        "trade_open",
+                        "🎯 {icon} OPEN {direction} | {time} | Prix: {price:.2f} | Lots: {lots} | Risk: {risk_percent}%\n"
+                        "   🛑 SL: {stop_loss:.2f} | 🎯 TP: {take_profit:.2f} | 📊 R/R: {risk_reward}",
+                        icon='📈' if direction == 'LONG' else '📉', direction=direction, time=index[i],
+                        price=close[i], lots=trade['lots'], risk_percent=trade['risk_percent'],
+                        stop_loss=stop_loss, take_profit=trade['take_profit'], risk_reward=self.risk_reward_ratio,
+                    )
+
+        # Sorties restantes sur SL/TP, puis fermeture des trades encore ouverts
+        close_until(n - 1)
         if open_trades:
-            last_price = df.iloc[-1]["close"]
-            for trade in open_trades:
-                if trade["direction"] == "LONG":
-                    pnl = (last_price - trade["entry_price"]) * trade["units"]
-                else:
-                    pnl = (trade["entry_price"] - last_price) * trade["units"]
-                self.close_trade(trade, last_price, "END_OF_DATA", pnl, df.index[-1])
-        
-        print(f"\n✅ STRATÉGIE OPTIMISÉE TERMINÉE: {len(self.closed_trades)} trades exécutés")
+            last_price = close[-1]
+            for _, _, trade, _ in open_trades:
+                self.close_trade(trade, last_price, "END_OF_DATA", self.trade_pnl(trade, last_price), index[-1])
+
+        # Courbe de capital bougie par bougie (vectorisée depuis le ledger et les prix)
+        self.portfolio_history = equity_curve(self.closed_trades, df.iloc[history:], self.initial_capital)
+
+        self.event_log.info("execution_end", "\n✅ STRATÉGIE OPTIMISÉE TERMINÉE: {trades} trades exécutés",
+                            trades=len(self.closed_trades))
         return self.closed_trades
 
-    def close_trade(self, trade: Dict, exit_price: float, reason: str, pnl: float, exit_time: pd.Timestamp):
-        """Fermeture de trade"""
-        closed_trade = {
-            **trade,
-            "exit_time": exit_time,
-            "exit_price": round(exit_price, 5),
-            "exit_reason": reason,
-            "pnl": round(pnl, 2),
-            "pnl_percent": round((pnl / self.initial_capital) * 100, 4),
-            "status": "CLOSED"
+    def build_trade(self, entry_time: pd.Timestamp, entry_price: float, direction: str,
+                    stop_loss: float, phase: str, symbol: str) -> Optional[Dict]:
+        """
+        Construit un trade OPEN (take profit, taille de position) ou None si le risque
+        sort des limites (0.3% - 1.5% du capital)
+        """
+        take_profit = self.take_profit_price(entry_price, stop_loss, direction)
+        position_info = self.calculate_position_size(entry_price, stop_loss, symbol)
+
+        if not (position_info["lots"] > 0 and
+                position_info["risk_percent"] <= 1.5 and
+                position_info["risk_percent"] >= 0.3):
+            return None
+
+        return {
+            "entry_time": entry_time,
+            "entry_price": round(entry_price, 5),
+            "direction": direction,
+            "stop_loss": round(stop_loss, 5),
+            "take_profit": round(take_profit, 5),
+            "risk_amount": position_info["risk_amount"],
+            "units": position_info["units"],
+            "lots": position_info["lots"],
+            "risk_percent": position_info["risk_percent"],
+            "phase": phase,
+            "status": "OPEN"
         }
-        
-        self.closed_trades.append(closed_trade)
+
+    def take_profit_price(self, entry_price: float, stop_loss: float, direction: str) -> float:
+        """Take profit à risk_reward_ratio fois la distance du stop loss (non arrondi)"""
+        if direction == "LONG":
+            return entry_price + ((entry_price - stop_loss) * self.risk_reward_ratio)
+        return entry_price - ((stop_loss - entry_price) * self.risk_reward_ratio)
+
+    def trade_pnl(self, trade: Dict, exit_price: float) -> float:
+        """P&L d'un trade fermé au prix exit_price"""
+        if trade["direction"] == "LONG":
+            return (exit_price - trade["entry_price"]) * trade["units"]
+        return (trade["entry_price"] - exit_price) * trade["units"]
+
+    def _resolve_exit(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, i: int, trade: Dict):
+        """Bougie et raison de sortie SL/TP d'un trade ouvert en i, (None, None) si jamais touchés"""
+        exit_info = resolve_exits(
+            high, low, close,
+            entry_idx=[i],
+            direction=[1 if trade["direction"] == "LONG" else -1],
+            stop_loss=[trade["stop_loss"]],
+            take_profit=[trade["take_profit"]],
+        )
+        if exit_info["exit_reason"][0] == END_OF_DATA:
+            return None, None
+        return int(exit_info["exit_index"][0]), str(EXIT_REASONS[exit_info["exit_reason"][0]])
+
+    def close_trade(self, trade: Dict, exit_price: float, reason: str, pnl: float, exit_time: pd.Timestamp):
+        """Fermeture de trade (ajoutée au ledger sans copie du dict)"""
+        self.closed_trades.append(
+            trade,
+            exit_time=exit_time,
+            exit_price=round(exit_price, 5),
+            exit_reason=reason,
+            pnl=round(pnl, 2),
+            pnl_percent=round((pnl / self.initial_capital) * 100, 4),
+            status="CLOSED",
+        )
         self.current_capital += pnl
         
-        result = "🟢 PROFIT" if pnl > 0 else "🔴 PERTE"
-        print(f"{result} | CLOSE {trade['direction']} | P&L: {pnl:+.2f}€ | Capital: {self.current_capital:.2f}€")
+        if self.event_log.enabled_for(INFO):
+            self.event_log.info(
+                "trade_close",
+                "{result} | CLOSE {direction} | P&L: {pnl:+.2f}€ | Capital: {capital:.2f}€",
+                result="🟢 PROFIT" if pnl > 0 else "🔴 PERTE", direction=trade['direction'],
+                time=exit_time, reason=reason, pnl=pnl, capital=self.current_capital,
+            )
 
     def generate_money_management_report(self, symbol: str) -> Dict[str, Any]:
         """Génération du rapport"""
         if not self.closed_trades:
             return {"error": "Aucun trade exécuté", "symbol": symbol}
         
-        total_trades = len(self.closed_trades)
-        winning_trades = len([t for t in self.closed_trades if t["pnl"] > 0])
-        losing_trades = len([t for t in self.closed_trades if t["pnl"] < 0])
+        # Agrégats calculés sur les colonnes du ledger (win / loss / PnL / drawdown)
+        stats = self.closed_trades.stats(self.initial_capital)
+        total_trades = stats["total_trades"]
+        winning_trades = stats["winning_trades"]
+        losing_trades = stats["losing_trades"]
         win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
         
-        total_pnl = sum(t["pnl"] for t in self.closed_trades)
-        avg_win = np.mean([t["pnl"] for t in self.closed_trades if t["pnl"] > 0]) if winning_trades > 0 else 0
-        avg_loss = np.mean([t["pnl"] for t in self.closed_trades if t["pnl"] < 0]) if losing_trades > 0 else 0
-        
-        # Drawdown
-        capital_history = [self.initial_capital]
-        for trade in self.closed_trades:
-            capital_history.append(capital_history[-1] + trade["pnl"])
-        
-        peak = capital_history[0]
-        max_drawdown = 0
-        for capital in capital_history:
-            if capital > peak:
-                peak = capital
-            drawdown = (peak - capital) / peak * 100
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
+        total_pnl = stats["total_pnl"]
+        avg_win = stats["avg_win"]
+        avg_loss = stats["avg_loss"]
+        max_drawdown = stats["max_drawdown"]
         
-        total_risk = sum(t["risk_amount"] for t in self.closed_trades)
+        total_risk = stats["total_risk"]
         avg_risk = total_risk / total_trades if total_trades > 0 else 0
         
         report = {
@@ -443,7 +659,7 @@ class BBKeltnerStrategy:
                 "net_profit": round(total_pnl, 2),
                 "return_percent": round((total_pnl / self.initial_capital) * 100, 2),
                 "max_drawdown": round(max_drawdown, 2),
-                "sharpe_ratio": round((total_pnl / total_trades) / (np.std([t["pnl"] for t in self.closed_trades]) or 1), 2) if total_trades > 1 else 0
+                "sharpe_ratio": round((total_pnl / total_trades) / (stats["pnl_std"] or 1), 2) if total_trades > 1 else 0
             },
             "performance": {
                 "total_trades": total_trades,
@@ -464,7 +680,18 @@ class BBKeltnerStrategy:
             "trades_detailed": self.closed_trades,
             "symbol": symbol
         }
-        
+
+        # Drawdown mark-to-market (intra-trade) si la courbe par bougie est disponible
+        if len(self.portfolio_history):
+            report["drawdown_analysis"] = drawdown_stats(self.portfolio_history)
+
+        # Statistiques par session d'entrée (Asia / London / NY)
+        report["session_analysis"] = self.session_calendar.trade_stats(self.closed_trades)
+        # Fuseau supposé des horodatages (UTC si broker_tz n'est pas renseigné) et killzone effective
+        report["session_settings"] = {**self.session_calendar.settings(),
+                                      "killzone": self.killzone.settings()["sessions"]["killzone"],
+                                      "killzone_wraps_midnight": self.killzone.wrap_midnight}
+
         return report
 
     def summary(self, df: pd.DataFrame) -> dict:
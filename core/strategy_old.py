@@ -7,6 +7,7 @@ from enum import Enum
 # IMPORT CORRIGÉ - Ajouter ces lignes
 from indicators.bollinger_bands import BollingerBands
 from indicators.keltner_channel import KeltnerChannel
+from core.exit_resolver import resolve_exits, EXIT_REASONS, STOP_LOSS, TAKE_PROFIT, TIME_EXIT
 
 class TradeStatus(Enum):
     OPEN = "OPEN"
@@ -93,85 +94,55 @@ class BBKeltnerStrategy:
         """
         Simule l'exécution réelle du trade avec gestion de la position
         """
-        entry_idx = df.index.get_loc(trade["entry_time"])
-        entry_price = trade["entry_price"]
-        stop_loss = trade["stop_loss"]
-        take_profit = trade["take_profit"]
-        direction = trade["direction"]
-        units = trade["units"]
-        
-        # Analyser les bougies suivantes pour voir si SL ou TP est touché
-        for i in range(entry_idx + 1, min(entry_idx + 100, len(df))):  # Max 100 bougies
-            current_candle = df.iloc[i]
-            high, low, close = current_candle["high"], current_candle["low"], current_candle["close"]
-            
-            # CHECK STOP LOSS
-            if direction == "LONG" and low <= stop_loss:
-                pnl = (stop_loss - entry_price) * units
-                return {
-                    **trade,
-                    "exit_time": df.index[i],
-                    "exit_price": stop_loss,
-                    "exit_reason": "STOP_LOSS",
-                    "pnl": round(pnl, 2),
-                    "pnl_percent": round((pnl / self.current_capital) * 100, 2),
-                    "status": TradeStatus.STOP_LOSS.value
-                }
-            elif direction == "SHORT" and high >= stop_loss:
-                pnl = (entry_price - stop_loss) * units
-                return {
-                    **trade,
-                    "exit_time": df.index[i],
-                    "exit_price": stop_loss,
-                    "exit_reason": "STOP_LOSS",
-                    "pnl": round(pnl, 2),
-                    "pnl_percent": round((pnl / self.current_capital) * 100, 2),
-                    "status": TradeStatus.STOP_LOSS.value
-                }
-            
-            # CHECK TAKE PROFIT
-            if direction == "LONG" and high >= take_profit:
-                pnl = (take_profit - entry_price) * units
-                return {
-                    **trade,
-                    "exit_time": df.index[i],
-                    "exit_price": take_profit,
-                    "exit_reason": "TAKE_PROFIT",
-                    "pnl": round(pnl, 2),
-                    "pnl_percent": round((pnl / self.current_capital) * 100, 2),
-                    "status": TradeStatus.TAKE_PROFIT.value
-                }
-            elif direction == "SHORT" and low <= take_profit:
-                pnl = (entry_price - take_profit) * units
-                return {
-                    **trade,
-                    "exit_time": df.index[i],
-                    "exit_price": take_profit,
-                    "exit_reason": "TAKE_PROFIT",
-                    "pnl": round(pnl, 2),
-                    "pnl_percent": round((pnl / self.current_capital) * 100, 2),
-                    "status": TradeStatus.TAKE_PROFIT.value
-                }
-        
-        # Si ni SL ni TP touché, fermer à la dernière bougie analysée
-        last_candle = df.iloc[min(entry_idx + 100, len(df) - 1)]
-        exit_price = last_candle["close"]
-        
-        if direction == "LONG":
-            pnl = (exit_price - entry_price) * units
-        else:
-            pnl = (entry_price - exit_price) * units
-            
-        return {
-            **trade,
-            "exit_time": last_candle.name,
-            "exit_price": exit_price,
-            "exit_reason": "TIME_EXIT",
-            "pnl": round(pnl, 2),
-            "pnl_percent": round((pnl / self.current_capital) * 100, 2),
-            "status": TradeStatus.CLOSED.value
+        return self.simulate_trades_batch([trade], df)[0]
+
+    def simulate_trades_batch(self, trades: List[Dict], df: pd.DataFrame) -> List[Dict]:
+        """
+        Simule l'exécution de plusieurs trades en un seul appel vectorisé :
+        SL / TP sur les 99 bougies suivantes, sinon sortie TIME_EXIT à entrée + 100 bougies
+        """
+        if not trades:
+            return []
+
+        entry_idx = df.index.get_indexer([t["entry_time"] for t in trades])
+        if (entry_idx < 0).any():
+            missing = trades[int(np.argmin(entry_idx))]["entry_time"]
+            raise KeyError(missing)
+
+        entry_price = np.array([t["entry_price"] for t in trades], dtype=float)
+        units = np.array([t["units"] for t in trades], dtype=float)
+        direction = np.array([1 if t["direction"] == "LONG" else -1 for t in trades])
+
+        exits = resolve_exits(
+            df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy(),
+            entry_idx=entry_idx,
+            direction=direction,
+            stop_loss=[t["stop_loss"] for t in trades],
+            take_profit=[t["take_profit"] for t in trades],
+            max_bars=100,
+        )
+        pnl = direction * (exits["exit_price"] - entry_price) * units
+
+        status_by_reason = {
+            STOP_LOSS: TradeStatus.STOP_LOSS.value,
+            TAKE_PROFIT: TradeStatus.TAKE_PROFIT.value,
+            TIME_EXIT: TradeStatus.CLOSED.value,
         }
 
+        results = []
+        for k, trade in enumerate(trades):
+            reason = exits["exit_reason"][k]
+            results.append({
+                **trade,
+                "exit_time": df.index[exits["exit_index"][k]],
+                "exit_price": exits["exit_price"][k],
+                "exit_reason": str(EXIT_REASONS[reason]),
+                "pnl": round(pnl[k], 2),
+                "pnl_percent": round((pnl[k] / self.current_capital) * 100, 2),
+                "status": status_by_reason[reason]
+            })
+        return results
+
     def generate_trading_signals(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Génère les signaux de trading avec money management
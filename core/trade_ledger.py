@@ -0,0 +1,484 @@
+"""
+Trade Ledger
+------------
+Journal de trades en colonnes typées (NumPy) à croissance amortie.
+
+Remplace les listes de dicts : chaque champ d'un trade est stocké dans un tableau
+(float64, int64, bool, datetime64[ns] UTC + fuseau de la colonne, ou code entier pour les chaînes), la capacité double
+quand elle est atteinte. Les ajouts sont mis en tampon puis convertis par lots, colonne
+par colonne. Les statistiques du rapport sont calculées sur les colonnes ; les dicts /
+DataFrame / JSON ne sont produits qu'en sortie.
+
+Le ledger se comporte comme une séquence de dicts (len, indexation, itération, comparaison
+avec une liste) : le code qui lit `closed_trades[-1]` ou itère les trades reste valable.
+"""
+
+import json
+import numbers
+from operator import attrgetter, itemgetter
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Types de colonnes
+FLOAT, INT, BOOL, TIME, TEXT, OBJECT = "float", "int", "bool", "time", "text", "object"
+
+_DTYPES = {FLOAT: np.float64, INT: np.int64, BOOL: np.bool_, TIME: np.int64, TEXT: np.int32, OBJECT: object}
+_MISSING = {FLOAT: np.nan, INT: 0, BOOL: False, TIME: np.iinfo(np.int64).min, TEXT: -1, OBJECT: None}
+_NAT = _MISSING[TIME]
+_ABSENT = object()
+_TZINFO = attrgetter("tzinfo")
+
+
+def _kind_of(value: Any) -> str:
+    if isinstance(value, (bool, np.bool_)):
+        return BOOL
+    if isinstance(value, (pd.Timestamp, datetime, np.datetime64)):
+        return TIME
+    if isinstance(value, numbers.Integral):
+        return INT
+    if isinstance(value, numbers.Real):
+        return FLOAT
+    if isinstance(value, str):
+        return TEXT
+    return OBJECT
+
+
+def _to_ns(value: Any) -> int:
+    if value is None:
+        return _NAT
+    if type(value) is pd.Timestamp:
+        return value.value
+    return pd.Timestamp(value).value
+
+
+class TradeLedger:
+    """Séquence de trades stockée en colonnes typées"""
+
+    def __init__(self, capacity: int = 64, batch_size: int = 256):
+        self._capacity = max(1, capacity)
+        self._size = 0
+        self._columns: Dict[str, np.ndarray] = {}
+        self._kinds: Dict[str, str] = {}
+        # Dictionnaires des colonnes texte : valeurs et code par valeur
+        self._pools: Dict[str, List[str]] = {}
+        self._codes: Dict[str, Dict[str, int]] = {}
+        # Fuseau des colonnes de dates (None : dates naïves), nanosecondes UTC stockées
+        self._tz: Dict[str, Any] = {}
+        # Ajouts en attente de conversion : (record, champs complémentaires)
+        self._pending: List[tuple] = []
+        self._batch_size = batch_size
+
+    # --- Construction -------------------------------------------------------------
+
+    @classmethod
+    def from_records(cls, records: Sequence[Mapping[str, Any]]) -> "TradeLedger":
+        ledger = cls(capacity=len(records) or 1)
+        ledger.extend(records)
+        return ledger
+
+    @classmethod
+    def concat(cls, ledgers: Sequence["TradeLedger"]) -> "TradeLedger":
+        """Concaténation colonne par colonne (les dictionnaires de texte sont fusionnés)"""
+        result = cls(capacity=sum(len(l) for l in ledgers) or 1)
+        for ledger in ledgers:
+            ledger._flush()
+            if len(ledger) == 0:
+                continue
+            for name in ledger._columns:
+                if name not in result._columns:
+                    result._add_column(name, ledger._kinds[name])
+            for name, kind in ledger._kinds.items():
+                if kind == TIME and result._kinds[name] == TIME and not result._accept_tz(name, {ledger._tz.get(name)}):
+                    result._promote(name, OBJECT)
+                if result._kinds[name] != kind:
+                    result._promote(name, FLOAT if {kind, result._kinds[name]} == {INT, FLOAT} else OBJECT)
+            result._reserve(result._size + len(ledger))
+            start, stop = result._size, result._size + len(ledger)
+            for name in [n for n in result._columns if n not in ledger._columns]:
+                if result._kinds[name] in (INT, BOOL):
+                    result._promote(name, OBJECT)
+            for name, column in result._columns.items():
+                if name not in ledger._columns:
+                    column[start:stop] = _MISSING[result._kinds[name]]
+                elif result._kinds[name] == TEXT:
+                    remap = np.array([result._encode(name, v) for v in ledger._pools[name]] + [-1], dtype=np.int32)
+                    column[start:stop] = remap[ledger._columns[name][:len(ledger)]]
+                elif result._kinds[name] == OBJECT and ledger._kinds[name] != OBJECT:
+                    column[start:stop] = ledger.column(name).astype(object)
+                else:
+                    column[start:stop] = ledger._columns[name][:len(ledger)]
+            result._size = stop
+        return result
+
+    def _add_column(self, name: str, kind: str):
+        if self._size and kind in (INT, BOOL):
+            kind = OBJECT  # lignes précédentes sans valeur : None conservé
+        column = np.empty(self._capacity, dtype=_DTYPES[kind])
+        column[:self._size] = _MISSING[kind]
+        self._columns[name] = column
+        self._kinds[name] = kind
+        if kind == TEXT:
+            self._pools[name] = []
+            self._codes[name] = {}
+
+    def _reserve(self, size: int):
+        """Croissance amortie : capacité doublée jusqu'à contenir `size` lignes"""
+        if size <= self._capacity:
+            return
+        capacity = self._capacity
+        while capacity < size:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+        self._capacity = capacity
+
+    def _encode(self, name: str, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._pools[name])
+            self._pools[name].append(value)
+        return code
+
+    def _promote(self, name: str, kind: str):
+        """Élargit une colonne (int -> float, sinon objet)"""
+        column = np.empty(self._capacity, dtype=_DTYPES[kind])
+        if kind == OBJECT:
+            column[:self._size] = [self._value(name, row) for row in range(self._size)]  # rare
+        else:
+            column[:self._size] = self._columns[name][:self._size]
+        self._columns[name] = column
+        self._kinds[name] = kind
+        self._pools.pop(name, None)
+        self._codes.pop(name, None)
+        self._tz.pop(name, None)
+
+    def _accept_tz(self, name: str, tzs: set) -> bool:
+        """
+        Fixe le fuseau d'une colonne de dates au premier lot ; False si le lot mélange
+        les fuseaux ou diffère des lignes existantes (la colonne passe alors en objets)
+        """
+        if not tzs:
+            return True  # lot sans date
+        keys = {None if tz is None else str(tz) for tz in tzs}
+        if len(keys) > 1:
+            return False
+        if name not in self._tz:
+            self._tz[name] = next(iter(tzs))
+            return True
+        current = self._tz[name]
+        return keys == {None if current is None else str(current)}
+
+    def _convert(self, name: str, values: List[Any]) -> np.ndarray:
+        """Conversion d'un lot de valeurs vers le type de la colonne (promotion si besoin)"""
+        kind = self._kinds[name]
+        if kind == TIME:
+            try:
+                try:
+                    tzs = set(map(_TZINFO, values))
+                    array = np.array([v.value for v in values], dtype=np.int64)
+                except AttributeError:
+                    tzs = {getattr(v, "tzinfo", None) for v in values if v is not None}
+                    array = np.fromiter((_to_ns(v) for v in values), dtype=np.int64, count=len(values))
+            except (TypeError, ValueError):
+                array = None
+            if array is not None and self._accept_tz(name, tzs):
+                return array
+            self._promote(name, OBJECT)
+            kind = OBJECT
+        if kind == TEXT:
+            unique = set(values)
+            if all(v is None or isinstance(v, str) for v in unique):
+                for v in unique:
+                    self._encode(name, v)
+                lookup = self._codes[name]
+                if None in unique:
+                    lookup = {**lookup, None: -1}
+                return np.fromiter(map(lookup.__getitem__, values), dtype=np.int32, count=len(values))
+            self._promote(name, OBJECT)
+            kind = OBJECT
+        if kind == OBJECT:
+            array = np.empty(len(values), dtype=object)
+            array[:] = values
+            return array
+
+        if None in values:
+            if kind != FLOAT:
+                self._promote(name, OBJECT)
+                return self._convert(name, values)
+            values = [np.nan if v is None else v for v in values]
+        try:
+            array = np.array(values)
+        except (TypeError, ValueError):
+            array = np.array([], dtype=float)
+        expected = {FLOAT: "fiu", INT: "iu", BOOL: "b"}[kind]
+        if array.ndim == 1 and array.dtype.kind in expected:
+            return array.astype(_DTYPES[kind], copy=False)
+        if kind == INT and array.ndim == 1 and array.dtype.kind == "f":
+            self._promote(name, FLOAT)
+            return array
+        self._promote(name, OBJECT)
+        return self._convert(name, values)
+
+    def _flush(self):
+        """Convertit les ajouts en attente en colonnes typées"""
+        pending = self._pending
+        if not pending:
+            return
+        self._pending = []
+
+        record_keys, field_keys = pending[0][0].keys(), pending[0][1].keys()
+        uniform = all(r.keys() == record_keys and f.keys() == field_keys for r, f in pending)
+
+        # Nouvelles colonnes dans l'ordre d'apparition des clés ({**record, **fields})
+        for record, fields in (pending[:1] if uniform else pending):
+            for source in (record, fields):
+                for name in source:
+                    if name not in self._columns:
+                        value = next((s[name] for r, f in pending for s in (f, r)
+                                      if s.get(name, _ABSENT) is not _ABSENT and s[name] is not None), None)
+                        self._add_column(name, _kind_of(value) if value is not None else OBJECT)
+
+        self._reserve(self._size + len(pending))
+        start, stop = self._size, self._size + len(pending)
+        columns = self._transpose_uniform(pending) if uniform else self._transpose(pending)
+        for name, values in columns.items():
+            self._columns[name][start:stop] = self._convert(name, values)
+        self._size = stop
+
+    def _transpose_uniform(self, pending: List[tuple]) -> Dict[str, Sequence[Any]]:
+        """Valeurs du lot par colonne, transposées en C (tous les trades ont les mêmes clés)"""
+        record_keys, field_keys = pending[0][0].keys(), pending[0][1].keys()
+        by_column = {}
+        for source, keys in ((0, [k for k in record_keys if k not in field_keys]), (1, list(field_keys))):
+            if not keys:
+                continue
+            rows = map(itemgetter(*keys), (entry[source] for entry in pending))
+            by_column.update(zip(keys, zip(*rows)) if len(keys) > 1 else [(keys[0], list(rows))])
+        empty = [None] * len(pending)
+        return {name: by_column.get(name, empty) for name in self._columns}
+
+    def _transpose(self, pending: List[tuple]) -> Dict[str, Sequence[Any]]:
+        """Valeurs du lot par colonne (clés hétérogènes)"""
+        by_column = {}
+        for name in self._columns:
+            values = []
+            append = values.append
+            for record, fields in pending:
+                value = fields.get(name, _ABSENT)
+                if value is _ABSENT:
+                    value = record.get(name)
+                append(value)
+            by_column[name] = values
+        return by_column
+
+    def append(self, record: Mapping[str, Any], **fields: Any):
+        """
+        Ajoute un trade. `fields` complète ou remplace les champs de `record`
+        (équivalent de {**record, **fields} sans créer de dict fusionné).
+        `record` est lu lors de la conversion du lot : ne pas le modifier avant.
+        """
+        self._pending.append((record, fields))
+        if len(self._pending) >= self._batch_size:
+            self._flush()
+
+    def extend(self, records: Sequence[Mapping[str, Any]]):
+        for record in records:
+            self.append(record)
+
+    def add_column(self, name: str, value: Any):
+        """Ajoute (ou remplace) une colonne constante, ex: numéro de fenêtre walk-forward"""
+        self._flush()
+        self._columns.pop(name, None)
+        self._add_column(name, _kind_of(value) if value is not None else OBJECT)
+        self._columns[name][:self._size] = self._convert(name, [value] * self._size) if self._size else []
+
+    def set_value(self, row: int, name: str, value: Any):
+        self._flush()
+        self._columns[name][self._row(row)] = self._convert(name, [value])[0]
+
+    def clear(self):
+        self._pending = []
+        self._size = 0
+
+    # --- Accès --------------------------------------------------------------------
+
+    @property
+    def columns(self) -> List[str]:
+        self._flush()
+        return list(self._columns)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Colonne décodée : float64 / int64 / bool en vue sans copie, datetime64[ns] pour les dates
+        (DatetimeArray dans leur fuseau pour les dates avec fuseau), tableau d'objets pour le texte
+        """
+        self._flush()
+        values = self._columns[name][:self._size]
+        kind = self._kinds[name]
+        if kind == TIME:
+            tz = self._tz.get(name)
+            if tz is not None:
+                return pd.DatetimeIndex(values.view("datetime64[ns]")).tz_localize("UTC").tz_convert(tz).array
+            return values.view("datetime64[ns]")
+        if kind == TEXT:
+            pool = np.array(self._pools[name] + [None], dtype=object)
+            return pool[values]  # code -1 -> None (dernier élément)
+        return values
+
+    def take(self, rows) -> "TradeLedger":
+        """Nouveau ledger restreint à un masque booléen ou à des indices de lignes"""
+        self._flush()
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        result = TradeLedger(capacity=len(rows) or 1)
+        for name, column in self._columns.items():
+            result._columns[name] = np.concatenate(
+                [column[:self._size][rows], np.empty(result._capacity - len(rows), dtype=column.dtype)])
+            result._kinds[name] = self._kinds[name]
+            if name in self._tz:
+                result._tz[name] = self._tz[name]
+            if name in self._pools:
+                result._pools[name] = list(self._pools[name])
+                result._codes[name] = dict(self._codes[name])
+        result._size = len(rows)
+        return result
+
+    def mask_equal(self, name: str, value: Any) -> np.ndarray:
+        """Masque booléen des trades dont `name` vaut `value` (comparaison sur les codes)"""
+        self._flush()
+        if self._kinds.get(name) == TEXT:
+            code = self._codes[name].get(value)
+            if code is None:
+                return np.zeros(self._size, dtype=bool)
+            return self._columns[name][:self._size] == code
+        return self.column(name) == value
+
+    def any_equal(self, name: str, value: Any) -> bool:
+        """Au moins un trade avec `name` == `value` (les ajouts en attente sont lus sans conversion)"""
+        for record, fields in self._pending:
+            if fields.get(name, record.get(name)) == value:
+                return True
+        return name in self._columns and bool(self.mask_equal(name, value).any())
+
+    def _row(self, i: int) -> int:
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("index de trade hors limites")
+        return i
+
+    def _value(self, name: str, row: int) -> Any:
+        value = self._columns[name][row]
+        kind = self._kinds[name]
+        if kind == TIME:
+            if value == _NAT:
+                return None
+            tz = self._tz.get(name)
+            return pd.Timestamp(int(value)) if tz is None else pd.Timestamp(int(value), tz="UTC").tz_convert(tz)
+        if kind == TEXT:
+            return None if value < 0 else self._pools[name][value]
+        if kind == OBJECT:
+            return value
+        return value.item()
+
+    def __len__(self) -> int:
+        return self._size + len(self._pending)
+
+    def __getitem__(self, i):
+        self._flush()
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._size))]
+        row = self._row(i)
+        return {name: self._value(name, row) for name in self._columns}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self._flush()
+        for row in range(self._size):
+            yield {name: self._value(name, row) for name in self._columns}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (TradeLedger, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"TradeLedger({len(self)} trades, colonnes={self.columns})"
+
+    # --- Statistiques vectorisées -------------------------------------------------
+
+    def capital_curve(self, initial_capital: float) -> np.ndarray:
+        """Capital après chaque fermeture (capital initial en tête), cumul séquentiel"""
+        pnl = self.column("pnl") if len(self) else np.empty(0)
+        curve = np.empty(len(pnl) + 1)
+        curve[0] = initial_capital
+        curve[1:] = pnl
+        return np.cumsum(curve)
+
+    def max_drawdown(self, initial_capital: float) -> float:
+        """Drawdown maximal (%) de la courbe de capital aux fermetures"""
+        curve = self.capital_curve(initial_capital)
+        peak = np.maximum.accumulate(curve)
+        return float(max(((peak - curve) / peak * 100).max(), 0))
+
+    def stats(self, initial_capital: float) -> Dict[str, Any]:
+        """Agrégats utilisés par generate_money_management_report"""
+        pnl = self.column("pnl") if len(self) else np.empty(0)
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl < 0]
+        # Sommes cumulées (ordre séquentiel, mêmes arrondis que sum())
+        total_pnl = float(np.cumsum(pnl)[-1]) if len(pnl) else 0.0
+        total_risk = float(np.cumsum(self.column("risk_amount"))[-1]) if len(pnl) else 0.0
+        return {
+            "total_trades": len(pnl),
+            "winning_trades": int(len(wins)),
+            "losing_trades": int(len(losses)),
+            "total_pnl": total_pnl,
+            "avg_win": float(np.mean(wins)) if len(wins) else 0,
+            "avg_loss": float(np.mean(losses)) if len(losses) else 0,
+            "pnl_std": float(np.std(pnl)) if len(pnl) else 0.0,
+            "max_drawdown": self.max_drawdown(initial_capital),
+            "total_risk": total_risk,
+        }
+
+    # --- Sorties ------------------------------------------------------------------
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+    def to_frame(self) -> pd.DataFrame:
+        self._flush()
+        return pd.DataFrame({name: self.column(name) for name in self._columns})
+
+    def to_json(self, path: Optional[str] = None, indent: Optional[int] = None) -> str:
+        text = json.dumps(self.to_records(), indent=indent, default=str)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
+
+    @staticmethod
+    def json_default(obj: Any) -> Any:
+        """À passer en `default=` de json.dump pour sérialiser un rapport contenant un ledger"""
+        if isinstance(obj, TradeLedger):
+            return obj.to_records()
+        return str(obj)
+
+    # --- Sérialisation (pickle) : seules les lignes utilisées sont copiées ----------
+
+    def __getstate__(self):
+        self._flush()
+        state = self.__dict__.copy()
+        state["_columns"] = {name: column[:self._size].copy() for name, column in self._columns.items()}
+        state["_capacity"] = max(1, self._size)
+        return state
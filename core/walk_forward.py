@@ -0,0 +1,296 @@
+"""
+Walk-Forward Optimization
+-------------------------
+Validation glissante in-sample / out-of-sample des paramètres de BBKeltnerStrategy.
+
+L'historique est découpé en fenêtres train / test successives. Pour chaque fenêtre,
+la meilleure combinaison sur la période train est rejouée sur la période test suivante,
+puis les ledgers out-of-sample sont recollés dans un rapport unique par symbole.
+
+Les indicateurs sont causaux : chaque worker calcule les colonnes BB / KC / EMA / stop loss
+une seule fois sur tout l'historique (mémo de core.backtest_worker), et les fenêtres qui se
+chevauchent n'en sont que des tranches. Chaque tranche garde devant elle les bougies de
+warm-up de la stratégie : les entrées sont possibles dès la première bougie de la fenêtre,
+et les trades encore ouverts sont fermés (END_OF_DATA) à sa dernière bougie.
+
+Usage :
+    python -m core.walk_forward --symbols XAUUSD --train 21D --test 7D \\
+        --param bb_period=14,20 --param risk_reward_ratio=1.5,2.0
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from core.backtest_worker import WORKER_DATA, flatten_report, init_worker, signal_frame
+from core.parameter_sweep import expand_grid, parse_grid
+from core.strategy import BBKeltnerStrategy
+from core.trade_ledger import TradeLedger
+from utils.file_manager import FileManager
+
+
+def make_windows(
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    train: str = "21D",
+    test: str = "7D",
+    step: Optional[str] = None,
+    anchored: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Fenêtres [train_start, train_end) / [train_end, test_end).
+    Le pas vaut la durée de test par défaut ; `anchored` garde le début de train fixe.
+    """
+    train_delta, test_delta = pd.Timedelta(train), pd.Timedelta(test)
+    step_delta = pd.Timedelta(step) if step else test_delta
+    if train_delta <= pd.Timedelta(0) or test_delta <= pd.Timedelta(0) or step_delta <= pd.Timedelta(0):
+        raise ValueError("Les durées train / test / step doivent être positives")
+
+    windows = []
+    offset = pd.Timedelta(0)
+    while True:
+        train_start = start if anchored else start + offset
+        train_end = start + offset + train_delta
+        if train_end >= end:
+            break
+        windows.append({
+            "window": len(windows),
+            "train_start": train_start,
+            "train_end": train_end,
+            "test_start": train_end,
+            "test_end": min(train_end + test_delta, end),
+        })
+        offset += step_delta
+    return windows
+
+
+def _slice(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp, history: int = 0) -> Tuple[pd.DataFrame, int]:
+    """
+    Tranche [start, end) par recherche binaire sur l'index trié, précédée d'au plus
+    `history` bougies d'historique. Retourne (tranche, nombre de bougies d'historique).
+    """
+    lo, hi = df.index.searchsorted([start, end], side="left")
+    first = max(0, lo - history)
+    return df.iloc[first:hi], lo - first
+
+
+def _backtest(strategy: BBKeltnerStrategy, df_signals: pd.DataFrame, symbol: str,
+              start: pd.Timestamp, end: pd.Timestamp) -> Dict[str, Any]:
+    """Backtest de la fenêtre [start, end) avec le warm-up pris sur les bougies précédentes"""
+    window_df, history = _slice(df_signals, start, end, strategy.warmup_bars)
+    strategy.execute_trading_strategy(window_df, history=history)
+    return strategy.generate_money_management_report(symbol)
+
+
+def _train_combination(params: Dict[str, Any], windows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Métriques in-sample d'une combinaison sur toutes les fenêtres et tous les symboles du worker"""
+    rows = []
+    for symbol in WORKER_DATA:
+        strategy = BBKeltnerStrategy(**params, indicator_cache=None)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            df_signals = signal_frame(strategy, symbol)
+            for window in windows:
+                report = _backtest(strategy, df_signals, symbol, window["train_start"], window["train_end"])
+                rows.append({"symbol": symbol, "window": window["window"], "params": params,
+                             **flatten_report(report)})
+    return rows
+
+
+def _test_combination(task: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Rejoue une combinaison retenue sur les fenêtres de test qui l'ont choisie"""
+    symbol, params = task["symbol"], task["params"]
+    strategy = BBKeltnerStrategy(**params, indicator_cache=None)
+    results = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        df_signals = signal_frame(strategy, symbol)
+        for window in task["windows"]:
+            report = _backtest(strategy, df_signals, symbol, window["test_start"], window["test_end"])
+            trades = strategy.closed_trades  # nouveau ledger à chaque exécution
+            trades.add_column("window", window["window"])
+            results.append({
+                "symbol": symbol,
+                "window": window["window"],
+                "metrics": flatten_report(report),
+                "trades": trades,
+            })
+    return results
+
+
+def _data_range(data_dir: str, symbols: List[str], start=None, end=None) -> Dict[str, tuple]:
+    fm = FileManager(data_dir=data_dir)
+    ranges = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for symbol in symbols:
+            index = fm.load_period(symbol, start, end).index
+            ranges[symbol] = (index[0], index[-1] + pd.Timedelta(1, "s"))  # borne exclusive
+    return ranges
+
+
+def _select_best(train_rows: List[Dict[str, Any]], objective: str, min_trades: int) -> Dict[tuple, Dict[str, Any]]:
+    """Meilleure combinaison par (symbole, fenêtre) ; la première de la grille en cas d'égalité"""
+    best = {}
+    for row in train_rows:
+        score = row.get(objective)
+        if row.get("total_trades", 0) < min_trades or score is None or pd.isna(score):
+            continue
+        key = (row["symbol"], row["window"])
+        if key not in best or score > best[key][objective]:
+            best[key] = row
+    return best
+
+
+def stitch_reports(trades: TradeLedger, symbol: str, initial_capital: float = 100000) -> Dict[str, Any]:
+    """
+    Rapport money management du ledger out-of-sample recollé.
+    Chaque fenêtre de test démarre avec le capital initial (tailles de position indépendantes).
+    """
+    if not isinstance(trades, TradeLedger):
+        trades = TradeLedger.from_records(trades)
+    strategy = BBKeltnerStrategy(initial_capital=initial_capital, indicator_cache=None)
+    strategy.closed_trades = trades
+    strategy.current_capital = trades.capital_curve(initial_capital)[-1]
+    return strategy.generate_money_management_report(symbol)
+
+
+def run_walk_forward(
+    param_grid: Dict[str, List[Any]],
+    symbols: List[str],
+    data_dir: str = "data",
+    train: str = "21D",
+    test: str = "7D",
+    step: Optional[str] = None,
+    anchored: bool = False,
+    objective: str = "net_profit",
+    min_trades: int = 1,
+    max_workers: Optional[int] = None,
+    start=None,
+    end=None,
+) -> Dict[str, Any]:
+    """
+    Walk-forward complet. Retourne :
+      - "windows" : tableau par (symbole, fenêtre) des paramètres retenus, du score train et des métriques OOS
+      - "oos_reports" : rapport money management du ledger OOS recollé, par symbole
+      - "oos_trades" : ledger OOS recollé (colonne "window" ajoutée), par symbole
+    start / end bornent les données (FileManager.load_period) : fenêtres et warm-up restent dans la période.
+    """
+    combos = expand_grid(param_grid)
+    if not combos:
+        combos = [{}]
+
+    ranges = _data_range(data_dir, symbols, start, end)
+    first = min(r[0] for r in ranges.values())
+    last = max(r[1] for r in ranges.values())
+    windows = make_windows(first, last, train=train, test=test, step=step, anchored=anchored)
+    if not windows:
+        raise ValueError(f"Historique trop court pour une fenêtre train de {train}")
+
+    max_workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, math.ceil(len(combos) / (max_workers * 4)))
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                             initargs=(data_dir, symbols, start, end)) as executor:
+        # 1. Optimisation in-sample : une tâche par combinaison, toutes fenêtres confondues
+        train_rows = []
+        for rows in executor.map(partial(_train_combination, windows=windows), combos, chunksize=chunksize):
+            train_rows.extend(rows)
+        best = _select_best(train_rows, objective, min_trades)
+
+        # 2. Out-of-sample : une tâche par (symbole, combinaison retenue)
+        grouped = defaultdict(list)
+        for (symbol, window_id), row in best.items():
+            grouped[(symbol, tuple(row["params"].items()))].append(windows[window_id])
+        tasks = [{"symbol": symbol, "params": dict(params), "windows": ws}
+                 for (symbol, params), ws in grouped.items()]
+        test_results = []
+        for results in executor.map(_test_combination, tasks):
+            test_results.extend(results)
+
+    oos = {(r["symbol"], r["window"]): r for r in test_results}
+    rows = []
+    oos_ledgers = {symbol: [] for symbol in symbols}
+    for symbol in symbols:
+        for window in windows:
+            key = (symbol, window["window"])
+            chosen = best.get(key)
+            result = oos.get(key)
+            row = {"symbol": symbol, **window,
+                   "params": chosen["params"] if chosen else None,
+                   f"train_{objective}": chosen[objective] if chosen else None,
+                   "train_trades": chosen["total_trades"] if chosen else 0}
+            if result is not None:
+                row.update({f"oos_{k}": v for k, v in result["metrics"].items()})
+                oos_ledgers[symbol].append(result["trades"])
+            rows.append(row)
+
+    oos_trades = {symbol: TradeLedger.concat(ledgers) for symbol, ledgers in oos_ledgers.items()}
+    return {
+        "windows": pd.DataFrame(rows),
+        "oos_reports": {symbol: stitch_reports(trades, symbol) for symbol, trades in oos_trades.items()},
+        "oos_trades": oos_trades,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Walk-forward des paramètres BB/Keltner")
+    parser.add_argument("--symbols", nargs="+", default=["XAUUSD", "EURUSD"])
+    parser.add_argument("--param", action="append", default=[], metavar="NOM=V1,V2")
+    parser.add_argument("--grid-file", help="Grille au format JSON {nom: [valeurs]}")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--start", default=None, help="Début de la période (lue dans data/partitions si présent)")
+    parser.add_argument("--end", default=None, help="Fin de la période")
+    parser.add_argument("--train", default="21D", help="Durée in-sample (ex: 21D, 504h)")
+    parser.add_argument("--test", default="7D", help="Durée out-of-sample")
+    parser.add_argument("--step", default=None, help="Pas entre fenêtres (défaut: durée de test)")
+    parser.add_argument("--anchored", action="store_true", help="Début de train fixe (fenêtre croissante)")
+    parser.add_argument("--objective", default="net_profit")
+    parser.add_argument("--min-trades", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", help="Chemin CSV pour le tableau des fenêtres")
+    args = parser.parse_args(argv)
+
+    grid = {}
+    if args.grid_file:
+        with open(args.grid_file, encoding="utf-8") as f:
+            grid.update(json.load(f))
+    grid.update(parse_grid(args.param))
+
+    print(f"🔁 WALK-FORWARD: {len(expand_grid(grid)) or 1} combinaisons | train {args.train} / test {args.test}")
+    start = time.perf_counter()
+    result = run_walk_forward(grid, args.symbols, data_dir=args.data_dir, train=args.train, test=args.test,
+                              step=args.step, anchored=args.anchored, objective=args.objective,
+                              min_trades=args.min_trades, max_workers=args.workers, start=args.start, end=args.end)
+    elapsed = time.perf_counter() - start
+
+    columns = ["symbol", "window", "test_start", "test_end", "params",
+               f"train_{args.objective}", "oos_net_profit", "oos_total_trades"]
+    table = result["windows"]
+    print(table[[c for c in columns if c in table.columns]].to_string(index=False))
+
+    for symbol, report in result["oos_reports"].items():
+        if "error" in report:
+            print(f"\n⚠️  {symbol}: {report['error']} (out-of-sample)")
+            continue
+        mm, perf = report["money_management"], report["performance"]
+        print(f"\n💰 {symbol} OUT-OF-SAMPLE:")
+        print(f"   📈 Profit Net: {mm['net_profit']:+,.2f}€ ({mm['return_percent']:+.2f}%)")
+        print(f"   🎯 Trades: {perf['total_trades']} | Win Rate: {perf['win_rate']}%")
+        print(f"   ⚠️  Drawdown: {mm['max_drawdown']}%")
+    print(f"\n⏱️  Walk-forward terminé en {elapsed:.2f}s")
+
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"💾 Fenêtres sauvegardées: {args.output}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,23 @@
 Bollinger Bands Indicator
 -------------------------
 Calcule les bandes de Bollinger pour une série de prix.
+Deux modes : calculate() sur un DataFrame complet, update() bougie par bougie en O(1).
 """
 
+import math
+import numbers
+from typing import Optional, Tuple
+
 import pandas as pd
 
+from indicators.cache import IndicatorCache, default_cache
+
 class BollingerBands:
-    def __init__(self, period: int = 20, std_dev: float = 2.0):
+    def __init__(self, period: int = 20, std_dev: float = 2.0, cache: Optional[IndicatorCache] = default_cache):
         self.period = period
         self.std_dev = std_dev
+        self.cache = cache  # None pour désactiver le cache
+        self.reset()
 
     def calculate(self, data: pd.DataFrame):
         """
@@ -19,10 +28,66 @@ class BollingerBands:
         if 'close' not in data.columns:
             raise ValueError("La DataFrame doit contenir une colonne 'close'.")
 
-        df = data.copy()
-        middle_band = df['close'].rolling(window=self.period).mean()
-        bb_std = df['close'].rolling(window=self.period).std(ddof=0)
+        close = data['close']
+        if self.cache is None:
+            return self._compute(close)
+        return self.cache.get_or_compute("bollinger", (self.period, self.std_dev), [close],
+                                         lambda: self._compute(close))
+
+    def _compute(self, close: pd.Series):
+        middle_band = close.rolling(window=self.period).mean()
+        bb_std = close.rolling(window=self.period).std(ddof=0)
         upper_band = middle_band + (self.std_dev * bb_std)
         lower_band = middle_band - (self.std_dev * bb_std)
         
-        return middle_band, upper_band, lower_band
\ No newline at end of file
+        return middle_band, upper_band, lower_band
+
+    def reset(self):
+        """Réinitialise l'état du mode streaming"""
+        self._ring = [0.0] * self.period
+        self._pos = 0
+        self._count = 0
+        self._shift = None
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    def update(self, bar) -> Tuple[float, float, float]:
+        """
+        Ajoute une bougie (mapping avec 'close', ou le close directement) et retourne
+        (middle_band, upper_band, lower_band) - NaN tant que la fenêtre n'est pas pleine.
+        Somme et somme des carrés glissantes sur un buffer circulaire : temps et mémoire constants.
+        """
+        close = float(bar if isinstance(bar, numbers.Real) else bar['close'])
+
+        # Les sommes portent sur close - décalage (proche des prix récents)
+        # pour limiter les erreurs d'annulation dans la variance
+        if self._shift is None:
+            self._shift = close
+        x = close - self._shift
+
+        if self._count == self.period:
+            old = self._ring[self._pos] - self._shift
+            self._sum -= old
+            self._sumsq -= old * old
+        else:
+            self._count += 1
+        self._ring[self._pos] = close
+        self._sum += x
+        self._sumsq += x * x
+        self._pos = (self._pos + 1) % self.period
+
+        # À chaque tour du buffer : recentrage du décalage et recalcul exact des sommes
+        # (évite la dérive sur de longues séries, O(1) amorti)
+        if self._pos == 0:
+            self._shift = close
+            values = [v - close for v in self._ring[:self._count]]
+            self._sum = math.fsum(values)
+            self._sumsq = math.fsum(v * v for v in values)
+
+        if self._count < self.period:
+            return math.nan, math.nan, math.nan
+
+        mean = self._sum / self.period
+        std = math.sqrt(max(self._sumsq / self.period - mean * mean, 0.0))
+        middle_band = mean + self._shift
+        return middle_band, middle_band + self.std_dev * std, middle_band - self.std_dev * std
@@ -0,0 +1,106 @@
+"""
+Indicator Cache
+---------------
+Cache mémoire (LRU borné en octets) des séries d'indicateurs.
+La clé combine une empreinte des tableaux d'entrée et les paramètres de l'indicateur :
+un même historique recalculé avec les mêmes paramètres est servi sans recalcul.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class IndicatorCache:
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[tuple, Tuple[tuple, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(*arrays: Any) -> str:
+        """Empreinte (blake2b) du contenu, du dtype et de la forme des tableaux"""
+        digest = hashlib.blake2b(digest_size=16)
+        for array in arrays:
+            values = np.ascontiguousarray(np.asarray(array))
+            digest.update(f"{values.dtype.str}{values.shape}".encode())
+            digest.update(values.data)
+        return digest.hexdigest()
+
+    def get_or_compute(
+        self,
+        name: str,
+        params: tuple,
+        inputs: Sequence[pd.Series],
+        compute: Callable[[], Sequence[pd.Series]],
+    ) -> Tuple[pd.Series, ...]:
+        """
+        Retourne les séries de l'indicateur `name` pour ces paramètres et ces entrées,
+        en les calculant via `compute()` si elles ne sont pas en cache.
+        Les séries retournées portent l'index de la première entrée.
+        """
+        index = inputs[0].index
+        key = (name, params, len(index), self.fingerprint(*inputs))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            return tuple(pd.Series(values, index=index, name=series_name, copy=False)
+                         for values, series_name in entry[0])
+
+        result = tuple(compute())
+        stored = []
+        size = 0
+        for series in result:
+            values = np.array(series.to_numpy(), copy=True)
+            values.flags.writeable = False
+            stored.append((values, series.name))
+            size += values.nbytes
+
+        with self._lock:
+            self.misses += 1
+            if size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (tuple(stored), size)
+                self.current_bytes += size
+                self._evict()
+        return result
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Compteurs pour dimensionner le cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups * 100, 1) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Cache partagé par défaut (process courant)
+default_cache = IndicatorCache()
@@ -2,16 +2,36 @@
 Keltner Channel Indicator
 -------------------------
 Calcule le canal de Keltner
+Deux modes : calculate() sur un DataFrame complet, update() bougie par bougie en O(1).
 """
 
+import math
+from typing import Optional, Tuple
+
 import pandas as pd
 import numpy as np
 
+from indicators.cache import IndicatorCache, default_cache
+
 class KeltnerChannel:
-    def __init__(self, ema_period: int = 20, atr_period: int = 10, atr_multiplier: float = 1.5):
+    def __init__(self, ema_period: int = 20, atr_period: int = 10, atr_multiplier: float = 1.5,
+                 cache: Optional[IndicatorCache] = default_cache):
         self.ema_period = ema_period
         self.atr_period = atr_period
         self.atr_multiplier = atr_multiplier
+        self.cache = cache  # None pour désactiver le cache
+        self.reset()
+
+    @staticmethod
+    def true_range(data: pd.DataFrame) -> pd.Series:
+        """
+        True Range : max(high - low, |high - close précédent|, |low - close précédent|).
+        NaN sur la première bougie (pas de close précédent).
+        """
+        high_low = data['high'] - data['low']
+        high_close = np.abs(data['high'] - data['close'].shift(1))
+        low_close = np.abs(data['low'] - data['close'].shift(1))
+        return np.maximum(np.maximum(high_low, high_close), low_close)
 
     def calculate(self, data: pd.DataFrame):
         """
@@ -22,21 +42,68 @@ class KeltnerChannel:
         if not required_cols.issubset(data.columns):
             raise ValueError(f"La DataFrame doit contenir les colonnes {required_cols}.")
 
-        df = data.copy()
-        
+        df = data[['high', 'low', 'close']]
+        if self.cache is None:
+            return self._compute(df)
+        params = (self.ema_period, self.atr_period, self.atr_multiplier)
+        return self.cache.get_or_compute("keltner", params, [df['high'], df['low'], df['close']],
+                                         lambda: self._compute(df))
+
+    def _compute(self, df: pd.DataFrame):
         # Ligne centrale (EMA du prix typique)
         typical_price = (df['high'] + df['low'] + df['close']) / 3
         middle_line = typical_price.ewm(span=self.ema_period, adjust=False).mean()
 
         # Calcul ATR
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift(1))
-        low_close = np.abs(df['low'] - df['close'].shift(1))
-        true_range = np.maximum(np.maximum(high_low, high_close), low_close)
+        true_range = self.true_range(df)
         atr = true_range.rolling(window=self.atr_period).mean()
 
         # Bandes
         upper_band = middle_line + (atr * self.atr_multiplier)
         lower_band = middle_line - (atr * self.atr_multiplier)
         
-        return middle_line, upper_band, lower_band
\ No newline at end of file
+        return middle_line, upper_band, lower_band
+
+    def reset(self):
+        """Réinitialise l'état du mode streaming"""
+        self._ema = None
+        self._prev_close = None
+        self._tr_ring = [0.0] * self.atr_period
+        self._tr_pos = 0
+        self._tr_count = 0
+        self._tr_sum = 0.0
+
+    def update(self, bar) -> Tuple[float, float, float]:
+        """
+        Ajoute une bougie (mapping avec 'high', 'low', 'close') et retourne
+        (middle_line, upper_band, lower_band) - bandes NaN tant que l'ATR n'est pas prêt.
+        EMA récursive pour la ligne centrale, buffer circulaire pour l'ATR.
+        """
+        high, low, close = float(bar['high']), float(bar['low']), float(bar['close'])
+
+        typical_price = (high + low + close) / 3
+        if self._ema is None:
+            self._ema = typical_price
+        else:
+            alpha = 2.0 / (self.ema_period + 1)
+            self._ema = (1 - alpha) * self._ema + alpha * typical_price
+
+        # Pas de True Range sur la première bougie (pas de close précédent)
+        if self._prev_close is not None:
+            true_range = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+            if self._tr_count == self.atr_period:
+                self._tr_sum -= self._tr_ring[self._tr_pos]
+            else:
+                self._tr_count += 1
+            self._tr_ring[self._tr_pos] = true_range
+            self._tr_sum += true_range
+            self._tr_pos = (self._tr_pos + 1) % self.atr_period
+            if self._tr_pos == 0:
+                self._tr_sum = math.fsum(self._tr_ring[:self._tr_count])
+        self._prev_close = close
+
+        if self._tr_count < self.atr_period:
+            return self._ema, math.nan, math.nan
+
+        atr = self._tr_sum / self.atr_period
+        return self._ema, self._ema + atr * self.atr_multiplier, self._ema - atr * self.atr_multiplier
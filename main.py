@@ -1,10 +1,14 @@
 from utils.concurrent_executor import ConcurrentExecutor
+from utils.event_log import EventLog
+import argparse
 import asyncio
 import time
 
-async def main_async():
+async def main_async(start=None, end=None, trace_memory: bool = False, data_dir: str = "data"):
     """
     Version asynchrone avec exécution concurrente
+    (start / end : période lue dans data/partitions si présent, sinon CSV complet ;
+    trace_memory : pic mémoire tracemalloc par étape dans mm_report et le résumé)
     """
     print("🤖 ROBOT DE TRADING - STRATÉGIE CONVERGENCE BB/KELTNER")
     print("CAPITAL: 100,000€ | RISK: 1% par trade | R/R: 1.5")
@@ -14,8 +18,11 @@ async def main_async():
     
     # Exécution concurrente SANS MODE DÉMO
     executor = ConcurrentExecutor(
-        data_dir="data", 
-        demo_mode=False  # ← CHANGÉ: désactivé le mode démo
+        data_dir=data_dir,
+        demo_mode=False,  # ← CHANGÉ: désactivé le mode démo
+        event_log=EventLog(console=True),  # Trades et étapes de la stratégie affichés sur la console
+        trace_memory=trace_memory,
+        start=start, end=end
     )
     
     start_time = time.time()
@@ -59,7 +66,15 @@ async def main_async():
             print(f"   🎯 Trades: {perf['total_trades']} (✅ {perf['winning_trades']} | ❌ {perf['losing_trades']})")
             print(f"   📊 Win Rate: {perf['win_rate']}%")
             print(f"   ⚠️  Drawdown: {mm['max_drawdown']}%")
+            if 'drawdown_analysis' in result:
+                dd = result['drawdown_analysis']
+                print(f"   🌊 Drawdown MTM: {dd['max_drawdown']}% | Sous l'eau: {dd['time_under_water_percent']}% du temps")
             print(f"   📈 Profit Factor: {perf['profit_factor']}")
+            if 'session_settings' in result:
+                settings = result['session_settings']
+                assumed = " (supposé, broker_tz non renseigné)" if settings['broker_tz_assumed'] else ""
+                killzone = settings['killzone']
+                print(f"   🕒 Fuseau broker: {settings['broker_tz']}{assumed} | Killzone: {killzone['start']}–{killzone['end']}")
             
             total_profit += mm['net_profit']
             total_trades += perf['total_trades']
@@ -80,6 +95,15 @@ async def main_async():
     print(f"   🏆 WIN RATE GLOBAL: {global_win_rate:.1f}%")
     print(f"   ⏱️  TEMPS D'EXÉCUTION: {end_time - start_time:.2f} secondes")
 
+    # Temps par étape (tous symboles confondus)
+    timings = executor.timing_summary()
+    if timings['stages']:
+        print(f"\n⏱️  ÉTAPES (étape dominante: {timings['dominant_stage']}):")
+        for stage, stats in timings['stages'].items():
+            memory = f" | pic {stats['max_peak_memory_mb']:.1f} MB" if 'max_peak_memory_mb' in stats else ""
+            print(f"   {stage:<11} {stats['wall_seconds']:>8.3f}s ({stats['share_percent']:>5.1f}%) "
+                  f"| CPU {stats['cpu_seconds']:.3f}s{memory}")
+
 def main_simple():
     """
     Version simple (identique maintenant)
@@ -87,7 +111,7 @@ def main_simple():
     print("⚡ VERSION RAPIDE")
     symbols = ["XAUUSD", "EURUSD"]
     
-    executor = ConcurrentExecutor(data_dir="data", demo_mode=False)
+    executor = ConcurrentExecutor(data_dir="data", demo_mode=False, event_log=EventLog(console=True))
     start_time = time.time()
     
     results = asyncio.run(executor.run_multiple_strategies_async(symbols))
@@ -97,6 +121,17 @@ def main_simple():
     
     return results
 
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest BB/Keltner de XAUUSD et EURUSD")
+    parser.add_argument("--start", default=None, help="Début de la période (ex: 2024-06-01)")
+    parser.add_argument("--end", default=None, help="Fin de la période")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Pic mémoire par étape (tracemalloc, ralentit le run)")
+    parser.add_argument("--data-dir", default="data")
+    args = parser.parse_args(argv)
+
     # Version principale
-    asyncio.run(main_async())
\ No newline at end of file
+    asyncio.run(main_async(args.start, args.end, args.trace_memory, args.data_dir))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,6 +1,7 @@
 # main_claude_final.py
 from core.strategy import BBKeltnerStrategy
 from utils.file_manager import FileManager
+from utils.event_log import EventLog
 from utils.claude_analyzer import ClaudeAnalyzer
 from utils.fundamental_scraper_improved import FundamentalScraperImproved
 import pandas as pd
@@ -18,7 +19,7 @@ def demo_claude_final():
     print(f"✅ Données chargées: {len(df)} bougies")
     
     # 2. Générer un signal
-    strategy = BBKeltnerStrategy()
+    strategy = BBKeltnerStrategy(event_log=EventLog(console=True))
     df_signals = strategy.generate_trading_signals(df)
     
     # 3. Trouver le premier signal
@@ -0,0 +1,86 @@
+"""
+Test du benchmark du pipeline (étapes mesurées, parité avec un run direct, détection des régressions)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import contextlib
+import copy
+import io
+
+import numpy as np
+
+from benchmarks.pipeline import STAGES, bench_dataset, compare_to_baseline
+from core.strategy import BBKeltnerStrategy
+from utils.file_manager import FileManager
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def test_bench_dataset_measures_real_pipeline():
+    rows = bench_dataset("XAUUSD", DATA_DIR, "XAUUSD", repeat=1, memory=True)
+    assert [row["stage"] for row in rows] == STAGES
+    by_stage = {row["stage"]: row for row in rows}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = FileManager(data_dir=DATA_DIR, cache=None).load_csv("XAUUSD")
+    strategy = BBKeltnerStrategy(indicator_cache=None)
+    signals = strategy.generate_trading_signals(df)
+    trades = strategy.execute_trading_strategy(signals)
+
+    for row in rows:
+        assert row["bars"] == len(df) and row["wall_seconds"] >= 0 and row["peak_memory_mb"] >= 0
+        assert row["bars_per_second"] is None or np.isclose(row["bars_per_second"], len(df) / row["wall_seconds"], rtol=1e-3)
+    assert by_stage["generate_trading_signals"]["signals"] == int((signals["signal"] != 0).sum())
+    assert by_stage["execute_trading_strategy"]["trades"] == len(trades)
+    assert by_stage["execute_trading_strategy"]["net_profit"] == round(float(trades.column("pnl").sum()), 2)
+
+
+def _document():
+    return {"meta": {}, "results": [
+        {"dataset": "XAUUSD", "stage": "load_csv", "wall_seconds": 0.5, "peak_memory_mb": 10.0},
+        {"dataset": "XAUUSD", "stage": "execute_trading_strategy", "wall_seconds": 0.2,
+         "peak_memory_mb": 4.0, "trades": 12, "net_profit": 150.0},
+    ]}
+
+
+def test_compare_to_baseline_flags_regressions():
+    baseline = _document()
+    assert not any(c["regression"] for c in compare_to_baseline(_document(), baseline))
+
+    slower = _document()
+    slower["results"][0]["wall_seconds"] = 0.7  # +40%
+    flags = {c["stage"]: c for c in compare_to_baseline(slower, baseline, time_threshold=0.25)}
+    assert flags["load_csv"]["regression"] and flags["load_csv"]["time_ratio"] == 1.4
+    assert not flags["execute_trading_strategy"]["regression"]
+    assert not compare_to_baseline(slower, baseline, time_threshold=0.5)[0]["regression"]
+
+    # Écart relatif important mais absolu sous min_seconds : bruit, pas de régression
+    tiny_base, tiny = copy.deepcopy(baseline), copy.deepcopy(baseline)
+    tiny_base["results"][0]["wall_seconds"], tiny["results"][0]["wall_seconds"] = 0.001, 0.005
+    assert not compare_to_baseline(tiny, tiny_base)[0]["regression"]
+
+    heavier = _document()
+    heavier["results"][1]["peak_memory_mb"] = 6.0
+    assert compare_to_baseline(heavier, baseline)[1]["regression"]
+
+    # Même temps, trades différents : la réécriture n'est plus iso-résultat
+    changed = _document()
+    changed["results"][1]["net_profit"] = 149.99
+    comparison = compare_to_baseline(changed, baseline)[1]
+    assert comparison["regression"] and comparison["result_changed"] == ["net_profit"]
+
+    # Étapes absentes de la baseline ignorées
+    extra = _document()
+    extra["results"].append({"dataset": "synthetic_10k", "stage": "load_csv", "wall_seconds": 9.0})
+    assert len(compare_to_baseline(extra, baseline)) == 2
+
+
+if __name__ == "__main__":
+    print("🧪 TEST BENCHMARK PIPELINE")
+    print("=" * 50)
+    test_bench_dataset_measures_real_pipeline()
+    test_compare_to_baseline_flags_regressions()
+    print("✅ Étapes mesurées sur le vrai pipeline et régressions détectées")
@@ -0,0 +1,121 @@
+"""
+Test de ConcurrentExecutor (journal d'événements identique en threads et en process, période, --trace-memory)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import collections
+import contextlib
+import io
+import json
+import shutil
+import tempfile
+
+import pandas as pd
+
+import main
+from utils.concurrent_executor import ConcurrentExecutor
+from utils.event_log import EventLog
+from utils.file_manager import FileManager
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SYMBOLS = ["XAUUSD", "EURUSD"]
+
+
+def _run(use_processes: bool) -> EventLog:
+    """Run complet dans une copie des données (results_* et mm_report_* écrits à part)"""
+    event_log = EventLog(level="DEBUG")
+    with tempfile.TemporaryDirectory() as data_dir, contextlib.redirect_stdout(io.StringIO()):
+        for symbol in SYMBOLS:
+            shutil.copy(os.path.join(DATA_DIR, f"{symbol}.csv"), data_dir)
+        executor = ConcurrentExecutor(data_dir=data_dir, demo_mode=False, event_log=event_log,
+                                      max_workers=1, use_processes=use_processes, show_activity=False)
+        results = asyncio.run(executor.run_multiple_strategies_async(SYMBOLS))
+    assert "error" not in results[0] and all("events" not in r for r in results)
+    return event_log
+
+
+def _events(event_log: EventLog) -> collections.Counter:
+    return collections.Counter((r["level"], r["event"], r["message"], repr(sorted(r["fields"].items())))
+                               for r in event_log.records())
+
+
+def test_process_mode_replays_worker_events():
+    threads, processes = _run(use_processes=False), _run(use_processes=True)
+    assert _events(processes) == _events(threads)
+
+    names = {r["event"] for r in processes.records()}
+    assert {"indicators_start", "execution_start", "execution_end", "file_activity"} <= names
+    # Ordre chronologique du worker conservé pour chaque symbole
+    for symbol in SYMBOLS:
+        stamps = [r["ts"] for r in processes.records(event="file_activity") if r["fields"]["symbol"] == symbol]
+        assert stamps == sorted(stamps)
+
+
+def test_replay_respects_level():
+    worker = EventLog(level="DEBUG")
+    worker.debug("detail")
+    worker.warning("alert", x=1)
+    main = EventLog(level="INFO")
+    main.replay(worker.records())
+    assert main.records() == worker.records(level="INFO")
+
+
+def test_period_reads_partitions():
+    start, end = pd.Timestamp("2024-02-05"), pd.Timestamp("2024-02-20")
+    with tempfile.TemporaryDirectory() as data_dir, contextlib.redirect_stdout(io.StringIO()):
+        shutil.copy(os.path.join(DATA_DIR, "XAUUSD.csv"), data_dir)
+        fm = FileManager(data_dir=data_dir, cache=None)
+        fm.partitions.append("XAUUSD", fm.load_csv("XAUUSD").loc[:"2024-02-15"])
+        executor = ConcurrentExecutor(data_dir=data_dir, demo_mode=False, max_workers=1,
+                                      show_activity=False, start=start, end=end)
+        report = asyncio.run(executor.run_multiple_strategies_async(["XAUUSD"]))[0]
+        signals = pd.read_csv(os.path.join(data_dir, "results_XAUUSD.csv"), index_col=0, parse_dates=True)
+
+    # Partitions (jusqu'au 15/02) prioritaires sur le CSV complet
+    assert signals.index[0] >= start and signals.index[-1] < pd.Timestamp("2024-02-16")
+    for trade in report["trades_detailed"]:
+        assert start <= trade["entry_time"] < pd.Timestamp("2024-02-16")
+
+
+def _saved_timings(argv, data_dir):
+    """main.py sur une copie des données : temps par étape du mm_report XAUUSD sauvegardé, sortie console"""
+    for name in os.listdir(data_dir):
+        if name.startswith("mm_report_"):
+            os.remove(os.path.join(data_dir, name))
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        main.main(argv + ["--data-dir", data_dir])
+    [report] = [name for name in os.listdir(data_dir) if name.startswith("mm_report_XAUUSD")]
+    with open(os.path.join(data_dir, report), encoding="utf-8") as f:
+        return json.load(f)["timings"]["stages"], out.getvalue()
+
+
+def test_main_trace_memory_flag():
+    assert not ConcurrentExecutor(show_activity=False).tracer.memory
+    with tempfile.TemporaryDirectory() as data_dir:
+        for symbol in SYMBOLS:
+            shutil.copy(os.path.join(DATA_DIR, f"{symbol}.csv"), data_dir)
+
+        stages, output = _saved_timings([], data_dir)
+        assert stages and not any("peak_memory_mb" in r for r in stages.values())
+        assert " MB" not in output
+
+        stages, output = _saved_timings(["--trace-memory"], data_dir)
+        assert {"load", "indicators", "execution", "report"} <= set(stages)
+        assert all(r["peak_memory_mb"] >= 0 for r in stages.values())
+        assert stages["indicators"]["peak_memory_mb"] > 0
+        assert "| pic " in output and " MB" in output
+
+
+if __name__ == "__main__":
+    print("🧪 TEST CONCURRENT EXECUTOR")
+    print("=" * 50)
+    test_process_mode_replays_worker_events()
+    test_replay_respects_level()
+    test_period_reads_partitions()
+    test_main_trace_memory_flag()
+    print("✅ Événements des workers rejoués, période lue dans les partitions, mémoire tracée sur option")
@@ -0,0 +1,68 @@
+"""
+Test du cache des CSV parsés (FileManager.load_csv)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import tempfile
+
+import pandas as pd
+
+from utils.data_cache import ParsedDataCache
+from utils.file_manager import FileManager
+from utils.synthetic_data import write_symbols
+
+
+def test_cached_load_matches_fresh_parse():
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_symbols(["SYNTH"], 3_000, data_dir, seed=5)
+        fresh = FileManager(data_dir=data_dir, cache=None).load_csv("SYNTH")
+        fm = FileManager(data_dir=data_dir, cache=ParsedDataCache())
+
+        first = fm.load_csv("SYNTH")
+        second = fm.load_csv("SYNTH")
+        pd.testing.assert_frame_equal(first, fresh)
+        pd.testing.assert_frame_equal(second, fresh)
+        assert second.index.name == fresh.index.name and second.index.dtype == fresh.index.dtype
+        assert fm.cache_stats()["hits"] == 1 and fm.cache_stats()["misses"] == 1
+        assert fm.cache_stats()["hit_rate"] == 50.0
+
+
+def test_cache_is_invalidated_when_csv_changes():
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_symbols(["SYNTH"], 2_000, data_dir, seed=5)
+        path = os.path.join(data_dir, "SYNTH.csv")
+        cache = ParsedDataCache()
+        fm = FileManager(data_dir=data_dir, cache=cache)
+        fm.load_csv("SYNTH")
+
+        # Même contenu, mtime modifié : le hash confirme le cache
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        fm.load_csv("SYNTH")
+        assert cache.hits == 1
+
+        # Contenu modifié (même taille, nouveau prix) : reconstruction
+        with open(path) as f:
+            lines = f.readlines()
+        fields = lines[-1].split("\t")
+        fields[5] = fields[5][:-1] + ("1" if fields[5][-1] != "1" else "2")  # dernier chiffre du close
+        lines[-1] = "\t".join(fields)
+        with open(path, "w") as f:
+            f.writelines(lines)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+
+        reloaded = fm.load_csv("SYNTH")
+        assert cache.misses == 2
+        expected = FileManager(data_dir=data_dir, cache=None).load_csv("SYNTH")
+        pd.testing.assert_frame_equal(reloaded, expected)
+
+
+if __name__ == "__main__":
+    print("🧪 TEST DATA CACHE")
+    print("=" * 50)
+    test_cached_load_matches_fresh_parse()
+    test_cache_is_invalidated_when_csv_changes()
+    print("✅ Cache des CSV parsés cohérent et invalidé à chaque modification")
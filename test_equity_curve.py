@@ -0,0 +1,84 @@
+"""
+Test de la courbe de capital mark-to-market vectorisée vs boucle bougie par bougie
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from core.equity_curve import equity_curve, drawdown_stats
+from core.trade_ledger import TradeLedger
+
+
+def _market(n: int = 2000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 2000 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    index = pd.date_range("2024-01-01", periods=n, freq="15min", name="datetime")
+    return pd.DataFrame({"high": close * 1.001, "low": close * 0.999, "close": close}, index=index)
+
+
+def _ledger(df: pd.DataFrame, seed: int = 1) -> TradeLedger:
+    """Trades qui se chevauchent, sorties au close de la bougie de sortie"""
+    rng = np.random.default_rng(seed)
+    close = df["close"].to_numpy()
+    ledger = TradeLedger()
+    for entry in np.sort(rng.choice(len(df) - 60, size=80, replace=False)):
+        exit_bar = int(entry + rng.integers(1, 60))
+        direction = "LONG" if rng.random() < 0.5 else "SHORT"
+        units = int(rng.integers(100, 1000))
+        sign = 1 if direction == "LONG" else -1
+        ledger.append({
+            "entry_time": df.index[entry], "entry_price": close[entry], "direction": direction,
+            "units": units, "exit_time": df.index[exit_bar], "exit_price": close[exit_bar],
+            "pnl": sign * (close[exit_bar] - close[entry]) * units,
+        })
+    return ledger
+
+
+def _reference(df: pd.DataFrame, ledger: TradeLedger, initial_capital: float, price: str):
+    equity = []
+    for t, row in zip(df.index, df.itertuples()):
+        value = initial_capital
+        for trade in ledger:
+            sign = 1 if trade["direction"] == "LONG" else -1
+            if trade["exit_time"] <= t:
+                value += trade["pnl"]
+            elif trade["entry_time"] <= t:
+                mark = row.close if price == "close" else (row.low if sign == 1 else row.high)
+                value += sign * (mark - trade["entry_price"]) * trade["units"]
+        equity.append(value)
+    return np.array(equity)
+
+
+def test_equity_matches_bar_loop():
+    df = _market(600)
+    ledger = _ledger(df)
+    for price in ("close", "worst"):
+        curve = equity_curve(ledger, df, 100000, price=price)
+        np.testing.assert_allclose(curve.to_numpy(), _reference(df, ledger, 100000, price), rtol=1e-12)
+
+
+def test_drawdown_stats():
+    index = pd.date_range("2024-01-01", periods=8, freq="1h")
+    equity = pd.Series([100, 110, 99, 105, 110, 120, 90, 95], index=index, dtype=float)
+    stats = drawdown_stats(equity)
+    assert stats["max_drawdown"] == 25.0
+    assert stats["max_drawdown_amount"] == 30.0
+    assert stats["max_drawdown_peak"] == index[5]
+    assert stats["max_drawdown_trough"] == index[6]
+    assert stats["drawdown_periods"] == 2
+    assert stats["max_underwater_bars"] == 2
+    assert stats["time_under_water_percent"] == 50.0
+    assert stats["max_underwater_duration"] == pd.Timedelta(hours=3)  # pic 01:00 -> retour 04:00
+    assert stats["recovered"] is False
+
+
+if __name__ == "__main__":
+    print("🧪 TEST EQUITY CURVE")
+    print("=" * 50)
+    test_equity_matches_bar_loop()
+    test_drawdown_stats()
+    print("✅ Courbe mark-to-market et drawdown conformes")
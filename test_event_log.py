@@ -0,0 +1,99 @@
+"""
+Test du journal d'événements (niveaux, écho console, filtrage, export JSONL)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import contextlib
+import io
+import json
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from core.strategy import BBKeltnerStrategy
+from utils.event_log import DEBUG, ERROR, INFO, NULL_EVENT_LOG, WARNING, EventLog
+
+
+def test_level_threshold():
+    log = EventLog(level="WARNING")
+    log.debug("a")
+    log.info("b")
+    log.warning("c", x=1)
+    log.error("d")
+    assert [r["event"] for r in log.records()] == ["c", "d"]
+    assert not log.enabled_for(INFO) and log.enabled_for(WARNING) and log.enabled_for(ERROR)
+    assert EventLog(level=DEBUG).enabled_for(DEBUG)
+
+    # Journal inactif : rien n'est enregistré
+    NULL_EVENT_LOG.error("ignored")
+    assert NULL_EVENT_LOG.records() == [] and not NULL_EVENT_LOG.enabled_for(ERROR)
+
+
+def test_console_echo_respects_console_level():
+    log = EventLog(level="DEBUG", console=True, console_level="INFO")
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        log.debug("trend_check", "jamais affiché")
+        log.info("trade_open", "OPEN {direction} | Lots: {lots}", direction="LONG", lots=0.5)
+        log.warning("gap", bars=3)
+    assert out.getvalue().splitlines() == ["OPEN LONG | Lots: 0.5", "[WARNING] gap bars=3"]
+    assert len(log.records()) == 3  # le DEBUG reste dans le buffer
+
+    silent = io.StringIO()
+    with contextlib.redirect_stdout(silent):
+        EventLog().info("trade_open", "OPEN")
+    assert silent.getvalue() == ""
+
+
+def test_records_filtering_and_ring_size():
+    log = EventLog(level="DEBUG", ring_size=5)
+    for k in range(8):
+        log.log(DEBUG if k % 2 else INFO, "tick" if k < 6 else "tock", k=k)
+    assert [r["fields"]["k"] for r in log.records()] == [3, 4, 5, 6, 7]
+    assert [r["fields"]["k"] for r in log.records(level="INFO")] == [4, 6]
+    assert [r["fields"]["k"] for r in log.records(event="tock")] == [6, 7]
+    assert [r["fields"]["k"] for r in log.records(level=INFO, event="tick")] == [4]
+
+
+def test_jsonl_export():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "events.jsonl")
+        with EventLog(level="INFO", jsonl_path=path) as log:
+            log.debug("skipped")
+            log.info("trade_close", "P&L: {pnl:+.2f}€", pnl=12.5, time=pd.Timestamp("2024-01-02 03:15"))
+            log.error("strategy_error", symbol="XAUUSD")
+        with open(path, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+    assert [line["event"] for line in lines] == ["trade_close", "strategy_error"]
+    assert lines[0]["message"] == "P&L: +12.50€" and lines[0]["time"] == "2024-01-02 03:15:00"
+    assert lines[1]["level"] == "ERROR" and lines[1]["message"] is None and lines[1]["symbol"] == "XAUUSD"
+
+
+def test_strategy_events_match_trades():
+    rng = np.random.default_rng(4)
+    close = 2000 + np.cumsum(rng.normal(0, 2.0, 3_000))
+    df = pd.DataFrame({"open": close, "high": close + 1.5, "low": close - 1.5, "close": close},
+                      index=pd.date_range("2024-01-01", periods=3_000, freq="15min"))
+
+    log = EventLog(level="DEBUG")
+    strategy = BBKeltnerStrategy(killzone_start="00:00", killzone_end="23:59", event_log=log)
+    trades = strategy.execute_trading_strategy(strategy.generate_trading_signals(df))
+    assert len(trades) > 0
+    assert len(log.records(event="trade_open")) == len(strategy.trades)
+    assert len(log.records(event="trade_close")) == len(trades)
+    assert log.records(event="execution_end")[-1]["fields"]["trades"] == len(trades)
+
+
+if __name__ == "__main__":
+    print("🧪 TEST EVENT LOG")
+    print("=" * 50)
+    test_level_threshold()
+    test_console_echo_respects_console_level()
+    test_records_filtering_and_ring_size()
+    test_jsonl_export()
+    test_strategy_events_match_trades()
+    print("✅ Niveaux, écho console, filtrage et export JSONL conformes")
@@ -0,0 +1,190 @@
+"""
+Test de parité : exécution sur tableaux NumPy (entry_candidates + resolve_exits + colonnes
+de stop loss) vs boucle iterrows et calcul du stop loss d'origine
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import contextlib
+import io
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from core.strategy import BBKeltnerStrategy
+from core.trade_ledger import TradeLedger
+from utils.file_manager import FileManager
+from utils.synthetic_data import write_symbols
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+PARAMS = [
+    {},
+    dict(killzone_start="00:00", killzone_end="23:59"),
+    dict(killzone_start="00:00", killzone_end="23:59", risk_reward_ratio=0.5, bb_std=1.5),
+    dict(killzone_start="01:00", killzone_end="20:00", bb_period=10),
+]
+
+
+class MultiTradeStrategy(BBKeltnerStrategy):
+    """
+    Marque aussi le trade fermé dans self.trades : sans cela le filtre "trade ouvert"
+    bloque toute entrée après le premier trade et la parité ne porte que sur un trade.
+    """
+
+    def close_trade(self, trade, *args):
+        super().close_trade(trade, *args)
+        entry_times = self.trades.column("entry_time")
+        row = np.flatnonzero(entry_times == np.datetime64(trade["entry_time"]))[-1]
+        self.trades.set_value(int(row), "status", "CLOSED")
+
+
+def legacy_stop_loss(df: pd.DataFrame, i: int, direction: str) -> float:
+    """calculate_stop_loss_optimized d'origine (liste de True Range reconstruite à chaque trade)"""
+    true_ranges = []
+    for j in range(max(0, i - 13), i + 1):
+        tr1 = df['high'].iloc[j] - df['low'].iloc[j]
+        tr2 = abs(df['high'].iloc[j] - df['close'].iloc[j - 1]) if j > 0 else 0
+        tr3 = abs(df['low'].iloc[j] - df['close'].iloc[j - 1]) if j > 0 else 0
+        true_ranges.append(max(tr1, tr2, tr3))
+    atr = np.mean(true_ranges) if true_ranges else (df['high'].iloc[i] - df['low'].iloc[i])
+
+    current_price = df['close'].iloc[i]
+    if direction == "LONG":
+        stop_loss = current_price - (atr * 2.5)
+        recent_low = min([df['low'].iloc[i - j] for j in range(min(3, i + 1))])
+        stop_loss = max(stop_loss, recent_low * 0.999)
+    else:
+        stop_loss = current_price + (atr * 2.5)
+        recent_high = max([df['high'].iloc[i - j] for j in range(min(3, i + 1))])
+        stop_loss = min(stop_loss, recent_high * 1.001)
+    return round(stop_loss, 5)
+
+
+def legacy_execute(strategy: BBKeltnerStrategy, df: pd.DataFrame) -> TradeLedger:
+    """execute_trading_strategy d'origine : iterrows + should_enter_trade bougie par bougie"""
+    strategy.current_capital = strategy.initial_capital
+    strategy.trades = TradeLedger()
+    strategy.closed_trades = TradeLedger()
+    strategy.last_trade_time = None
+    open_trades = []
+
+    for i, (index, row) in enumerate(df.iterrows()):
+        for trade in open_trades[:]:
+            if trade["direction"] == "LONG":
+                if row["low"] <= trade["stop_loss"]:
+                    pnl = (trade["stop_loss"] - trade["entry_price"]) * trade["units"]
+                    strategy.close_trade(trade, trade["stop_loss"], "STOP_LOSS", pnl, index)
+                    open_trades.remove(trade)
+                elif row["high"] >= trade["take_profit"]:
+                    pnl = (trade["take_profit"] - trade["entry_price"]) * trade["units"]
+                    strategy.close_trade(trade, trade["take_profit"], "TAKE_PROFIT", pnl, index)
+                    open_trades.remove(trade)
+            else:
+                if row["high"] >= trade["stop_loss"]:
+                    pnl = (trade["entry_price"] - trade["stop_loss"]) * trade["units"]
+                    strategy.close_trade(trade, trade["stop_loss"], "STOP_LOSS", pnl, index)
+                    open_trades.remove(trade)
+                elif row["low"] <= trade["take_profit"]:
+                    pnl = (trade["entry_price"] - trade["take_profit"]) * trade["units"]
+                    strategy.close_trade(trade, trade["take_profit"], "TAKE_PROFIT", pnl, index)
+                    open_trades.remove(trade)
+
+        symbol = "XAUUSD" if "XAU" in str(df.index.name) else "EURUSD"
+        current_signal = row["signal"]
+        if current_signal != 0 and strategy.should_enter_trade(df, i, symbol):
+            entry_price = row["close"]
+            direction = "LONG" if current_signal == 1 else "SHORT"
+            stop_loss = legacy_stop_loss(df, i, direction)
+            if direction == "LONG":
+                take_profit = entry_price + ((entry_price - stop_loss) * strategy.risk_reward_ratio)
+            else:
+                take_profit = entry_price - ((stop_loss - entry_price) * strategy.risk_reward_ratio)
+
+            position_info = strategy.calculate_position_size(entry_price, stop_loss, symbol)
+            if 0.3 <= position_info["risk_percent"] <= 1.5 and position_info["lots"] > 0:
+                trade = {
+                    "entry_time": index,
+                    "entry_price": round(entry_price, 5),
+                    "direction": direction,
+                    "stop_loss": round(stop_loss, 5),
+                    "take_profit": round(take_profit, 5),
+                    "risk_amount": position_info["risk_amount"],
+                    "units": position_info["units"],
+                    "lots": position_info["lots"],
+                    "risk_percent": position_info["risk_percent"],
+                    "phase": row["phase"],
+                    "status": "OPEN",
+                }
+                strategy.trades.append(trade)
+                open_trades.append(trade)
+                strategy.last_trade_time = index
+
+    if open_trades:
+        last_price = df.iloc[-1]["close"]
+        for trade in open_trades:
+            if trade["direction"] == "LONG":
+                pnl = (last_price - trade["entry_price"]) * trade["units"]
+            else:
+                pnl = (trade["entry_price"] - last_price) * trade["units"]
+            strategy.close_trade(trade, last_price, "END_OF_DATA", pnl, df.index[-1])
+    return strategy.closed_trades
+
+
+def _frames():
+    with contextlib.redirect_stdout(io.StringIO()):
+        frames = {symbol: FileManager(data_dir=DATA_DIR).load_csv(symbol) for symbol in ("XAUUSD", "EURUSD")}
+        with tempfile.TemporaryDirectory() as data_dir:
+            write_symbols(["SYNTH_GOLD"], 3_000, data_dir, seed=21, volatility_clustering=True)
+            write_symbols(["SYNTH_FX"], 3_000, data_dir, seed=22, start_price=1.1, annual_volatility=0.08)
+            for symbol in ("SYNTH_GOLD", "SYNTH_FX"):
+                frames[symbol] = FileManager(data_dir=data_dir, cache=None).load_csv(symbol)
+    return frames
+
+
+def test_execution_matches_iterrows_loop():
+    total = 0
+    for name, df in _frames().items():
+        for params in PARAMS:
+            vectorized, legacy = MultiTradeStrategy(**params), MultiTradeStrategy(**params)
+            signals = vectorized.generate_trading_signals(df)
+            trades = vectorized.execute_trading_strategy(signals)
+            expected = legacy_execute(legacy, signals)
+            assert trades == list(expected), (name, params)
+            assert vectorized.current_capital == legacy.current_capital, (name, params)
+            total += len(trades)
+    assert total > 100  # plusieurs trades par série : chemins SL / TP / fin de données exercés
+
+
+def test_entry_candidates_match_should_enter_trade():
+    for name, df in _frames().items():
+        for params in PARAMS:
+            strategy = BBKeltnerStrategy(**params)
+            signals = strategy.generate_trading_signals(df)
+            expected = [i for i in range(len(signals))
+                        if signals["signal"].iat[i] != 0 and strategy.should_enter_trade(signals, i, "EURUSD")]
+            assert strategy.entry_candidates(signals).tolist() == expected, (name, params)
+
+
+def test_stop_loss_columns_match_legacy_loop():
+    df = _frames()["XAUUSD"]
+    strategy = BBKeltnerStrategy()
+    signals = strategy.generate_trading_signals(df)
+    for i in list(range(20)) + list(range(20, len(signals), 7)):
+        for direction in ("LONG", "SHORT"):
+            assert strategy.calculate_stop_loss_optimized(signals, i, direction) == legacy_stop_loss(signals, i, direction)
+    # Sans colonnes précalculées : calcul à la volée
+    for i in (0, 1, 2, 13, 14, 500, len(df) - 1):
+        assert strategy.calculate_stop_loss_optimized(df, i, "LONG") == legacy_stop_loss(df, i, "LONG")
+
+
+if __name__ == "__main__":
+    print("🧪 TEST DE PARITÉ D'EXÉCUTION")
+    print("=" * 50)
+    test_execution_matches_iterrows_loop()
+    test_entry_candidates_match_should_enter_trade()
+    test_stop_loss_columns_match_legacy_loop()
+    print("✅ Exécution, candidats d'entrée et stop loss identiques aux boucles d'origine")
@@ -0,0 +1,114 @@
+"""
+Test de parité : resolve_exits (fenêtres doublées, matrices booléennes) vs boucle
+bougie par bougie sur chaque trade
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from core.exit_resolver import END_OF_DATA, STOP_LOSS, TAKE_PROFIT, TIME_EXIT, resolve_exits
+from core.strategy_old import BBKeltnerStrategy as OldStrategy
+
+
+def loop_exit(high, low, close, entry, direction, stop_loss, take_profit, max_bars):
+    """Première bougie après l'entrée qui touche le SL (prioritaire) ou le TP"""
+    n = len(close)
+    stop = n if max_bars is None else min(entry + max_bars, n)
+    for j in range(entry + 1, stop):
+        sl_hit = low[j] <= stop_loss if direction > 0 else high[j] >= stop_loss
+        tp_hit = high[j] >= take_profit if direction > 0 else low[j] <= take_profit
+        if sl_hit:
+            return j, stop_loss, STOP_LOSS
+        if tp_hit:
+            return j, take_profit, TAKE_PROFIT
+    if max_bars is None:
+        return n - 1, close[n - 1], END_OF_DATA
+    last = min(entry + max_bars, n - 1)
+    return last, close[last], TIME_EXIT
+
+
+def _market(n: int = 3_000, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    spread = np.abs(rng.normal(0, 0.002, (2, n))) * close
+    return close + spread[0], close - spread[1], close
+
+
+def _trades(close: np.ndarray, m: int = 600, seed: int = 6):
+    rng = np.random.default_rng(seed)
+    n = len(close)
+    entry = np.r_[rng.integers(0, n, m - 6), [n - 1, n - 2, n - 3, n - 50, n - 99, n - 101]]
+    direction = rng.choice([1, -1], len(entry))
+    # Distances variées : touches rapides, tardives ou jamais (sorties TIME_EXIT / END_OF_DATA)
+    distance = close[entry] * rng.choice([0.001, 0.005, 0.02, 0.2], len(entry))
+    ratio = rng.choice([0.5, 1.5, 3.0], len(entry))
+    stop_loss = close[entry] - direction * distance
+    take_profit = close[entry] + direction * distance * ratio
+    return entry, direction, stop_loss, take_profit
+
+
+def _check(max_bars, chunk_size=64, max_cells=4_000_000):
+    high, low, close = _market()
+    entry, direction, stop_loss, take_profit = _trades(close)
+    exits = resolve_exits(high, low, close, entry, direction, stop_loss, take_profit,
+                          max_bars=max_bars, chunk_size=chunk_size, max_cells=max_cells)
+    reasons = set()
+    for k in range(len(entry)):
+        expected = loop_exit(high, low, close, entry[k], direction[k], stop_loss[k], take_profit[k], max_bars)
+        got = (exits["exit_index"][k], exits["exit_price"][k], exits["exit_reason"][k])
+        assert got == expected, (k, got, expected)
+        reasons.add(int(got[2]))
+    return reasons
+
+
+def test_matches_loop_without_max_bars():
+    assert _check(None) == {STOP_LOSS, TAKE_PROFIT, END_OF_DATA}
+    _check(None, chunk_size=1, max_cells=50)  # nombreuses passes doublées et petits lots
+
+
+def test_matches_loop_with_max_bars():
+    assert _check(100) == {STOP_LOSS, TAKE_PROFIT, TIME_EXIT}
+    _check(100, chunk_size=3, max_cells=97)
+
+
+def test_stop_loss_wins_on_same_bar():
+    high = np.array([10.0, 10.5, 12.0, 10.0])
+    low = np.array([10.0, 9.5, 8.0, 10.0])
+    close = np.array([10.0, 10.0, 10.0, 10.0])
+    exits = resolve_exits(high, low, close, entry_idx=[0, 0], direction=[1, -1],
+                          stop_loss=[9.0, 11.0], take_profit=[11.5, 8.5])
+    assert exits["exit_index"].tolist() == [2, 2]
+    assert exits["exit_reason"].tolist() == [STOP_LOSS, STOP_LOSS]
+    assert exits["exit_price"].tolist() == [9.0, 11.0]
+
+
+def test_strategy_old_simulation_matches_loop():
+    high, low, close = _market(400, seed=8)
+    df = pd.DataFrame({"high": high, "low": low, "close": close},
+                      index=pd.date_range("2024-01-01", periods=400, freq="15min"))
+    entry, direction, stop_loss, take_profit = _trades(close, m=60, seed=9)
+    trades = [{"entry_time": df.index[e], "entry_price": close[e], "direction": "LONG" if d > 0 else "SHORT",
+               "stop_loss": sl, "take_profit": tp, "units": 1000}
+              for e, d, sl, tp in zip(entry, direction, stop_loss, take_profit)]
+
+    strategy = OldStrategy()
+    for trade, result, e, d, sl, tp in zip(trades, strategy.simulate_trades_batch(trades, df),
+                                            entry, direction, stop_loss, take_profit):
+        exit_i, exit_price, reason = loop_exit(high, low, close, e, d, sl, tp, 100)
+        assert result == strategy.simulate_trade_execution(trade, df)
+        assert result["exit_time"] == df.index[exit_i] and result["exit_price"] == exit_price
+        assert result["exit_reason"] == {STOP_LOSS: "STOP_LOSS", TAKE_PROFIT: "TAKE_PROFIT", TIME_EXIT: "TIME_EXIT"}[reason]
+
+
+if __name__ == "__main__":
+    print("🧪 TEST EXIT RESOLVER")
+    print("=" * 50)
+    test_matches_loop_without_max_bars()
+    test_matches_loop_with_max_bars()
+    test_stop_loss_wins_on_same_bar()
+    test_strategy_old_simulation_matches_loop()
+    print("✅ Sorties SL / TP / TIME_EXIT / END_OF_DATA identiques à la boucle par trade")
@@ -0,0 +1,104 @@
+"""
+Test du cache d'indicateurs (hits, invalidation par empreinte / paramètres, éviction LRU en octets)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from indicators.bollinger_bands import BollingerBands
+from indicators.cache import IndicatorCache
+from indicators.keltner_channel import KeltnerChannel
+
+
+def _ohlc(n: int = 500, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    return pd.DataFrame({"high": close + 0.4, "low": close - 0.4, "close": close},
+                        index=pd.date_range("2024-01-01", periods=n, freq="15min"))
+
+
+def test_hit_returns_same_values_without_recompute():
+    cache = IndicatorCache()
+    df = _ohlc()
+    first = BollingerBands(cache=cache).calculate(df)
+    second = BollingerBands(cache=cache).calculate(df.copy())  # même contenu, autre objet
+    assert (cache.hits, cache.misses) == (1, 1)
+    for a, b in zip(first, second):
+        pd.testing.assert_series_equal(a, b)
+
+    uncached = BollingerBands(cache=None).calculate(df)
+    for a, b in zip(second, uncached):
+        pd.testing.assert_series_equal(a, b)
+    assert cache.stats()["hit_rate"] == 50.0
+
+
+def test_hit_arrays_are_read_only():
+    cache = IndicatorCache()
+    df = _ohlc()
+    KeltnerChannel(cache=cache).calculate(df)
+    for series in KeltnerChannel(cache=cache).calculate(df):
+        assert not series.to_numpy().flags.writeable
+        try:
+            series.to_numpy()[0] = 0.0
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("un hit ne doit pas exposer de tableau modifiable")
+    # L'entrée en cache n'a pas été altérée
+    for a, b in zip(KeltnerChannel(cache=cache).calculate(df), KeltnerChannel(cache=None).calculate(df)):
+        pd.testing.assert_series_equal(a, b)
+
+
+def test_invalidation_by_fingerprint_and_params():
+    cache = IndicatorCache()
+    df = _ohlc()
+    BollingerBands(cache=cache).calculate(df)
+
+    changed = df.copy()
+    changed.iloc[250, changed.columns.get_loc("close")] += 1e-9  # une seule valeur modifiée
+    recomputed = BollingerBands(cache=cache).calculate(changed)
+    assert (cache.hits, cache.misses) == (0, 2)
+    pd.testing.assert_series_equal(recomputed[0], BollingerBands(cache=None).calculate(changed)[0])
+
+    BollingerBands(period=21, cache=cache).calculate(df)
+    BollingerBands(std_dev=2.5, cache=cache).calculate(df)
+    assert (cache.hits, cache.misses) == (0, 4)
+
+    # Même contenu mais dtype différent : empreinte différente
+    assert IndicatorCache.fingerprint(np.arange(4, dtype=np.int64)) != IndicatorCache.fingerprint(np.arange(4.0))
+    assert IndicatorCache.fingerprint(np.arange(4.0)) == IndicatorCache.fingerprint(np.arange(4.0))
+
+
+def test_lru_eviction_is_bounded_in_bytes():
+    df = _ohlc(1_000)
+    entry_bytes = 3 * 1_000 * 8  # trois séries float64
+    cache = IndicatorCache(max_bytes=2 * entry_bytes)
+    for period in (10, 20, 30):
+        BollingerBands(period=period, cache=cache).calculate(df)
+    assert cache.stats()["entries"] == 2 and cache.evictions == 1
+    assert cache.current_bytes == 2 * entry_bytes <= cache.max_bytes
+
+    # period=10 évincé (le plus ancien), period=30 toujours présent
+    BollingerBands(period=30, cache=cache).calculate(df)
+    assert cache.hits == 1
+    BollingerBands(period=10, cache=cache).calculate(df)
+    assert cache.hits == 1 and cache.evictions == 2
+
+    # Une entrée plus grosse que le budget n'est pas stockée
+    small = IndicatorCache(max_bytes=entry_bytes - 1)
+    BollingerBands(cache=small).calculate(df)
+    assert small.stats()["entries"] == 0 and small.current_bytes == 0
+
+
+if __name__ == "__main__":
+    print("🧪 TEST INDICATOR CACHE")
+    print("=" * 50)
+    test_hit_returns_same_values_without_recompute()
+    test_hit_arrays_are_read_only()
+    test_invalidation_by_fingerprint_and_params()
+    test_lru_eviction_is_bounded_in_bytes()
+    print("✅ Hits, invalidation et éviction du cache d'indicateurs conformes")
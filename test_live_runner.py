@@ -0,0 +1,63 @@
+"""
+Test de parité : LiveStrategyRunner (bougie par bougie) vs execute_trading_strategy,
+avec et sans tendance HTF
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import contextlib
+import io
+
+from core.live_runner import LiveStrategyRunner
+from test_execution_parity import MultiTradeStrategy, _frames
+
+PARAMS = [
+    {},
+    dict(killzone_start="00:00", killzone_end="23:59"),
+    dict(killzone_start="00:00", killzone_end="23:59", risk_reward_ratio=0.5, bb_std=1.5),
+]
+HTF_PARAMS = [
+    dict(htf_timeframe="1h", killzone_start="00:00", killzone_end="23:59"),
+    dict(htf_timeframe="4h", htf_ema_period=5, killzone_start="00:00", killzone_end="23:59"),
+    dict(htf_timeframe="D", killzone_start="00:00", killzone_end="23:59", bb_std=1.5, risk_reward_ratio=0.5),
+]
+
+
+def _compare(params_list):
+    total = 0
+    for name, df in _frames().items():
+        for params in params_list:
+            batch = MultiTradeStrategy(**params)
+            with contextlib.redirect_stdout(io.StringIO()):
+                expected = batch.execute_trading_strategy(batch.generate_trading_signals(df))
+
+            live = MultiTradeStrategy(**params)
+            runner = LiveStrategyRunner(live, "EURUSD")
+            events = []
+            for timestamp, bar in zip(df.index, df[["high", "low", "close"]].to_dict("records")):
+                events.extend(runner.on_bar(timestamp, bar))
+            events.extend(runner.close_all())
+
+            assert list(live.closed_trades) == expected, (name, params)
+            assert live.current_capital == batch.current_capital, (name, params)
+            assert sum(event["type"] == "OPEN" for event in events) == len(expected), (name, params)
+            total += len(expected)
+    return total
+
+
+def test_live_runner_matches_backtest():
+    assert _compare(PARAMS) > 50
+
+
+def test_live_runner_matches_backtest_with_htf():
+    assert _compare(HTF_PARAMS) > 50
+
+
+if __name__ == "__main__":
+    print("🧪 TEST LIVE RUNNER")
+    print("=" * 50)
+    test_live_runner_matches_backtest()
+    test_live_runner_matches_backtest_with_htf()
+    print("✅ Trades bougie par bougie identiques au backtest (avec et sans HTF)")
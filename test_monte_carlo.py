@@ -0,0 +1,65 @@
+"""
+Test du Monte Carlo vectorisé vs calcul du drawdown de generate_money_management_report
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from core.monte_carlo import simulate_trade_sequences, monte_carlo_report
+
+
+def _reference(pnl_path, initial_capital):
+    """Boucle du rapport money management sur un ordre de trades"""
+    capital_history = [initial_capital]
+    for pnl in pnl_path:
+        capital_history.append(capital_history[-1] + pnl)
+    peak = capital_history[0]
+    max_drawdown = 0
+    for capital in capital_history:
+        if capital > peak:
+            peak = capital
+        max_drawdown = max(max_drawdown, (peak - capital) / peak * 100)
+    return capital_history[-1], max_drawdown, min(capital_history)
+
+
+def test_bootstrap_matches_reference_loop():
+    pnl = np.random.default_rng(0).normal(50, 900, 200)
+    sims = simulate_trade_sequences(pnl, initial_capital=100000, n_paths=300, seed=7, max_cells=10_000)
+
+    # Même tirage que le simulateur (blocs successifs sur le même générateur)
+    rng = np.random.default_rng(7)
+    chunk = 10_000 // len(pnl)
+    idx = np.vstack([rng.integers(0, len(pnl), size=(min(chunk, 300 - s), len(pnl))) for s in range(0, 300, chunk)])
+
+    for path, row in enumerate(idx):
+        final, max_dd, min_cap = _reference(pnl[row], 100000)
+        assert np.isclose(sims["final_capital"][path], final, rtol=1e-12)
+        assert np.isclose(sims["max_drawdown"][path], max_dd, rtol=1e-9, atol=1e-9)
+        assert np.isclose(sims["min_capital"][path], min_cap, rtol=1e-12)
+
+
+def test_permute_keeps_final_capital():
+    pnl = np.random.default_rng(1).normal(0, 500, 100)
+    sims = simulate_trade_sequences(pnl, n_paths=1000, method="permute", seed=3, max_cells=7_000)
+    np.testing.assert_allclose(sims["final_capital"], 100000 + pnl.sum(), rtol=1e-12)
+    assert sims["max_drawdown"].std() > 0
+
+
+def test_report_from_closed_trades():
+    trades = [{"pnl": p} for p in (1000, -500, -500, 2000, -1500)]
+    report = monte_carlo_report(trades, n_paths=2000, seed=0, ruin_level=0.01)
+    assert report["trades_per_path"] == 5
+    assert 0 < report["risk_of_ruin"] < 100
+    assert report["final_capital"]["p5"] <= report["final_capital"]["p95"]
+
+
+if __name__ == "__main__":
+    print("🧪 TEST MONTE CARLO")
+    print("=" * 50)
+    test_bootstrap_matches_reference_loop()
+    test_permute_keeps_final_capital()
+    test_report_from_closed_trades()
+    print("✅ Monte Carlo conforme au calcul du rapport")
@@ -0,0 +1,61 @@
+"""
+Test du lecteur CSV MT5 typé (parité avec la lecture générique, usecols, blocs)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import tempfile
+
+import pandas as pd
+
+from utils.file_manager import FileManager
+from utils.mt5_csv import PRICE_COLUMNS, is_mt5_layout, iter_mt5_csv, read_mt5_csv
+from utils.synthetic_data import write_symbols
+
+
+def test_typed_reader_matches_generic_loader():
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_symbols(["SYNTH"], 4_000, data_dir, seed=9)
+        path = os.path.join(data_dir, "SYNTH.csv")
+        generic = FileManager(data_dir=data_dir, cache=None)._parse_generic(path)
+        typed = read_mt5_csv(path)
+
+        assert is_mt5_layout(path)
+        assert list(typed.columns) == list(generic.columns)
+        assert typed.index.equals(generic.index) and typed.index.dtype == generic.index.dtype
+        assert typed.index.name == "datetime"
+        numeric = [c for c in typed.columns if c not in ("date", "time")]
+        pd.testing.assert_frame_equal(typed[numeric], generic[numeric])
+        assert (typed["time"].astype(str).to_numpy() == generic["time"].to_numpy()).all()
+
+        ohlc = read_mt5_csv(path, usecols=PRICE_COLUMNS)
+        assert list(ohlc.columns) == PRICE_COLUMNS
+        chunks = list(iter_mt5_csv(path, chunksize=1_500, usecols=PRICE_COLUMNS))
+        assert [len(c) for c in chunks] == [1_500, 1_500, 1_000]
+        pd.testing.assert_frame_equal(pd.concat(chunks), ohlc)
+
+
+def test_invalid_rows_fall_back_to_generic_loader():
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_symbols(["SYNTH"], 500, data_dir, seed=9)
+        path = os.path.join(data_dir, "SYNTH.csv")
+        with open(path) as f:
+            lines = f.readlines()
+        fields = lines[10].split("\t")
+        fields[3] = "2O62.5"  # <HIGH> illisible (lettre O)
+        lines[10] = "\t".join(fields)
+        with open(path, "w") as f:
+            f.writelines(lines)
+
+        df = FileManager(data_dir=data_dir, cache=None).load_csv("SYNTH")
+        assert len(df) == 499 and df["high"].dtype == "float64"
+
+
+if __name__ == "__main__":
+    print("🧪 TEST MT5 CSV")
+    print("=" * 50)
+    test_typed_reader_matches_generic_loader()
+    test_invalid_rows_fall_back_to_generic_loader()
+    print("✅ Lecture typée identique à la lecture générique")
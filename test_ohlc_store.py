@@ -0,0 +1,54 @@
+"""
+Test du store OHLC memmap (plages de dates sans copie)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from utils.file_manager import FileManager
+from utils.synthetic_data import write_symbols
+
+
+def test_range_matches_csv_and_is_zero_copy():
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_symbols(["SYNTH"], 5_000, data_dir, seed=11)
+        fm = FileManager(data_dir=data_dir, cache=None)
+        full = fm.load_csv("SYNTH")
+        start, end = full.index[1_200], full.index[3_400]
+
+        window = fm.load_range("SYNTH", start, end)
+        expected = full.loc[start:end, window.columns]
+        assert window.equals(expected) and window.index.dtype == full.index.dtype
+        assert window.index[0] == start and window.index[-1] == end
+
+        arrays = fm.store.open("SYNTH")
+        assert np.shares_memory(window["close"].to_numpy(), arrays["close"])
+        assert isinstance(arrays["close"], np.memmap)
+
+        # Bornes hors données et plage vide
+        assert len(fm.load_range("SYNTH")) == len(full)
+        assert len(fm.load_range("SYNTH", end=full.index[0] - pd.Timedelta("1D"))) == 0
+
+
+def test_store_is_rebuilt_when_csv_changes():
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_symbols(["SYNTH"], 2_000, data_dir, seed=11)
+        fm = FileManager(data_dir=data_dir, cache=None)
+        assert len(fm.load_range("SYNTH")) == 2_000
+
+        write_symbols(["SYNTH"], 2_500, data_dir, seed=11)
+        assert len(fm.load_range("SYNTH")) == 2_500
+
+
+if __name__ == "__main__":
+    print("🧪 TEST OHLC STORE")
+    print("=" * 50)
+    test_range_matches_csv_and_is_zero_copy()
+    test_store_is_rebuilt_when_csv_changes()
+    print("✅ Plages memmap identiques au CSV, sans copie")
@@ -0,0 +1,68 @@
+"""
+Test du balayage de paramètres (colonnes partagées vs backtest direct, paramètres Optional)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+
+from core.backtest_worker import ColumnCache, flatten_report
+from core.parameter_sweep import SWEEPABLE_PARAMS, parse_grid, run_parameter_sweep
+from core.strategy import BBKeltnerStrategy
+from utils.file_manager import FileManager
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def test_optional_parameters_are_sweepable():
+    assert {"htf_timeframe", "broker_tz", "bb_period", "killzone_start"} <= set(SWEEPABLE_PARAMS)
+    assert not {"resampler", "session_calendar", "indicator_cache", "event_log"} & set(SWEEPABLE_PARAMS)
+    assert parse_grid(["htf_timeframe=None,1h", "bb_std=1.5,2"]) == {"htf_timeframe": [None, "1h"], "bb_std": [1.5, 2]}
+
+
+def test_each_row_matches_direct_backtest():
+    grid = {"bb_period": [14, 20], "risk_reward_ratio": [1.5, 2.5], "htf_timeframe": [None, "1h"],
+            "killzone_start": ["02:00"], "killzone_end": ["10:00"]}
+    with contextlib.redirect_stdout(io.StringIO()):
+        table = run_parameter_sweep(grid, ["XAUUSD", "EURUSD"], data_dir=DATA_DIR, max_workers=1)
+        frames = {symbol: FileManager(data_dir=DATA_DIR).load_csv(symbol) for symbol in ("XAUUSD", "EURUSD")}
+
+    assert len(table) == 8 * 2
+    for row in table.to_dict("records"):
+        params = {name: row[name] for name in grid}
+        params["htf_timeframe"] = params["htf_timeframe"] if isinstance(params["htf_timeframe"], str) else None
+        strategy = BBKeltnerStrategy(**params)
+        strategy.execute_trading_strategy(strategy.generate_trading_signals(frames[row["symbol"]]))
+        expected = flatten_report(strategy.generate_money_management_report(row["symbol"]))
+        for name, value in expected.items():
+            assert row[name] == value or (pd.isna(row[name]) and pd.isna(value)), (params, name)
+
+
+def test_column_cache_is_bounded():
+    cache = ColumnCache(max_bytes=3 * 8_000)
+    for k in range(5):
+        cache.get(("XAUUSD", "bb", k), lambda: {"bb_middle": np.zeros(1_000)})
+    assert len(cache) == 3 and cache.evictions == 2 and cache.current_bytes == 24_000
+
+    # Un accès rafraîchit l'entrée : c'est la plus ancienne restante qui est évincée
+    calls = []
+    cache.get(("XAUUSD", "bb", 2), lambda: calls.append(2) or {})
+    cache.get(("XAUUSD", "bb", 5), lambda: {"bb_middle": np.zeros(1_000)})
+    assert not calls
+    cache.get(("XAUUSD", "bb", 3), lambda: calls.append(3) or {"bb_middle": np.zeros(1_000)})
+    assert calls == [3]
+
+
+if __name__ == "__main__":
+    print("🧪 TEST PARAMETER SWEEP")
+    print("=" * 50)
+    test_optional_parameters_are_sweepable()
+    test_each_row_matches_direct_backtest()
+    test_column_cache_is_bounded()
+    print("✅ Chaque ligne du balayage égale un backtest direct")
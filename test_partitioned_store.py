@@ -0,0 +1,106 @@
+"""
+Test du store partitionné symbole / année / mois (append incrémental, lectures par plage)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import contextlib
+import io
+import tempfile
+
+import pandas as pd
+
+from utils.file_manager import FileManager
+from utils.synthetic_data import write_symbols
+
+
+def test_append_dedupes_and_rewrites_only_touched_partitions():
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_symbols(["SYNTH"], 12_000, data_dir, seed=4)  # bougies 15 min sur ~6 mois
+        fm = FileManager(data_dir=data_dir, cache=None)
+        full = fm.load_csv("SYNTH")
+        store = fm.partitions
+
+        first = store.append("SYNTH", full.iloc[:10_000])
+        assert first["new_rows"] == 10_000 and len(store.partitions("SYNTH")) == len(first["partitions_written"])
+
+        # Rafraîchissement avec recouvrement : seules les partitions de queue sont réécrites
+        update = store.append("SYNTH", full.iloc[9_500:])
+        assert update["new_rows"] == 2_000
+        months = {(t.year, t.month) for t in full.index[9_500:]}
+        assert len(update["partitions_written"]) == len(months) < len(store.partitions("SYNTH"))
+
+        stored = store.read("SYNTH")
+        assert stored.index.is_unique and stored.index.is_monotonic_increasing
+        pd.testing.assert_frame_equal(stored, full)
+        assert store.last_timestamp("SYNTH") == full.index[-1]
+
+
+def test_range_reads_only_overlapping_partitions():
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_symbols(["SYNTH"], 12_000, data_dir, seed=4)
+        fm = FileManager(data_dir=data_dir, cache=None)
+        full = fm.load_csv("SYNTH")
+        fm.partitions.append("SYNTH", full)
+
+        month = full.index[5_000]
+        start = pd.Timestamp(year=month.year, month=month.month, day=3)
+        end = start + pd.Timedelta("10D")
+        window = fm.load_partitioned("SYNTH", start, end)
+        assert len(fm.partitions.last_read) == 1
+        pd.testing.assert_frame_equal(window, full.loc[start:end])
+
+
+def test_refresh_reads_and_writes_only_tail_partition():
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_symbols(["SYNTH"], 12_000, data_dir, seed=4)
+        fm = FileManager(data_dir=data_dir, cache=None)
+        full = fm.load_csv("SYNTH")
+        store = fm.partitions
+        store.append("SYNTH", full.iloc[:11_900])
+
+        # Lectures tracées : mise à jour comme backtest_data.py (dernière bougie puis append)
+        read = []
+        original = store._read_partition
+        store._read_partition = lambda path: read.append(path) or original(path)
+        last = store.last_timestamp("SYNTH")
+        update = store.append("SYNTH", full.loc[last:])
+
+        tail = store._path("SYNTH", full.index[-1].year, full.index[-1].month)
+        assert full.index[11_899].month == full.index[-1].month  # nouvelles bougies dans le mois de queue
+        assert update["new_rows"] == 100 and update["partitions_written"] == [tail]
+        assert set(read) == {tail} and len(store.partitions("SYNTH")) > 1
+        store._read_partition = original
+        pd.testing.assert_frame_equal(store.read("SYNTH"), full)
+
+
+def test_load_period_sources():
+    with tempfile.TemporaryDirectory() as data_dir, contextlib.redirect_stdout(io.StringIO()):
+        write_symbols(["SYNTH"], 6_000, data_dir, seed=4)
+        fm = FileManager(data_dir=data_dir, cache=None)
+        full = fm.load_csv("SYNTH")
+        start, end = full.index[1_000], full.index[2_500]
+
+        # Sans partitions : plage lue dans le store du CSV ; sans bornes : CSV complet
+        ranged = fm.load_period("SYNTH", start, end)  # colonnes numériques du store memmap
+        assert ranged.equals(full.loc[start:end, ranged.columns])
+        pd.testing.assert_frame_equal(fm.load_period("SYNTH"), full)
+
+        # Partitions présentes (backtest_data.py) : elles font foi, avec ou sans période
+        fm.partitions.append("SYNTH", full.iloc[:2_000])
+        window = fm.load_period("SYNTH", start, end)
+        assert fm.partitions.last_read and window.index[-1] == full.index[1_999]
+        pd.testing.assert_frame_equal(window, full.iloc[1_000:2_000])
+        pd.testing.assert_frame_equal(fm.load_period("SYNTH"), full.iloc[:2_000])
+
+
+if __name__ == "__main__":
+    print("🧪 TEST PARTITIONED STORE")
+    print("=" * 50)
+    test_append_dedupes_and_rewrites_only_touched_partitions()
+    test_range_reads_only_overlapping_partitions()
+    test_refresh_reads_and_writes_only_tail_partition()
+    test_load_period_sources()
+    print("✅ Partitions mensuelles incrémentales, lectures ciblées, rafraîchissement sur la queue")
@@ -0,0 +1,155 @@
+"""
+Test du backtest multi-symboles à capital partagé
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import contextlib
+import io
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from core.portfolio import PortfolioBacktester
+from utils.file_manager import FileManager
+from utils.synthetic_data import write_symbols
+
+
+def _data():
+    """
+    Série synthétique dimensionnée comme le forex (pip 0.0001) : risque réel entre 0.3% et 1.5%
+    par trade, et copies décalées pour des signaux simultanés sur plusieurs symboles
+    """
+    with tempfile.TemporaryDirectory() as data_dir, contextlib.redirect_stdout(io.StringIO()):
+        write_symbols(["FX"], 6_000, data_dir, seed=31, start_price=100.0, annual_volatility=0.25,
+                      digits=3, volatility_clustering=True)
+        fx = FileManager(data_dir=data_dir, cache=None).load_csv("FX")
+    data = {}
+    for k in range(4):
+        shifted = fx.copy()
+        shifted[["open", "high", "low", "close"]] *= 1 + k * 0.0005
+        data[f"FX{k}"] = shifted
+    return data
+
+
+def _max_concurrent(trades):
+    events = sorted([(t["entry_time"], 1) for t in trades] + [(t["exit_time"], -1) for t in trades],
+                    key=lambda e: (e[0], e[1]))
+    return max(np.cumsum([e[1] for e in events]), default=0)
+
+
+def test_merge_is_time_ordered():
+    times = pd.date_range("2024-01-01", periods=6, freq="15min").values
+    tables = {
+        "A": {c: np.arange(3) for c in ("entry_price", "direction", "stop_loss", "phase",
+                                        "exit_time", "exit_price", "exit_reason")},
+        "B": {c: np.arange(3) for c in ("entry_price", "direction", "stop_loss", "phase",
+                                        "exit_time", "exit_price", "exit_reason")},
+    }
+    tables["A"]["time"] = times[[0, 2, 4]]
+    tables["B"]["time"] = times[[0, 1, 5]]
+    merged = PortfolioBacktester.merge_candidates(tables)
+    assert (np.diff(merged["time"].astype("int64")) >= 0).all()
+    assert merged["symbol_id"].tolist() == [0, 1, 1, 0, 0, 1]
+
+
+def test_shared_capital_and_limits():
+    backtester = PortfolioBacktester(max_open_positions=2)
+    trades = backtester.run(_data())
+    report = backtester.generate_report()
+
+    assert len(trades) > 0
+    assert _max_concurrent(trades) == 2
+    for symbol in report["by_symbol"]:
+        symbol_trades = [t for t in trades if t["symbol"] == symbol]
+        assert _max_concurrent(symbol_trades) <= 1
+    np.testing.assert_allclose(backtester.strategy.current_capital,
+                               backtester.strategy.initial_capital + sum(t["pnl"] for t in trades), atol=0.05)
+    assert report["exposure"]["rejected_entries"].get("portfolio_position_limit", 0) > 0
+
+
+def test_open_risk_stays_under_cap():
+    backtester = PortfolioBacktester(max_open_positions=10, max_total_risk_percent=2.0)
+    trades = list(backtester.run(_data()))
+    report = backtester.generate_report()
+    assert _max_concurrent(trades) >= 2
+    assert report["exposure"]["rejected_entries"].get("portfolio_risk_limit", 0) > 0
+    assert report["exposure"]["max_open_risk_percent"] <= 2.0
+
+    # Recalcul indépendant depuis le ledger : à chaque entrée, somme des |entrée - SL| x units
+    # des positions ouvertes <= capital (PnL des trades déjà sortis) x plafond
+    initial = backtester.strategy.initial_capital
+    for trade in trades:
+        t = trade["entry_time"]
+        capital = initial + sum(other["pnl"] for other in trades if other["exit_time"] <= t)
+        open_risk = sum(abs(other["entry_price"] - other["stop_loss"]) * other["units"]
+                        for other in trades if other["entry_time"] <= t < other["exit_time"])
+        assert open_risk <= capital * 2.0 / 100 + 1e-6, (t, open_risk, capital)
+
+
+class _TableBacktester(PortfolioBacktester):
+    """Candidats fournis directement (un par symbole, tous à la même bougie)"""
+
+    def __init__(self, candidates, **kwargs):
+        super().__init__(**kwargs)
+        self.candidates = candidates
+
+    def candidate_table(self, symbol, df):
+        entry_price, stop_loss = self.candidates[symbol]
+        return {
+            "time": df.index.values[:1], "entry_price": np.array([entry_price]),
+            "direction": np.array(["LONG"]), "stop_loss": np.array([stop_loss]),
+            "phase": np.array(["EXPANSION"]), "exit_time": df.index.values[-1:],
+            "exit_price": np.array([entry_price]), "exit_reason": np.array(["END_OF_DATA"]),
+        }
+
+
+def test_candidate_breaking_cap_is_rejected():
+    index = pd.date_range("2024-01-01", periods=4, freq="15min")
+    flat = pd.DataFrame({"high": 1.0, "low": 1.0, "close": 1.0}, index=index)
+
+    # Forex : 500 pips, 1 lot -> 500€ de perte au SL (0.5%) ; trois positions = 1.5% > 1.2%
+    candidates = {f"FX{k}": (1.1000, 1.0500) for k in range(3)}
+    backtester = _TableBacktester(candidates, max_open_positions=5, max_total_risk_percent=1.2)
+    trades = backtester.run({symbol: flat for symbol in candidates})
+    assert [t["symbol"] for t in trades] == ["FX0", "FX1"]
+    assert backtester.rejections == {"portfolio_risk_limit": 1}
+
+    # Or : 1 lot de 100 onces, 10$ x 100 unités = 1000€ au SL, le risk_amount (1%)
+    position = PortfolioBacktester().strategy.calculate_position_size(2000.0, 1990.0, "XAUUSD")
+    assert position["units"] == 100 and position["risk_amount"] == 10.0 * position["units"] == 1000.0
+    backtester = _TableBacktester({"XAUUSD": (2000.0, 1990.0), "XAUEUR": (2000.0, 1990.0),
+                                   "XAUGBP": (2000.0, 1990.0)}, max_total_risk_percent=2.5)
+    trades = backtester.run({symbol: flat for symbol in backtester.candidates})
+    assert len(trades) == 2 and backtester.rejections == {"portfolio_risk_limit": 1}
+
+
+def test_bundled_data_opens_trades():
+    """CSV fournis (data/) : les entrées XAUUSD passent le plafond de risque par défaut"""
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+    with contextlib.redirect_stdout(io.StringIO()):
+        fm = FileManager(data_dir=data_dir)
+        data = {symbol: fm.load_csv(symbol) for symbol in ("XAUUSD", "EURUSD")}
+    backtester = PortfolioBacktester()
+    trades = backtester.run(data)
+    report = backtester.generate_report()
+
+    assert "error" not in report and report["by_symbol"]["XAUUSD"]["total_trades"] > 0
+    assert "portfolio_risk_limit" not in report["exposure"]["rejected_entries"]
+    for trade in trades:
+        # Risque du dimensionnement = perte réelle au stop loss
+        np.testing.assert_allclose(backtester.position_risk(trade), trade["risk_amount"], rtol=0.01)
+
+
+if __name__ == "__main__":
+    print("🧪 TEST PORTEFEUILLE")
+    print("=" * 50)
+    test_merge_is_time_ordered()
+    test_shared_capital_and_limits()
+    test_open_risk_stays_under_cap()
+    test_candidate_breaking_cap_is_rejected()
+    test_bundled_data_opens_trades()
+    print("✅ Fusion chronologique, limites d'exposition et plafond de risque respectés")
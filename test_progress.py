@@ -0,0 +1,48 @@
+"""
+Test du rendu de progression (file d'événements, cadence limitée, mode ligne hors TTY)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import io
+import threading
+
+from utils.progress import ProgressRenderer
+
+
+def test_plain_lines_when_not_a_tty():
+    stream = io.StringIO()
+    with ProgressRenderer(stream=stream) as renderer:
+        renderer.push("XAUUSD", "Ouverture fichier", "Recherche XAUUSD.csv")
+        renderer.push("XAUUSD", "✅ Analyse terminée", "Trades: 3")
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 2
+    assert lines[1].endswith("XAUUSD: ✅ Analyse terminée | Trades: 3")
+    assert "\x1b" not in stream.getvalue()
+
+
+def test_frame_rate_is_capped():
+    stream = io.StringIO()
+    renderer = ProgressRenderer(stream=stream, interactive=True, max_fps=5)
+    workers = [threading.Thread(target=lambda i=i: [renderer.push(f"SYM{i}", "Étape", str(k)) for k in range(500)])
+               for i in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    renderer.stop()
+
+    assert renderer.frames <= 3  # 4 000 événements, quelques cadres seulement
+    assert len(renderer.state) == 8
+    assert all(entry["details"] == "499" for entry in renderer.state.values())
+    assert stream.getvalue().count("\x1b[2J") == renderer.frames
+
+
+if __name__ == "__main__":
+    print("🧪 TEST PROGRESS")
+    print("=" * 50)
+    test_plain_lines_when_not_a_tty()
+    test_frame_rate_is_capped()
+    print("✅ Rendu de progression limité et non bloquant")
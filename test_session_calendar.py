@@ -0,0 +1,94 @@
+"""
+Test du calendrier de sessions (masques vectorisés, fuseaux / DST, stats par session)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import time
+
+import numpy as np
+import pandas as pd
+
+from core.session_calendar import SessionCalendar
+from core.strategy import BBKeltnerStrategy
+from core.trade_ledger import TradeLedger
+
+
+def test_masks_match_time_comparison():
+    index = pd.date_range("2024-01-01", periods=5000, freq="7min", name="datetime")
+    calendar = SessionCalendar({"killzone": ("03:00", "06:30"), "overnight": ("22:00", "02:15")})
+    masks = calendar.masks(index)
+    expected = np.array([time(3, 0) <= t.time() <= time(6, 30) for t in index])
+    overnight = np.array([t.time() >= time(22, 0) or t.time() <= time(2, 15) for t in index])
+    assert (masks["killzone"] == expected).all()
+    assert (masks["overnight"] == overnight).all()
+    assert calendar.masks(index) is masks and calendar.hits == 1
+    assert all(calendar.contains(t, "killzone") == e for t, e in zip(index[:300], expected[:300]))
+
+
+def test_session_follows_dst():
+    # Broker en UTC : Londres 08:00 = 08:00 UTC en hiver, 07:00 UTC en été
+    calendar = SessionCalendar({"London": ("08:00", "17:00", "Europe/London")}, broker_tz="UTC")
+    index = pd.DatetimeIndex(["2024-01-15 07:30", "2024-01-15 08:00", "2024-07-15 07:00", "2024-07-15 16:30"])
+    assert calendar.mask(index, "London").tolist() == [False, True, True, False]
+    assert calendar.contains(pd.Timestamp("2024-07-15 07:00"), "London")
+
+
+def test_trade_stats_per_session():
+    calendar = SessionCalendar({"Asia": ("00:00", "07:59"), "London": ("08:00", "16:00")})
+    ledger = TradeLedger.from_records([
+        {"entry_time": pd.Timestamp("2024-01-02 03:00"), "pnl": 100.0},
+        {"entry_time": pd.Timestamp("2024-01-02 05:00"), "pnl": -50.0},
+        {"entry_time": pd.Timestamp("2024-01-02 09:00"), "pnl": 30.0},
+    ])
+    stats = calendar.trade_stats(ledger)
+    assert stats["Asia"] == {"total_trades": 2, "win_rate": 50.0, "total_pnl": 50.0, "avg_pnl": 25.0}
+    assert stats["London"]["total_trades"] == 1
+
+
+def test_wrap_midnight_is_opt_in_for_killzone():
+    index = pd.date_range("2024-01-01", periods=400, freq="15min")
+    overnight = np.array([t.time() >= time(22, 0) or t.time() <= time(2, 0) for t in index])
+
+    # Calendrier : à cheval sur minuit par défaut, jamais actif avec wrap_midnight=False
+    assert (SessionCalendar({"night": ("22:00", "02:00")}).mask(index, "night") == overnight).all()
+    strict = SessionCalendar({"night": ("22:00", "02:00")}, wrap_midnight=False)
+    assert not strict.mask(index, "night").any() and not strict.contains(index[0], "night")
+
+    # Killzone de la stratégie : ancien comportement (start > end ne correspond à rien) sauf opt-in
+    assert not BBKeltnerStrategy(killzone_start="22:00", killzone_end="02:00").killzone_mask(index).any()
+    wrapping = BBKeltnerStrategy(killzone_start="22:00", killzone_end="02:00", killzone_wraps_midnight=True)
+    assert (wrapping.killzone_mask(index) == overnight).all()
+    assert wrapping.in_killzone(pd.Timestamp("2024-01-01 23:00"))
+
+
+def test_broker_tz_is_explicit_in_settings():
+    settings = SessionCalendar().settings()
+    assert settings["broker_tz"] == "UTC" and settings["broker_tz_assumed"]
+    assert settings["sessions"]["London"] == {"start": "08:00", "end": "17:00", "tz": "Europe/London"}
+
+    athens = SessionCalendar({"killzone": ("03:00", "06:30")}, broker_tz="Europe/Athens").settings()
+    assert athens["broker_tz"] == "Europe/Athens" and not athens["broker_tz_assumed"]
+    assert athens["sessions"]["killzone"]["tz"] == "Europe/Athens"
+
+    strategy = BBKeltnerStrategy()
+    strategy.closed_trades = TradeLedger.from_records([
+        {"entry_time": pd.Timestamp("2024-01-02 03:00"), "pnl": 100.0, "risk_amount": 10.0},
+    ])
+    report = strategy.generate_money_management_report("XAUUSD")
+    assert report["session_settings"]["broker_tz"] == "UTC" and report["session_settings"]["broker_tz_assumed"]
+    assert report["session_settings"]["killzone"] == {"start": "03:00", "end": "06:30", "tz": "UTC"}
+    assert report["session_settings"]["killzone_wraps_midnight"] is False
+
+
+if __name__ == "__main__":
+    print("🧪 TEST SESSION CALENDAR")
+    print("=" * 50)
+    test_masks_match_time_comparison()
+    test_session_follows_dst()
+    test_trade_stats_per_session()
+    test_wrap_midnight_is_opt_in_for_killzone()
+    test_broker_tz_is_explicit_in_settings()
+    print("✅ Masques de sessions conformes (DST inclus)")
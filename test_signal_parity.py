@@ -0,0 +1,74 @@
+"""
+Test de parité : génération vectorisée des signaux vs boucles d'origine
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import contextlib
+import io
+
+import pandas as pd
+
+from core.strategy import BBKeltnerStrategy
+from utils.file_manager import FileManager
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SYMBOLS = ["XAUUSD", "EURUSD"]
+
+
+def legacy_signal_columns(strategy: BBKeltnerStrategy, df: pd.DataFrame) -> pd.DataFrame:
+    """Recalcule phase / raw_signal / signal avec les boucles .iloc historiques"""
+    df = df.copy()
+
+    df["phase"] = "EXPANSION"
+    for i in range(len(df)):
+        if strategy.is_bb_inside_kc(df['bb_upper'].iloc[i], df['bb_lower'].iloc[i],
+                                    df['kc_upper'].iloc[i], df['kc_lower'].iloc[i]):
+            df.iloc[i, df.columns.get_loc('phase')] = "CONTRACTION"
+
+    df["raw_signal"] = 0
+    for i in range(50, len(df)):
+        if (df["close"].iloc[i] > df["bb_upper"].iloc[i] and
+                df["ema_20"].iloc[i] > df["ema_50"].iloc[i]):
+            df.iloc[i, df.columns.get_loc('raw_signal')] = 1
+        elif (df["close"].iloc[i] < df["bb_lower"].iloc[i] and
+                df["ema_20"].iloc[i] < df["ema_50"].iloc[i]):
+            df.iloc[i, df.columns.get_loc('raw_signal')] = -1
+
+    df["in_killzone"] = df.index.map(strategy.in_killzone)
+    df["signal"] = 0
+    for i in range(len(df)):
+        if df["in_killzone"].iloc[i]:
+            df.iloc[i, df.columns.get_loc('signal')] = df["raw_signal"].iloc[i]
+
+    return df
+
+
+def _signals(symbol: str):
+    strategy = BBKeltnerStrategy()
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = FileManager(data_dir=DATA_DIR).load_csv(symbol)
+        vectorized = strategy.generate_trading_signals(df)
+    legacy = legacy_signal_columns(strategy, vectorized.drop(columns=["phase", "raw_signal", "in_killzone", "signal"]))
+    return vectorized, legacy
+
+
+def test_signal_parity_xauusd():
+    vectorized, legacy = _signals("XAUUSD")
+    pd.testing.assert_frame_equal(vectorized, legacy, check_exact=True)
+
+
+def test_signal_parity_eurusd():
+    vectorized, legacy = _signals("EURUSD")
+    pd.testing.assert_frame_equal(vectorized, legacy, check_exact=True)
+
+
+if __name__ == "__main__":
+    print("🧪 TEST DE PARITÉ DES SIGNAUX")
+    print("=" * 50)
+    for symbol in SYMBOLS:
+        vectorized, legacy = _signals(symbol)
+        pd.testing.assert_frame_equal(vectorized, legacy, check_exact=True)
+        print(f"✅ {symbol}: {len(vectorized)} bougies, {int((vectorized['signal'] != 0).sum())} signaux identiques")
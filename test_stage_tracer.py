@@ -0,0 +1,45 @@
+"""
+Test du traçage des étapes (temps réel / CPU / pic mémoire, résumé du run)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import time
+
+import numpy as np
+
+from utils.stage_tracer import StageTracer
+
+
+def test_stages_are_recorded_per_symbol():
+    tracer = StageTracer(memory=True)
+    tracer.start()
+    try:
+        for symbol in ("XAUUSD", "EURUSD"):
+            with tracer.stage(symbol, "load"):
+                time.sleep(0.01)
+            with tracer.stage(symbol, "indicators"):
+                block = np.ones(4 * 2**20 // 8)  # ~4 MB
+                del block
+    finally:
+        tracer.stop()
+
+    timings = tracer.for_symbol("XAUUSD")
+    assert list(timings["stages"]) == ["load", "indicators"]
+    assert timings["stages"]["load"]["wall_seconds"] >= 0.01
+    assert timings["stages"]["load"]["cpu_seconds"] < timings["stages"]["load"]["wall_seconds"]
+    assert timings["stages"]["indicators"]["peak_memory_mb"] >= 3.9
+
+    summary = tracer.summary()
+    assert summary["symbols"] == 2
+    assert summary["dominant_stage"] == "load"
+    assert round(sum(s["share_percent"] for s in summary["stages"].values())) == 100
+
+
+if __name__ == "__main__":
+    print("🧪 TEST STAGE TRACER")
+    print("=" * 50)
+    test_stages_are_recorded_per_symbol()
+    print("✅ Étapes tracées (temps, CPU, mémoire)")
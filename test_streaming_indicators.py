@@ -0,0 +1,57 @@
+"""
+Test du mode streaming (update) des indicateurs vs calcul batch (calculate)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import contextlib
+import io
+
+import numpy as np
+
+from indicators.bollinger_bands import BollingerBands
+from indicators.keltner_channel import KeltnerChannel
+from utils.file_manager import FileManager
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def _load(symbol: str):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return FileManager(data_dir=DATA_DIR).load_csv(symbol)
+
+
+def _compare(symbol: str):
+    df = _load(symbol)
+    bb = BollingerBands(cache=None)
+    kc = KeltnerChannel(cache=None)
+
+    batch_bb = np.column_stack(bb.calculate(df))
+    batch_kc = np.column_stack(kc.calculate(df))
+
+    bars = df[["high", "low", "close"]].to_dict("records")
+    stream_bb = np.array([bb.update(bar) for bar in bars])
+    stream_kc = np.array([kc.update(bar) for bar in bars])
+
+    np.testing.assert_array_equal(np.isnan(stream_bb), np.isnan(batch_bb))
+    np.testing.assert_array_equal(np.isnan(stream_kc), np.isnan(batch_kc))
+    np.testing.assert_allclose(stream_bb, batch_bb, rtol=1e-9)
+    np.testing.assert_allclose(stream_kc, batch_kc, rtol=1e-9)
+    return len(df)
+
+
+def test_streaming_matches_batch_xauusd():
+    _compare("XAUUSD")
+
+
+def test_streaming_matches_batch_eurusd():
+    _compare("EURUSD")
+
+
+if __name__ == "__main__":
+    print("🧪 TEST STREAMING vs BATCH")
+    print("=" * 50)
+    for symbol in ["XAUUSD", "EURUSD"]:
+        print(f"✅ {symbol}: {_compare(symbol)} bougies identiques (tolérance 1e-9)")
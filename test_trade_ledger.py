@@ -0,0 +1,114 @@
+"""
+Test du ledger de trades en colonnes (équivalence avec les listes de dicts)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from core.trade_ledger import TradeLedger
+
+
+def _trades(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2024-01-02 03:00")
+    trades = []
+    for i in range(n):
+        trade = {
+            "entry_time": start + pd.Timedelta(minutes=15 * i),
+            "entry_price": round(float(2000 + rng.normal()), 5),
+            "direction": "LONG" if i % 3 else "SHORT",
+            "stop_loss": np.float64(1995.12345),
+            "units": int(rng.integers(100, 10000)),
+            "risk_amount": round(float(rng.uniform(300, 1500)), 2),
+            "phase": "CONTRACTION" if i % 2 else "EXPANSION",
+            "status": "OPEN",
+        }
+        pnl = round(float(rng.normal(0, 800)), 2)
+        trades.append((trade, {"exit_time": trade["entry_time"] + pd.Timedelta(hours=1),
+                               "exit_reason": "TAKE_PROFIT" if pnl > 0 else "STOP_LOSS",
+                               "pnl": pnl, "status": "CLOSED"}))
+    return trades
+
+
+def test_records_round_trip():
+    ledger = TradeLedger(batch_size=7)
+    expected = []
+    for trade, fields in _trades(50):
+        ledger.append(trade, **fields)
+        expected.append({**trade, **fields})
+
+    assert len(ledger) == 50
+    assert ledger == expected
+    assert list(ledger[-1]) == list(expected[-1])  # ordre des clés conservé
+    assert ledger[3:6] == expected[3:6]
+    assert pickle.loads(pickle.dumps(ledger)) == expected
+    assert ledger.to_frame()["pnl"].tolist() == [t["pnl"] for t in expected]
+
+
+def test_stats_match_report_loops():
+    ledger = TradeLedger()
+    records = [{**trade, **fields} for trade, fields in _trades(300, seed=1)]
+    ledger.extend(records)
+    stats = ledger.stats(100000)
+
+    pnl = [t["pnl"] for t in records]
+    capital_history = [100000]
+    for value in pnl:
+        capital_history.append(capital_history[-1] + value)
+    peak, max_drawdown = capital_history[0], 0
+    for capital in capital_history:
+        peak = max(peak, capital)
+        max_drawdown = max(max_drawdown, (peak - capital) / peak * 100)
+
+    assert stats["total_pnl"] == sum(pnl)
+    assert stats["winning_trades"] == len([p for p in pnl if p > 0])
+    assert stats["avg_loss"] == np.mean([p for p in pnl if p < 0])
+    assert stats["total_risk"] == sum(t["risk_amount"] for t in records)
+    assert stats["max_drawdown"] == max_drawdown
+
+
+def test_mixed_types_and_concat():
+    ledger = TradeLedger(batch_size=2)
+    ledger.append({"pnl": 1, "tag": "a"})
+    ledger.append({"pnl": 2.5, "tag": None, "window": 3})
+    ledger.append({"pnl": 3, "tag": 7})
+
+    assert ledger.column("pnl").dtype == np.float64
+    assert [t["tag"] for t in ledger] == ["a", None, 7]
+    assert [t["window"] for t in ledger] == [None, 3, None]
+
+    other = TradeLedger.from_records([{"pnl": -1.0, "tag": "b"}])
+    other.add_column("window", 4)
+    merged = TradeLedger.concat([ledger, other])
+    assert merged.column("pnl").tolist() == [1.0, 2.5, 3.0, -1.0]
+    assert merged[-1] == {"pnl": -1.0, "tag": "b", "window": 4}
+    assert merged.mask_equal("tag", "b").tolist() == [False, False, False, True]
+
+    # Dates avec fuseau : relues dans leur fuseau, comme la liste de dicts
+    utc = [{"t": pd.Timestamp("2024-01-01 03:00", tz="UTC")}, {"t": pd.Timestamp("2024-01-02", tz="UTC")}]
+    aware = TradeLedger.from_records(utc)
+    assert list(aware) == utc and aware[0]["t"].tz is not None
+    assert list(aware.column("t")) == [r["t"] for r in utc]
+    assert list(TradeLedger.concat([aware, aware.take([1])])) == utc + utc[1:]
+
+    # Fuseaux différents (ou dates naïves + fuseau) : colonne d'objets, valeurs inchangées
+    paris = {"t": pd.Timestamp("2024-01-03", tz="Europe/Paris")}
+    mixed = TradeLedger.from_records(utc + [paris])
+    assert list(mixed) == utc + [paris] and str(mixed[-1]["t"].tz) == "Europe/Paris"
+    naive = TradeLedger.from_records([{"t": pd.Timestamp("2024-01-01")}])
+    assert list(TradeLedger.concat([naive, aware])) == list(naive) + utc
+
+
+if __name__ == "__main__":
+    print("🧪 TEST TRADE LEDGER")
+    print("=" * 50)
+    test_records_round_trip()
+    test_stats_match_report_loops()
+    test_mixed_types_and_concat()
+    print("✅ Ledger équivalent aux listes de dicts")
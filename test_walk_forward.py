@@ -0,0 +1,119 @@
+"""
+Test du walk-forward (bornes des fenêtres, warm-up hors fenêtre, rapport OOS recollé)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+
+from core.strategy import BBKeltnerStrategy
+from core.walk_forward import _backtest, make_windows, run_walk_forward
+from utils.file_manager import FileManager
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def _load(symbol: str) -> pd.DataFrame:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return FileManager(data_dir=DATA_DIR).load_csv(symbol)
+
+
+def test_window_boundaries():
+    start, end = pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-01")
+    rolling = make_windows(start, end, train="10D", test="7D")
+    assert [w["train_start"] for w in rolling] == [start + pd.Timedelta(days=7 * k) for k in range(len(rolling))]
+    for w in rolling:
+        assert w["test_start"] == w["train_end"] == w["train_start"] + pd.Timedelta("10D")
+    for previous, current in zip(rolling, rolling[1:]):
+        assert current["test_start"] == previous["test_end"]  # fenêtres OOS contiguës
+    assert rolling[-1]["test_end"] == end and len(rolling) == 3
+
+    anchored = make_windows(start, end, train="10D", test="7D", anchored=True)
+    assert all(w["train_start"] == start for w in anchored)
+    assert [w["test_start"] for w in anchored] == [w["test_start"] for w in rolling]
+
+    stepped = make_windows(start, end, train="10D", test="7D", step="3D")
+    assert all(b["train_start"] - a["train_start"] == pd.Timedelta("3D") for a, b in zip(stepped, stepped[1:]))
+    assert all(w["test_end"] == min(w["test_start"] + pd.Timedelta("7D"), end) for w in stepped)
+    assert make_windows(start, end, train="40D") == []
+
+
+def test_entries_possible_from_first_bar_of_window():
+    df = _load("XAUUSD")
+    strategy = BBKeltnerStrategy(killzone_start="00:00", killzone_end="23:59")
+    signals = strategy.generate_trading_signals(df)
+
+    checked = 0
+    for c in strategy.entry_candidates(signals):
+        direction = "LONG" if signals["signal"].iat[c] == 1 else "SHORT"
+        stop_loss = strategy.calculate_stop_loss_optimized(signals, c, direction)
+        if c < 200 or strategy.build_trade(signals.index[c], signals["close"].iat[c], direction, stop_loss,
+                                           signals["phase"].iat[c], "EURUSD") is None:
+            continue
+        # Fenêtre qui commence exactement sur la bougie candidate : pas de warm-up à refaire
+        start, end = signals.index[c], signals.index[min(c + 300, len(signals) - 1)]
+        report = _backtest(strategy, signals, "XAUUSD", start, end)
+        trades = report["trades_detailed"]
+        assert trades.column("entry_time")[0] == np.datetime64(start)
+        assert (trades.column("exit_time") < np.datetime64(end)).all()
+        assert strategy.portfolio_history.index[0] == start  # courbe sans les bougies d'historique
+        checked += 1
+        if checked == 5:
+            break
+    assert checked == 5
+
+
+def test_stitched_oos_report():
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = run_walk_forward({"risk_reward_ratio": [1.5, 2.5], "killzone_start": ["00:00"],
+                                   "killzone_end": ["23:59"]},
+                                  ["XAUUSD"], data_dir=DATA_DIR, train="14D", test="7D", max_workers=1)
+    index = _load("XAUUSD").index
+    windows = make_windows(index[0], index[-1] + pd.Timedelta(1, "s"), train="14D", test="7D")
+    table = result["windows"]
+    assert len(table) == len(windows) > 3
+    assert table["test_start"].tolist() == [w["test_start"] for w in windows]
+
+    trades = result["oos_trades"]["XAUUSD"]
+    assert len(trades) == table["oos_total_trades"].sum() > 0
+    window_ids = trades.column("window")
+    assert (np.diff(window_ids) >= 0).all()
+    for k, entry, exit_time in zip(window_ids, trades.column("entry_time"), trades.column("exit_time")):
+        w = windows[k]
+        assert np.datetime64(w["test_start"]) <= entry < np.datetime64(w["test_end"])
+        assert exit_time < np.datetime64(w["test_end"])
+
+    report = result["oos_reports"]["XAUUSD"]
+    pnl = trades.column("pnl")
+    assert report["performance"]["total_trades"] == len(trades)
+    assert report["money_management"]["net_profit"] == round(pnl.sum(), 2)
+    assert report["money_management"]["final_capital"] == round(100000 + pnl.sum(), 2)
+    assert round(table["oos_net_profit"].sum(), 2) == report["money_management"]["net_profit"]
+
+
+def test_period_bounds_windows():
+    start, end = pd.Timestamp("2024-01-15"), pd.Timestamp("2024-03-01")
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = run_walk_forward({"risk_reward_ratio": [1.5]}, ["XAUUSD"], data_dir=DATA_DIR,
+                                  train="14D", test="7D", max_workers=1, start=start, end=end)
+    table = result["windows"]
+    assert len(table) > 0
+    assert table["train_start"].min() >= start and table["test_end"].max() <= end + pd.Timedelta(1, "s")
+    for entry in result["oos_trades"]["XAUUSD"].column("entry_time"):
+        assert np.datetime64(start) <= entry <= np.datetime64(end)
+
+
+if __name__ == "__main__":
+    print("🧪 TEST WALK-FORWARD")
+    print("=" * 50)
+    test_window_boundaries()
+    test_entries_possible_from_first_bar_of_window()
+    test_stitched_oos_report()
+    test_period_bounds_windows()
+    print("✅ Fenêtres, warm-up et rapport out-of-sample recollé conformes")
@@ -1,47 +1,137 @@
 import asyncio
 import concurrent.futures
-import threading
+import functools
+import json
 import time
-from typing import List, Dict, Any
+from typing import AsyncIterator, Callable, List, Dict, Any, Optional
 from datetime import datetime
 import os
 from core.strategy import BBKeltnerStrategy
+from core.portfolio import PortfolioBacktester
+from core.trade_ledger import TradeLedger
 from utils.file_manager import FileManager
+from utils.event_log import ERROR, EventLog, NULL_EVENT_LOG
+from utils.stage_tracer import StageTracer
+from utils.progress import ProgressRenderer
+
+# File d'événements de progression du process worker (initializer du pool)
+_WORKER_PROGRESS = None
+# Taille du journal local d'un job en process worker (renvoyé en entier au process principal)
+WORKER_EVENT_RING = 1_000_000
+
+
+def _init_progress_worker(progress_queue):
+    global _WORKER_PROGRESS
+    _WORKER_PROGRESS = progress_queue
+
+
+def _worker_progress(symbol: str, action: str, details: str = ""):
+    if _WORKER_PROGRESS is not None:
+        _WORKER_PROGRESS.put((time.time(), symbol, action, details))
+
+
+def _notify_and_log(event_log: EventLog, notify: Callable[[str, str, str], None],
+                    symbol: str, action: str, details: str = ""):
+    """Activité du worker : journal local (comme _log_file_activity en threads) + file de progression"""
+    event_log.debug("file_activity", "{symbol}: {action} | {details}",
+                    symbol=symbol, action=action, details=details)
+    notify(symbol, action, details)
+
+
+def run_symbol_job(data_dir: str, symbol: str, trace_memory: bool = False,
+                   tracer: Optional[StageTracer] = None,
+                   event_log: Optional[EventLog] = None,
+                   progress: Optional[Callable[[str, str, str], None]] = None,
+                   event_level: Optional[int] = None,
+                   start=None, end=None) -> Dict[str, Any]:
+    """
+    Pipeline complet d'un symbole : chargement, indicateurs, exécution, rapport, sauvegarde.
+    Fonction de module (picklable) exécutée dans un process worker ; le rapport retourné
+    contient les temps par étape ("timings"). Les erreurs sont retournées, pas levées.
+    Chaque étape est signalée à `progress` (ou à la file du worker).
+    En process worker, `event_level` active un journal local dont les événements sont
+    retournés dans "events" pour être rejoués dans le journal du process principal.
+    start / end bornent les données (FileManager.load_period : partitions si présentes).
+    """
+    notify = progress or _worker_progress
+    worker_log = None
+    if event_log is None and event_level is not None:
+        worker_log = event_log = EventLog(level=event_level, ring_size=WORKER_EVENT_RING)
+        notify = functools.partial(_notify_and_log, worker_log, notify)
+    own_tracer = tracer is None
+    if own_tracer:
+        tracer = StageTracer(memory=trace_memory)
+        tracer.start()
+    try:
+        fm = FileManager(data_dir=data_dir)
+        notify(symbol, "Ouverture fichier", f"Recherche {symbol}.csv")
+        with tracer.stage(symbol, "load"):
+            df = fm.load_period(symbol, start, end)
+
+        strategy = BBKeltnerStrategy(event_log=event_log)
+        notify(symbol, "Calcul des indicateurs", f"{len(df)} lignes chargées")
+        with tracer.stage(symbol, "indicators"):
+            df_signals = strategy.generate_trading_signals(df)
+
+        notify(symbol, "Exécution des trades", "Money management en cours...")
+        with tracer.stage(symbol, "execution"):
+            strategy.execute_trading_strategy(df_signals)
+
+        notify(symbol, "Génération rapport", "Money management...")
+        with tracer.stage(symbol, "report"):
+            mm_report = strategy.generate_money_management_report(symbol)
+        mm_report['symbol'] = symbol  # Ajout du symbole pour l'affichage
+
+        # Sauvegarde (le JSON contient les étapes précédentes, le rapport retourné inclut aussi la sauvegarde)
+        notify(symbol, "Sauvegarde", f"results_{symbol}.csv + mm_report")
+        with tracer.stage(symbol, "save"):
+            df_signals.to_csv(f"{data_dir}/results_{symbol}.csv")
+
+            mm_report['timings'] = tracer.for_symbol(symbol)
+            report_path = f"{data_dir}/mm_report_{symbol}_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(mm_report, f, indent=2, default=TradeLedger.json_default)
+        mm_report['timings'] = tracer.for_symbol(symbol)
+
+    except Exception as e:
+        mm_report = {"error": str(e), "symbol": symbol}
+    finally:
+        if own_tracer:
+            tracer.stop()
+    if worker_log is not None:
+        mm_report["events"] = worker_log.records()
+    return mm_report
+
 
 class ConcurrentExecutor:
     """
     Exécuteur concurrentiel avec démo visuelle des trades
     """
     
-    def __init__(self, data_dir="data", demo_mode: bool = True, max_demo_trades: int = 5):
+    def __init__(self, data_dir="data", demo_mode: bool = True, max_demo_trades: int = 5,
+                 event_log: Optional[EventLog] = None, trace_memory: bool = False,
+                 max_workers: Optional[int] = None, use_processes: bool = True,
+                 show_activity: bool = True, max_fps: float = 10.0, start=None, end=None):
         self.data_dir = data_dir
-        self.file_activity = {}
-        self.lock = threading.Lock()
+        self.start, self.end = start, end  # période des données (None : CSV complet)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_processes = use_processes  # False : pool de threads (même interface)
+        self.event_log = event_log or NULL_EVENT_LOG  # partagé avec les stratégies
+        self.tracer = StageTracer(memory=trace_memory)  # temps / mémoire par symbole et par étape
+        # Tableau d'activité : file d'événements + thread de rendu limité à max_fps
+        self.progress = ProgressRenderer(max_fps=max_fps) if show_activity else None
         self.demo_mode = demo_mode  # Mode démo activé
         self.max_demo_trades = max_demo_trades  # Nombre de trades à afficher
     
     def _log_file_activity(self, symbol: str, action: str, details: str = ""):
-        """Journalise l'activité des fichiers en temps réel"""
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        with self.lock:
-            self.file_activity[symbol] = {
-                'timestamp': timestamp,
-                'action': action,
-                'details': details
-            }
-            self._display_activity()
-
-    def _display_activity(self):
-        """Affiche l'activité en temps réel dans la console"""
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print("🔄 ACTIVITÉ DES FICHIERS EN TEMPS RÉEL - MODE DÉMO")
-        print("=" * 60)
-        
-        for symbol, activity in self.file_activity.items():
-            status_color = "🟢" if "terminé" in activity['action'].lower() else "🟡"
-            print(f"{status_color} {symbol}: {activity['action']}")
-            print(f"   ⏰ {activity['timestamp']} | {activity['details']}")
-        print("-" * 60)
+        """
+        Journalise l'activité des fichiers ; l'affichage est délégué au thread de rendu
+        (niveau DEBUG : pas de doublon avec le tableau d'activité sur la console)
+        """
+        self.event_log.debug("file_activity", "{symbol}: {action} | {details}",
+                             symbol=symbol, action=action, details=details)
+        if self.progress is not None:
+            self.progress.push(symbol, action, details)
 
     async def _display_trade_demo(self, symbol: str, trades: List[Dict], total_trades: int):
         """
@@ -79,111 +169,148 @@ class ConcurrentExecutor:
             print("🎬 Passage à l'exécution complète...")
             await asyncio.sleep(2)
 
+    def _pool_executor(self, n_jobs: int) -> concurrent.futures.Executor:
+        workers = min(self.max_workers, max(n_jobs, 1))
+        if self.use_processes:
+            progress_queue = self.progress.queue if self.progress is not None else None
+            return concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_progress_worker,
+                                                          initargs=(progress_queue,))
+        return concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+
+    def _submit(self, pool: Optional[concurrent.futures.Executor], symbol: str) -> "asyncio.Future":
+        """Job d'un symbole dans le pool via run_in_executor (la boucle asyncio reste libre)"""
+        loop = asyncio.get_running_loop()
+        if isinstance(pool, concurrent.futures.ProcessPoolExecutor):
+            # Process : journal local au worker si le journal principal est actif, rejoué dans _finish
+            event_level = self.event_log.level if self.event_log.enabled_for(ERROR) else None
+            job = functools.partial(run_symbol_job, self.data_dir, symbol, trace_memory=self.tracer.memory,
+                                    event_level=event_level, start=self.start, end=self.end)
+        else:
+            # Threads : tracer et journal partagés avec le process principal
+            job = functools.partial(run_symbol_job, self.data_dir, symbol, tracer=self.tracer,
+                                    event_log=self.event_log, progress=self._log_file_activity,
+                                    start=self.start, end=self.end)
+        return loop.run_in_executor(pool, job)
+
+    async def _finish(self, symbol: str, mm_report: Dict[str, Any]) -> Dict[str, Any]:
+        """Côté process principal : événements du worker, timings agrégés, démo éventuelle, activité"""
+        self.event_log.replay(mm_report.pop("events", ()))
+        if "error" in mm_report:
+            self.event_log.error("strategy_error", "❌ {symbol}: {error}", symbol=symbol, error=mm_report["error"])
+            self._log_file_activity(symbol, "❌ Erreur", mm_report["error"])
+            return mm_report
+
+        self.tracer.add(symbol, mm_report.get("timings", {}).get("stages", {}))
+        closed_trades = mm_report["trades_detailed"]
+        if closed_trades:
+            await self._display_trade_demo(symbol, closed_trades, len(closed_trades))
+        self._log_file_activity(symbol, "✅ Analyse terminée",
+                                f"Profit: {mm_report['money_management']['net_profit']:+.2f}€ | "
+                                f"Trades: {len(closed_trades)} | "
+                                f"Win Rate: {mm_report['performance']['win_rate']}%")
+        return mm_report
+
     async def run_single_strategy_async(self, symbol: str) -> Dict[str, Any]:
         """
-        Exécute une stratégie avec mode démo des trades
+        Exécute la stratégie d'un symbole hors de la boucle asyncio
+        (pool de threads par défaut de la boucle)
         """
-        try:
-            # 1️⃣ Ouverture du fichier
-            self._log_file_activity(symbol, "Début ouverture fichier", f"Recherche {symbol}.csv")
-            
-            fm = FileManager(data_dir=self.data_dir)
-            df = fm.load_csv(symbol)
-            
-            self._log_file_activity(symbol, "Fichier ouvert avec succès", f"{len(df)} lignes chargées")
-            await asyncio.sleep(0.5)
+        self._log_file_activity(symbol, "Début analyse", f"Recherche {symbol}.csv")
+        return await self._finish(symbol, await self._submit(None, symbol))
 
-            # 2️⃣ Calcul des indicateurs
-            self._log_file_activity(symbol, "Calcul des indicateurs", "Bollinger Bands + Keltner Channel")
-            
-            strategy = BBKeltnerStrategy()
-            df_signals = strategy.generate_trading_signals(df)
-            
-            self._log_file_activity(symbol, "Indicateurs calculés", f"{len(df_signals)} signaux générés")
-            await asyncio.sleep(0.5)
+    async def stream_strategies_async(self, symbols: List[str]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Envoie un job par symbole au pool (max_workers process) et retourne
+        les rapports au fur et à mesure qu'ils se terminent
+        """
+        with self._pool_executor(len(symbols)) as pool:
+            pending = {}
+            for symbol in symbols:
+                self._log_file_activity(symbol, "⏳ Envoyé au pool", f"{self.max_workers} workers")
+                pending[self._submit(pool, symbol)] = symbol
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    symbol = pending.pop(future)
+                    try:
+                        mm_report = future.result()
+                    except Exception as e:  # worker tué, erreur de sérialisation...
+                        mm_report = {"error": str(e), "symbol": symbol}
+                    yield await self._finish(symbol, mm_report)
 
-            # 3️⃣ Exécution des trades
-            self._log_file_activity(symbol, "Exécution des trades", "Money management en cours...")
-            
-            closed_trades = strategy.execute_trading_strategy(df_signals)
-            
-            # 4️⃣ AFFICHAGE DÉMO DES TRADES
-            if closed_trades:
-                await self._display_trade_demo(symbol, closed_trades, len(closed_trades))
-            
-            self._log_file_activity(symbol, "Trades exécutés", f"{len(closed_trades)} trades fermés")
-            await asyncio.sleep(0.5)
+    async def run_multiple_strategies_async(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        """
+        Exécute plusieurs stratégies en parallèle (pool de process) ;
+        résultats dans l'ordre des symboles
+        """
+        print("🚀 LANCEMENT CONCURRENT DES STRATÉGIES")
+        print(f"📊 Symboles: {', '.join(symbols)} | ⚙️  Workers: {self.max_workers}")
+        if self.demo_mode:
+            print(f"🎭 DÉMO: {self.max_demo_trades} premiers trades affichés par devise")
+        print("=" * 60)
 
-            # 5️⃣ Génération du rapport
-            self._log_file_activity(symbol, "Génération rapport", "Money management...")
-            
-            mm_report = strategy.generate_money_management_report(symbol)
-            mm_report['symbol'] = symbol  # Ajout du symbole pour l'affichage
-            
-            # 6️⃣ Sauvegarde des résultats
-            output_path = f"{self.data_dir}/results_{symbol}.csv"
-            df_signals.to_csv(output_path)
-            
-            report_path = f"{self.data_dir}/mm_report_{symbol}_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
-            import json
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(mm_report, f, indent=2, default=str)
+        # Étapes tracées (tracemalloc actif le temps du run pour les jobs en threads)
+        results = {}
+        self.tracer.start()
+        try:
+            async for mm_report in self.stream_strategies_async(symbols):
+                results[mm_report["symbol"]] = mm_report
+        finally:
+            self.tracer.stop()
+            self._stop_progress()
 
-            self._log_file_activity(symbol, "✅ Analyse terminée", 
-                                  f"Profit: {mm_report['money_management']['net_profit']:+.2f}€ | "
-                                  f"Trades: {len(closed_trades)} | "
-                                  f"Win Rate: {mm_report['performance']['win_rate']}%")
+        print("\n" + "=" * 60)
+        print("✅ TOUTES LES STRATÉGIES TERMINÉES")
 
-            return mm_report
+        return [results[symbol] for symbol in symbols]
 
-        except Exception as e:
-            self._log_file_activity(symbol, "❌ Erreur", str(e))
-            return {"error": str(e), "symbol": symbol}
+    def _stop_progress(self):
+        """Dernier cadre du tableau d'activité et arrêt du thread de rendu"""
+        if self.progress is not None:
+            self.progress.stop()
 
-    async def run_multiple_strategies_async(self, symbols: List[str]) -> List[Dict[str, Any]]:
+    def timing_summary(self) -> Dict[str, Any]:
+        """Résumé du run : temps / mémoire par étape sur tous les symboles, étape dominante"""
+        return self.tracer.summary()
+
+    async def run_portfolio_async(self, symbols: List[str], **limits) -> Dict[str, Any]:
         """
-        Exécute plusieurs stratégies en parallèle avec démo
+        Backtest à capital partagé : chargement concurrent des fichiers puis un seul
+        PortfolioBacktester (limites d'exposition passées en **limits)
         """
-        print("🚀 LANCEMENT CONCURRENT DES STRATÉGIES - MODE DÉMO")
-        print(f"📊 Symboles: {', '.join(symbols)}")
-        print(f"🎭 DÉMO: {self.max_demo_trades} premiers trades affichés par devise")
-        print("=" * 60)
-        
-        # Initialisation du suivi
+        fm = FileManager(data_dir=self.data_dir)
         for symbol in symbols:
-            self._log_file_activity(symbol, "⏳ En attente...", "Prêt à démarrer")
-        
-        await asyncio.sleep(2)  # Pause pour voir l'état initial
-        
-        # Exécution concurrente
-        tasks = [self.run_single_strategy_async(symbol) for symbol in symbols]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        print("\n" + "=" * 60)
-        print("✅ TOUTES LES STRATÉGIES TERMINÉES")
-        
-        return results
+            self._log_file_activity(symbol, "Début ouverture fichier", f"Recherche {symbol}.csv")
+        frames = await asyncio.gather(*(asyncio.to_thread(fm.load_period, symbol, self.start, self.end) for symbol in symbols))
+        for symbol, df in zip(symbols, frames):
+            self._log_file_activity(symbol, "Fichier ouvert avec succès", f"{len(df)} lignes chargées")
+
+        backtester = PortfolioBacktester(BBKeltnerStrategy(event_log=self.event_log),
+                                         event_log=self.event_log, **limits)
+        await asyncio.to_thread(backtester.run, dict(zip(symbols, frames)))
+        report = backtester.generate_report()
+
+        for symbol in symbols:
+            stats = report.get("by_symbol", {}).get(symbol, {"net_profit": 0, "total_trades": 0})
+            self._log_file_activity(symbol, "✅ Portefeuille terminé",
+                                    f"Profit: {stats['net_profit']:+.2f}€ | Trades: {stats['total_trades']}")
+        self._stop_progress()
+        return report
 
     def run_multiple_strategies_threaded(self, symbols: List[str]) -> List[Dict[str, Any]]:
         """
-        Version threadée pour comparaison
+        Version threadée sans asyncio (max_workers threads), dans l'ordre d'achèvement
         """
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            futures = {executor.submit(self._run_single_strategy_threaded, symbol): symbol for symbol in symbols}
-            
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(run_symbol_job, self.data_dir, symbol, tracer=self.tracer,
+                                       event_log=self.event_log, progress=self._log_file_activity,
+                                       start=self.start, end=self.end): symbol
+                       for symbol in symbols}
             results = []
             for future in concurrent.futures.as_completed(futures):
                 symbol = futures[future]
                 try:
-                    result = future.result()
-                    results.append(result)
+                    results.append(future.result())
                 except Exception as e:
                     results.append({"error": str(e), "symbol": symbol})
-            
             return results
-
-    def _run_single_strategy_threaded(self, symbol: str) -> Dict[str, Any]:
-        """
-        Version adaptée pour le threading
-        """
-        return asyncio.run(self.run_single_strategy_async(symbol))
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""
+Parsed Data Cache
+-----------------
+Cache binaire des DataFrames déjà parsés par FileManager.load_csv, rangé à côté des CSV
+(<data_dir>/.cache/<symbole>.parquet | .pkl + <symbole>.meta.json).
+
+- Format : Parquet si pyarrow est installé, sinon pickle (protocole 5).
+- Validité : mtime + taille du CSV (chemin rapide) ; s'ils ont changé, le contenu est
+  haché (blake2b) et le cache reste valide si le hash est identique (fichier copié / touché).
+- Les dtypes et l'unité de l'index sont enregistrés et restaurés à la lecture.
+- Compteurs hits / misses pour le taux de réussite.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+CACHE_DIRNAME = ".cache"
+CACHE_VERSION = 1
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParsedDataCache:
+    """
+    cache.load(csv_path, parse) : DataFrame depuis le cache s'il est valide,
+    sinon parse(csv_path) puis écriture du cache.
+    """
+
+    def __init__(self, format: Optional[str] = None, verify_hash: bool = False):
+        self.format = format or ("parquet" if PARQUET_AVAILABLE else "pickle")
+        if self.format == "parquet" and not PARQUET_AVAILABLE:
+            raise ImportError("pyarrow est requis pour le format parquet")
+        self.verify_hash = verify_hash  # True : hash du CSV vérifié à chaque lecture
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Emplacements
+    # ------------------------------------------------------------------
+
+    def _paths(self, csv_path: str) -> Dict[str, str]:
+        directory = os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIRNAME)
+        name = os.path.splitext(os.path.basename(csv_path))[0]
+        extension = "parquet" if self.format == "parquet" else "pkl"
+        return {
+            "dir": directory,
+            "data": os.path.join(directory, f"{name}.{extension}"),
+            "meta": os.path.join(directory, f"{name}.meta.json"),
+        }
+
+    @staticmethod
+    def _signature(csv_path: str) -> Dict[str, int]:
+        stat = os.stat(csv_path)
+        return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    # ------------------------------------------------------------------
+    # Lecture / écriture
+    # ------------------------------------------------------------------
+
+    def _read_meta(self, meta_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("version") != CACHE_VERSION or meta.get("format") != self.format:
+            return None
+        return meta
+
+    def _is_valid(self, csv_path: str, meta: Dict[str, Any], paths: Dict[str, str]) -> bool:
+        if not os.path.exists(paths["data"]):
+            return False
+        signature = self._signature(csv_path)
+        same_stat = signature["size"] == meta["size"] and signature["mtime_ns"] == meta["mtime_ns"]
+        if same_stat and not self.verify_hash:
+            return True
+        if signature["size"] != meta["size"]:
+            return False
+        if file_digest(csv_path) != meta["hash"]:
+            return False
+        if not same_stat:
+            # Contenu identique (fichier touché / copié) : nouvelle signature enregistrée
+            self._write_meta(paths["meta"], {**meta, **signature})
+        return True
+
+    @staticmethod
+    def _write_meta(meta_path: str, meta: Dict[str, Any]):
+        tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, meta_path)
+
+    def _read_frame(self, data_path: str, meta: Dict[str, Any]) -> pd.DataFrame:
+        if self.format == "parquet":
+            df = pd.read_parquet(data_path)
+            # Parquet peut changer l'unité des dates ou le type des chaînes : on restaure
+            df = df.astype(meta["dtypes"], copy=False)
+            if str(df.index.dtype) != meta["index_dtype"]:
+                df.index = df.index.astype(meta["index_dtype"])
+            return df
+        return pd.read_pickle(data_path)
+
+    def _write(self, csv_path: str, df: pd.DataFrame, paths: Dict[str, str]):
+        os.makedirs(paths["dir"], exist_ok=True)
+        tmp_path = f"{paths['data']}.{os.getpid()}.tmp"
+        if self.format == "parquet":
+            df.to_parquet(tmp_path)
+        else:
+            pd.to_pickle(df, tmp_path, protocol=5)
+        os.replace(tmp_path, paths["data"])
+        self._write_meta(paths["meta"], {
+            "version": CACHE_VERSION,
+            "format": self.format,
+            **self._signature(csv_path),
+            "hash": file_digest(csv_path),
+            "rows": len(df),
+            "dtypes": {column: str(dtype) for column, dtype in df.dtypes.items()},
+            "index_dtype": str(df.index.dtype),
+        })
+
+    def load(self, csv_path: str, parse: Callable[[str], pd.DataFrame]) -> pd.DataFrame:
+        paths = self._paths(csv_path)
+        meta = self._read_meta(paths["meta"])
+        if meta is not None and self._is_valid(csv_path, meta, paths):
+            try:
+                df = self._read_frame(paths["data"], meta)
+                with self._lock:
+                    self.hits += 1
+                return df
+            except Exception:
+                pass  # cache illisible : reconstruit ci-dessous
+
+        df = parse(csv_path)
+        with self._lock:
+            self.misses += 1
+        try:
+            self._write(csv_path, df, paths)
+        except OSError as e:
+            print(f"⚠️  Cache non écrit ({paths['dir']}): {e}")
+        return df
+
+    def invalidate(self, csv_path: str):
+        for key in ("data", "meta"):
+            path = self._paths(csv_path)[key]
+            if os.path.exists(path):
+                os.remove(path)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "format": self.format,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total * 100, 1) if total else 0.0,
+            }
+
+
+# Cache partagé par défaut (process courant)
+default_data_cache = ParsedDataCache()
@@ -0,0 +1,150 @@
+"""
+Event Log
+---------
+Journal d'événements structuré et hiérarchisé (DEBUG / INFO / WARNING / ERROR).
+
+- Désactivé : chaque appel s'arrête sur une comparaison d'entiers (aucun formatage, aucune I/O).
+- Buffer circulaire en mémoire des derniers événements.
+- Export JSONL optionnel, écrit par un thread d'arrière-plan.
+- Écho console optionnel (message formaté uniquement s'il est affiché).
+"""
+
+import json
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+DISABLED = 100
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+_LEVELS_BY_NAME = {name: level for level, name in LEVEL_NAMES.items()}
+
+
+def _to_level(level) -> int:
+    if isinstance(level, str):
+        return _LEVELS_BY_NAME[level.upper()]
+    return int(level)
+
+
+class EventLog:
+    def __init__(
+        self,
+        level="INFO",
+        ring_size: int = 10_000,
+        jsonl_path: Optional[str] = None,
+        console: bool = False,
+        console_level="INFO",
+    ):
+        self.level = _to_level(level)
+        self.console = console
+        self.console_level = _to_level(console_level)
+        self.ring = deque(maxlen=ring_size)
+        self.jsonl_path = jsonl_path
+
+        self._queue = None
+        self._writer = None
+        if jsonl_path:
+            self._queue = queue.SimpleQueue()
+            self._writer = threading.Thread(target=self._write_loop, name="event-log-writer", daemon=True)
+            self._writer.start()
+
+    @classmethod
+    def disabled(cls) -> "EventLog":
+        """Journal inactif : coût quasi nul sur les chemins critiques"""
+        return cls(level=DISABLED, ring_size=0)
+
+    def enabled_for(self, level: int) -> bool:
+        """À tester avant de préparer des champs coûteux dans une boucle"""
+        return level >= self.level
+
+    def log(self, level: int, event: str, message: Optional[str] = None, **fields: Any):
+        """
+        Enregistre un événement. `message` est un gabarit str.format() rempli avec
+        `fields`, formaté seulement pour l'écho console et l'export JSONL.
+        """
+        if level < self.level:
+            return
+        self._emit({"ts": time.time(), "level": level, "event": event, "message": message, "fields": fields})
+
+    def replay(self, records: Iterable[Dict[str, Any]]):
+        """
+        Réinjecte des événements déjà horodatés (ex. journal d'un process worker)
+        dans le buffer, l'export JSONL et la console, filtrés par le niveau de ce journal
+        """
+        for record in records:
+            if record["level"] >= self.level:
+                self._emit(record)
+
+    def _emit(self, record: Dict[str, Any]):
+        level = record["level"]
+        self.ring.append(record)
+        if self._queue is not None:
+            self._queue.put(record)
+        if self.console and level >= self.console_level:
+            print(self.format(record))
+
+    def debug(self, event: str, message: Optional[str] = None, **fields: Any):
+        self.log(DEBUG, event, message, **fields)
+
+    def info(self, event: str, message: Optional[str] = None, **fields: Any):
+        self.log(INFO, event, message, **fields)
+
+    def warning(self, event: str, message: Optional[str] = None, **fields: Any):
+        self.log(WARNING, event, message, **fields)
+
+    def error(self, event: str, message: Optional[str] = None, **fields: Any):
+        self.log(ERROR, event, message, **fields)
+
+    @staticmethod
+    def format(record: Dict[str, Any]) -> str:
+        if record["message"] is None:
+            details = " ".join(f"{k}={v}" for k, v in record["fields"].items())
+            return f"[{LEVEL_NAMES.get(record['level'], record['level'])}] {record['event']} {details}".rstrip()
+        return record["message"].format(**record["fields"])
+
+    def records(self, level="DEBUG", event: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Événements du buffer circulaire, filtrés par niveau minimal et type"""
+        level = _to_level(level)
+        return [r for r in list(self.ring)
+                if r["level"] >= level and (event is None or r["event"] == event)]
+
+    def _write_loop(self):
+        with open(self.jsonl_path, "a", encoding="utf-8") as f:
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    break
+                line = {
+                    "ts": record["ts"],
+                    "level": LEVEL_NAMES.get(record["level"], record["level"]),
+                    "event": record["event"],
+                    "message": self.format(record) if record["message"] is not None else None,
+                    **record["fields"],
+                }
+                f.write(json.dumps(line, default=str, ensure_ascii=False) + "\n")
+                if self._queue.empty():
+                    f.flush()
+
+    def close(self):
+        """Vide la file d'écriture JSONL et arrête le thread"""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+            self._queue = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Journal inactif partagé (valeur par défaut)
+NULL_EVENT_LOG = EventLog.disabled()
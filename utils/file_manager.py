@@ -1,20 +1,101 @@
 import pandas as pd
 import os
+from typing import Any, Dict, Optional
+
+from utils.data_cache import ParsedDataCache, default_data_cache
+from utils.mt5_csv import is_mt5_layout, read_header, read_mt5_csv
+from utils.ohlc_store import STORE_DIRNAME, OHLCStore
+from utils.partitioned_store import PartitionedStore
 
 class FileManager:
-    def __init__(self, data_dir="data"):
+    def __init__(self, data_dir="data", cache: Optional[ParsedDataCache] = default_data_cache):
         self.data_dir = data_dir
+        self.cache = cache  # None : parsing du CSV à chaque appel
+        self.store = OHLCStore(os.path.join(data_dir, STORE_DIRNAME))
+        self.partitions = PartitionedStore(os.path.join(data_dir, "partitions"))
 
     def load_csv(self, symbol: str) -> pd.DataFrame:
         path = f"{self.data_dir}/{symbol}.csv"
-        
+
         # Vérifier l'existence du fichier
         if not os.path.exists(path):
             raise FileNotFoundError(f"Fichier {path} introuvable")
-        
+
+        if self.cache is None:
+            return self._parse_csv(path)
+
+        hits = self.cache.hits
+        df = self.cache.load(path, self._parse_csv)
+        if self.cache.hits > hits:
+            stats = self.cache.stats()
+            print(f"⚡ Données en cache ({stats['format']}): {len(df)} lignes | "
+                  f"hit rate {stats['hit_rate']}% ({stats['hits']}/{stats['hits'] + stats['misses']})")
+        return df
+
+    def load_range(self, symbol: str, start=None, end=None) -> pd.DataFrame:
+        """
+        Bougies start <= t <= end depuis le store memmap (vues sans copie, lecture seule).
+        Le store est (re)construit depuis le CSV s'il est absent ou si le CSV a changé.
+        """
+        path = f"{self.data_dir}/{symbol}.csv"
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Fichier {path} introuvable")
+
+        stat = os.stat(path)
+        source = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        meta = self.store.meta(symbol)
+        if meta is None or meta["source"] != source:
+            print(f"🗄️  Construction du store OHLC {symbol}...")
+            self.store.write(symbol, self.load_csv(symbol), source=source)
+
+        df = self.store.frame(symbol, start, end)
+        print(f"✅ Plage {symbol} chargée (memmap): {len(df)} lignes")
+        return df
+
+    def load_partitioned(self, symbol: str, start=None, end=None) -> pd.DataFrame:
+        """Bougies start <= t <= end depuis le store symbole / année / mois (partitions utiles seulement)"""
+        df = self.partitions.read(symbol, start, end)
+        print(f"✅ {symbol} chargé depuis {len(self.partitions.last_read)} partition(s): {len(df)} lignes")
+        return df
+
+    def load_period(self, symbol: str, start=None, end=None) -> pd.DataFrame:
+        """
+        Source des pipelines : historique partitionné (backtest_data.py) s'il existe,
+        sinon CSV (complet sans bornes, plage lue dans le store du CSV avec start / end)
+        """
+        if self.partitions.partitions(symbol):
+            df = self.load_partitioned(symbol, start, end)
+        elif start is None and end is None:
+            return self.load_csv(symbol)
+        else:
+            df = self.load_range(symbol, start, end)
+        if df.empty:
+            raise ValueError(f"Aucune bougie {symbol} entre {start} et {end}")
+        return df
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hits / misses / taux de réussite du cache de données parsées"""
+        return self.cache.stats() if self.cache is not None else {"hits": 0, "misses": 0, "hit_rate": 0.0}
+
+    def _parse_csv(self, path: str) -> pd.DataFrame:
+        # Export MT5 standard : lecture typée (dtypes et formats de date explicites)
+        if is_mt5_layout(path):
+            try:
+                df = read_mt5_csv(path)
+                print(f"📊 Colonnes détectées: {[col.strip('<>').lower() for col in read_header(path)]}")
+            except ValueError as e:
+                print(f"⚠️  Lecture typée impossible ({e}), lecture générique")
+            else:
+                print(f"✅ Index {df.index.name} créé")
+                print(f"✅ Données chargées: {len(df)} lignes, {len(df.columns)} colonnes")
+                return df
+        return self._parse_generic(path)
+
+    def _parse_generic(self, path: str) -> pd.DataFrame:
+        """Lecture sans dtypes (CSV non standard) : types et dates inférés par pandas"""
         # Charger avec séparateur tabulation
         df = pd.read_csv(path, sep='\t')
-        
+
         # Nettoyage des colonnes
         df.columns = [col.strip("<>").lower() for col in df.columns]
         print(f"📊 Colonnes détectées: {list(df.columns)}")
@@ -43,4 +124,4 @@ class FileManager:
             print(f"✅ Index date créé")
 
         print(f"✅ Données chargées: {len(df)} lignes, {len(df.columns)} colonnes")
-        return df
\ No newline at end of file
+        return df
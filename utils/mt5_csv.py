@@ -0,0 +1,125 @@
+"""
+MT5 CSV Reader
+--------------
+Lecture typée des exports MetaTrader 5 (séparateur tabulation) :
+
+    <DATE>  <TIME>  <OPEN>  <HIGH>  <LOW>  <CLOSE>  <TICKVOL>  <VOL>  <SPREAD>
+    2024.01.02  01:00:00  2062.1  ...
+
+- dtypes explicites (float64 pour les prix, int64 pour volumes / spread) : pas d'inférence ;
+- <DATE> / <TIME> lus en catégories : seules les valeurs distinctes sont converties avec
+  des formats explicites (%Y.%m.%d, %H:%M:%S), l'index est reconstruit par les codes ;
+- usecols : projection des colonnes utiles (date / heure toujours lues pour l'index) ;
+- engine="pyarrow" si pyarrow est installé (auto), sinon moteur C de pandas ;
+- iter_mt5_csv : lecture par blocs pour les fichiers plus gros que la RAM.
+
+Même structure que l'ancien FileManager.load_csv (noms en minuscules, index "datetime"
+datetime64[us]) ; date / time restent des colonnes category au lieu de chaînes.
+"""
+
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+DATE_FORMAT = "%Y.%m.%d"
+TIME_FORMAT = "%H:%M:%S"
+
+MT5_DTYPES: Dict[str, str] = {
+    "date": "category",
+    "time": "category",
+    "open": "float64",
+    "high": "float64",
+    "low": "float64",
+    "close": "float64",
+    "tickvol": "int64",
+    "vol": "int64",
+    "spread": "int64",
+}
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+
+
+def read_header(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        return f.readline().rstrip("\r\n").split("\t")
+
+
+def is_mt5_layout(path: str) -> bool:
+    """En-tête <DATE>\t...\t<CLOSE> avec uniquement des colonnes MT5 connues"""
+    names = [name.strip("<>").lower() for name in read_header(path)]
+    return (bool(names) and names[0] == "date" and set(PRICE_COLUMNS).issubset(names)
+            and set(names).issubset(MT5_DTYPES))
+
+
+def _read_options(path: str, usecols: Optional[List[str]], engine: str) -> Dict:
+    header = read_header(path)
+    names = {raw.strip("<>").lower(): raw for raw in header}
+    wanted = list(names) if usecols is None else [c for c in names if c in set(usecols) | {"date", "time"}]
+    missing = set(usecols or []) - set(names)
+    if missing:
+        raise ValueError(f"Colonnes manquantes: {missing}")
+
+    if engine == "auto":
+        engine = "pyarrow" if PYARROW_AVAILABLE else "c"
+    return {
+        "sep": "\t",
+        "usecols": [names[c] for c in wanted],
+        "dtype": {names[c]: MT5_DTYPES[c] for c in wanted},
+        "engine": engine,
+    }
+
+
+def _parse_distinct(values: pd.Series, format: str) -> np.ndarray:
+    """Convertit chaque valeur distincte une seule fois puis diffuse par les codes de catégorie"""
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype("category")
+    parsed = pd.to_datetime(values.cat.categories, format=format).to_numpy()
+    return parsed[values.cat.codes.to_numpy()]
+
+
+def _finish(raw: pd.DataFrame, usecols: Optional[List[str]]) -> pd.DataFrame:
+    """Noms en minuscules, NaN de prix retirés, index datetime construit depuis les catégories"""
+    raw.columns = [col.strip("<>").lower() for col in raw.columns]
+
+    prices = [c for c in PRICE_COLUMNS if c in raw.columns]
+    if raw[prices].isna().to_numpy().any():
+        raw = raw.dropna(subset=prices)
+
+    values = _parse_distinct(raw["date"], DATE_FORMAT)
+    if "time" in raw.columns:
+        # %H:%M:%S seul est daté du 1900-01-01 : on n'en garde que le décalage dans la journée
+        values = values + (_parse_distinct(raw["time"], TIME_FORMAT) - np.datetime64("1900-01-01"))
+        index = pd.DatetimeIndex(values, name="datetime")
+    else:
+        index = pd.DatetimeIndex(values, name="date")
+        raw = raw.drop(columns="date")
+
+    columns = [c for c in raw.columns if usecols is None or c in usecols]
+    df = raw[columns]
+    df.index = index
+    return df
+
+
+def read_mt5_csv(path: str, usecols: Optional[List[str]] = None, engine: str = "auto") -> pd.DataFrame:
+    """
+    Export MT5 complet en un DataFrame typé.
+    usecols : noms en minuscules sans chevrons (ex. ["open", "close"]) ; engine : "auto", "c" ou "pyarrow".
+    Lève ValueError si une valeur ne respecte pas le type attendu.
+    """
+    raw = pd.read_csv(path, **_read_options(path, usecols, engine))
+    return _finish(raw, usecols)
+
+
+def iter_mt5_csv(path: str, chunksize: int = 1_000_000, usecols: Optional[List[str]] = None,
+                 engine: str = "c") -> Iterator[pd.DataFrame]:
+    """Blocs typés de `chunksize` lignes (le moteur pyarrow ne lit pas par blocs : moteur C)"""
+    options = _read_options(path, usecols, "c" if engine in ("auto", "pyarrow") else engine)
+    with pd.read_csv(path, chunksize=chunksize, **options) as reader:
+        for raw in reader:
+            yield _finish(raw, usecols)
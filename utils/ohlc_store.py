@@ -0,0 +1,118 @@
+"""
+OHLC Store
+----------
+Stockage colonnaire sur disque par symbole, lu par numpy.memmap :
+
+    <data_dir>/.store/<symbole>/timestamp.npy   int64 (datetime64, unité dans meta.json)
+                                open.npy high.npy low.npy close.npy   float64
+                                tickvol.npy vol.npy spread.npy        (si présents dans le CSV)
+                                meta.json
+
+Une plage de dates se lit par recherche dichotomique sur timestamp et renvoie des vues
+(aucune copie) : les process workers partagent le cache de pages de l'OS au lieu de
+garder chacun un DataFrame complet en mémoire.
+"""
+
+import json
+import os
+import shutil
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+STORE_DIRNAME = ".store"
+STORE_VERSION = 1
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+EXTRA_COLUMNS = ["tickvol", "vol", "spread"]
+
+
+class OHLCStore:
+    """
+    store.write("XAUUSD", df) puis store.slice("XAUUSD", "2024-01-01", "2024-03-31")
+    -> {"timestamp": datetime64[], "open": ..., ...} (vues memmap en lecture seule)
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._open: Dict[str, Dict[str, np.ndarray]] = {}
+
+    def _dir(self, symbol: str) -> str:
+        return os.path.join(self.root, symbol)
+
+    def meta(self, symbol: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self._dir(symbol), "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("version") == STORE_VERSION else None
+
+    def write(self, symbol: str, df: pd.DataFrame, source: Optional[Dict[str, Any]] = None):
+        """Écrit les colonnes du DataFrame (index datetime trié) ; remplace le store existant"""
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise ValueError("Index datetime requis pour le store OHLC")
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+
+        timestamps = df.index.to_numpy()
+        columns = PRICE_COLUMNS + [c for c in EXTRA_COLUMNS if c in df.columns]
+        arrays = {"timestamp": timestamps.view(np.int64)}
+        arrays.update({c: df[c].to_numpy() for c in columns})
+
+        # Écriture dans un répertoire temporaire puis remplacement (lecteurs jamais sur un store partiel)
+        self._open.pop(symbol, None)
+        target = self._dir(symbol)
+        tmp_dir = f"{target}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        for name, values in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(values))
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "version": STORE_VERSION,
+                "rows": len(df),
+                "columns": columns,
+                "datetime_dtype": str(timestamps.dtype),
+                "index_name": df.index.name,
+                "source": source or {},
+            }, f, indent=2)
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(tmp_dir, target)
+
+    def open(self, symbol: str) -> Dict[str, np.ndarray]:
+        """Colonnes complètes du symbole en memmap lecture seule (ouvertes une fois)"""
+        if symbol not in self._open:
+            meta = self.meta(symbol)
+            if meta is None:
+                raise FileNotFoundError(f"Store OHLC introuvable pour {symbol} ({self._dir(symbol)})")
+            directory = self._dir(symbol)
+            arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+                      for name in ["timestamp"] + meta["columns"]}
+            arrays["timestamp"] = arrays["timestamp"].view(meta["datetime_dtype"])
+            self._open[symbol] = arrays
+        return self._open[symbol]
+
+    def bounds(self, symbol: str, start=None, end=None) -> List[int]:
+        """[i, j) des bougies start <= t <= end (recherche dichotomique)"""
+        timestamps = self.open(symbol)["timestamp"]
+        i = 0 if start is None else int(np.searchsorted(timestamps, np.datetime64(pd.Timestamp(start)), "left"))
+        j = len(timestamps) if end is None else int(np.searchsorted(timestamps, np.datetime64(pd.Timestamp(end)), "right"))
+        return [i, max(i, j)]
+
+    def slice(self, symbol: str, start=None, end=None) -> Dict[str, np.ndarray]:
+        """Vues (sans copie) des colonnes sur la plage [start, end] incluse"""
+        i, j = self.bounds(symbol, start, end)
+        return {name: values[i:j] for name, values in self.open(symbol).items()}
+
+    def frame(self, symbol: str, start=None, end=None) -> pd.DataFrame:
+        """DataFrame sur la plage, colonnes adossées au memmap (copy=False)"""
+        arrays = self.slice(symbol, start, end)
+        index = pd.DatetimeIndex(arrays.pop("timestamp"), name=self.meta(symbol)["index_name"], copy=False)
+        return pd.DataFrame(arrays, index=index, copy=False)
+
+    def close(self, symbol: Optional[str] = None):
+        if symbol is None:
+            self._open.clear()
+        else:
+            self._open.pop(symbol, None)
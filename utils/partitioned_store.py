@@ -0,0 +1,123 @@
+"""
+Partitioned Store
+-----------------
+Historique de bougies partitionné par symbole / année / mois :
+
+    <root>/<symbole>/<année>/<mois>.parquet   (ou .pkl si pyarrow n'est pas installé)
+
+- append : les nouvelles bougies ne réécrivent que les partitions qu'elles touchent
+  (en pratique la dernière), après déduplication sur le timestamp (la nouvelle valeur gagne) ;
+  une mise à jour quotidienne coûte O(nouvelles bougies + un mois), pas O(historique).
+- read : seules les partitions qui recoupent [start, end] sont lues.
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.data_cache import PARQUET_AVAILABLE
+
+
+class PartitionedStore:
+    """
+    store.append("XAUUSD", df)  -> {"new_rows": ..., "partitions_written": [...]}
+    store.read("XAUUSD", "2024-06-01", "2024-06-30")  (store.last_read : partitions lues)
+    """
+
+    def __init__(self, root: str, format: Optional[str] = None):
+        self.root = root
+        self.format = format or ("parquet" if PARQUET_AVAILABLE else "pickle")
+        if self.format == "parquet" and not PARQUET_AVAILABLE:
+            raise ImportError("pyarrow est requis pour le format parquet")
+        self.extension = "parquet" if self.format == "parquet" else "pkl"
+        self.last_read: List[str] = []
+
+    # ------------------------------------------------------------------
+    # Partitions
+    # ------------------------------------------------------------------
+
+    def _path(self, symbol: str, year: int, month: int) -> str:
+        return os.path.join(self.root, symbol, f"{year:04d}", f"{month:02d}.{self.extension}")
+
+    def partitions(self, symbol: str) -> List[Tuple[int, int]]:
+        """(année, mois) disponibles, triés"""
+        directory = os.path.join(self.root, symbol)
+        if not os.path.isdir(directory):
+            return []
+        found = []
+        for year in os.listdir(directory):
+            if not year.isdigit():
+                continue
+            for name in os.listdir(os.path.join(directory, year)):
+                month, extension = os.path.splitext(name)
+                if month.isdigit() and extension == f".{self.extension}":
+                    found.append((int(year), int(month)))
+        return sorted(found)
+
+    def _read_partition(self, path: str) -> pd.DataFrame:
+        if self.format == "parquet":
+            return pd.read_parquet(path)
+        return pd.read_pickle(path)
+
+    def _write_partition(self, path: str, df: pd.DataFrame):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        if self.format == "parquet":
+            df.to_parquet(tmp_path)
+        else:
+            pd.to_pickle(df, tmp_path, protocol=5)
+        os.replace(tmp_path, path)
+
+    # ------------------------------------------------------------------
+    # Écriture / lecture
+    # ------------------------------------------------------------------
+
+    def append(self, symbol: str, df: pd.DataFrame) -> Dict[str, Any]:
+        """Fusionne les bougies dans leurs partitions mensuelles (dédupliquées, triées)"""
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise ValueError("Index datetime requis pour le store partitionné")
+
+        keys = df.index.year * 100 + df.index.month
+        written, new_rows = [], 0
+        for key in np.unique(keys):
+            year, month = divmod(int(key), 100)
+            path = self._path(symbol, year, month)
+            incoming = df[keys == key]
+            if os.path.exists(path):
+                existing = self._read_partition(path)
+                merged = pd.concat([existing, incoming])
+                before = len(existing)
+            else:
+                merged, before = incoming, 0
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            new_rows += len(merged) - before
+            self._write_partition(path, merged)
+            written.append(path)
+        return {"new_rows": new_rows, "partitions_written": written}
+
+    def read(self, symbol: str, start=None, end=None) -> pd.DataFrame:
+        """Bougies start <= t <= end, en ne lisant que les partitions qui recoupent la plage"""
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+
+        selected = []
+        for year, month in self.partitions(symbol):
+            first = pd.Timestamp(year=year, month=month, day=1)
+            if (end is not None and first > end) or (start is not None and first + pd.offsets.MonthBegin(1) <= start):
+                continue
+            selected.append(self._path(symbol, year, month))
+
+        self.last_read = selected
+        if not selected:
+            raise FileNotFoundError(f"Aucune partition pour {symbol} sur la plage demandée")
+        df = pd.concat([self._read_partition(path) for path in selected])
+        return df.loc[start:end] if start is not None or end is not None else df
+
+    def last_timestamp(self, symbol: str) -> Optional[pd.Timestamp]:
+        """Dernière bougie stockée (lecture de la seule partition de queue)"""
+        partitions = self.partitions(symbol)
+        if not partitions:
+            return None
+        return self._read_partition(self._path(symbol, *partitions[-1])).index.max()
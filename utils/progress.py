@@ -0,0 +1,136 @@
+"""
+Progress Renderer
+-----------------
+Affichage de l'avancement des symboles sans bloquer les workers :
+
+- les workers (threads ou process) déposent des événements (symbole, action, détails)
+  dans une file multiprocessing, sans verrou partagé ni accès au terminal ;
+- un seul thread de rendu vide la file et redessine le tableau au plus max_fps fois
+  par seconde (effacement par séquence ANSI, aucun sous-process) ;
+- si la sortie n'est pas un terminal, chaque événement est écrit sur une ligne simple.
+"""
+
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, TextIO, Tuple
+
+Event = Tuple[float, str, str, str]
+
+_STOP = None
+_CLEAR_SCREEN = "\x1b[H\x1b[2J"  # curseur en haut à gauche + effacement (équivalent de clear)
+
+
+class ProgressRenderer:
+    """
+    renderer.push("XAUUSD", "Chargement", "4 000 lignes") depuis n'importe quel thread ;
+    renderer.queue peut être passée aux process workers (initializer) qui y déposent
+    des tuples (time.time(), symbole, action, détails).
+    """
+
+    def __init__(self, title: str = "🔄 ACTIVITÉ DES FICHIERS EN TEMPS RÉEL", max_fps: float = 10.0,
+                 stream: Optional[TextIO] = None, interactive: Optional[bool] = None):
+        self.title = title
+        self.min_interval = 1.0 / max_fps
+        self.stream = stream or sys.stdout
+        isatty = getattr(self.stream, "isatty", lambda: False)
+        self.interactive = isatty() if interactive is None else interactive
+        self.queue = multiprocessing.get_context().Queue()
+        self.state: Dict[str, Dict[str, str]] = {}
+        self.frames = 0
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Côté workers
+    # ------------------------------------------------------------------
+
+    def push(self, symbol: str, action: str, details: str = ""):
+        """Dépose un événement (non bloquant) ; démarre le rendu au premier appel"""
+        if self._thread is None:
+            self.start()
+        self.queue.put((time.time(), symbol, action, details))
+
+    # ------------------------------------------------------------------
+    # Thread de rendu
+    # ------------------------------------------------------------------
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="progress-renderer", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Vide la file, dessine l'état final et arrête le thread de rendu"""
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self.queue.put(_STOP)
+            thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _apply(self, event: Event):
+        timestamp, symbol, action, details = event
+        self.state[symbol] = {
+            "timestamp": datetime.fromtimestamp(timestamp).strftime("%H:%M:%S.%f")[:-3],
+            "action": action,
+            "details": details,
+        }
+        if not self.interactive:
+            entry = self.state[symbol]
+            self.stream.write(f"[{entry['timestamp']}] {symbol}: {action} | {details}\n")
+
+    def _drain(self, timeout: float) -> Tuple[int, bool]:
+        """Applique tous les événements disponibles ; (nombre appliqué, arrêt demandé)"""
+        applied = 0
+        try:
+            event = self.queue.get(timeout=timeout)
+            while True:
+                if event is _STOP:
+                    return applied, True
+                self._apply(event)
+                applied += 1
+                event = self.queue.get_nowait()
+        except queue.Empty:
+            return applied, False
+
+    def _run(self):
+        last_draw = 0.0
+        dirty = False
+        while True:
+            applied, stopping = self._drain(timeout=self.min_interval)
+            dirty = dirty or applied > 0
+            if not self.interactive:
+                if applied:
+                    self.stream.flush()
+            elif dirty and (stopping or time.monotonic() - last_draw >= self.min_interval):
+                self._draw()
+                last_draw = time.monotonic()
+                dirty = False
+            if stopping:
+                return
+
+    def render(self) -> str:
+        lines = [self.title, "=" * 60]
+        for symbol, activity in self.state.items():
+            status = "🟢" if "terminé" in activity["action"].lower() else "🟡"
+            lines.append(f"{status} {symbol}: {activity['action']}")
+            lines.append(f"   ⏰ {activity['timestamp']} | {activity['details']}")
+        lines.append("-" * 60)
+        return "\n".join(lines)
+
+    def _draw(self):
+        """Efface l'écran (séquence ANSI, pas de sous-process) et écrit le cadre en une fois"""
+        self.stream.write(_CLEAR_SCREEN + self.render() + "\n")
+        self.stream.flush()
+        self.frames += 1
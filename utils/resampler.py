@@ -0,0 +1,188 @@
+"""
+Timeframe Resampler
+-------------------
+Construction des bougies 1h / 4h / D à partir des données de base (15m dans data/).
+
+- Agrégation vectorisée (bornes de seaux + reduceat), sans groupby par bougie.
+- Cache par symbole, mis à jour incrémentalement : seules les bougies du dernier seau
+  encore ouvert sont recalculées quand de nouvelles bougies de base arrivent.
+- Alignement sans look-ahead : une bougie HTF n'est visible qu'à partir de la bougie de
+  base dont la clôture termine le seau (horodatage + pas de base >= fin du seau).
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from indicators.cache import IndicatorCache
+
+TIMEFRAMES = {"1h": pd.Timedelta("1h"), "4h": pd.Timedelta("4h"), "D": pd.Timedelta("1D")}
+
+
+def timeframe_delta(timeframe: str) -> pd.Timedelta:
+    """Durée d'un timeframe ("1h", "4h", "D" ou toute durée pandas divisant une journée)"""
+    delta = TIMEFRAMES.get(timeframe) or pd.Timedelta(timeframe)
+    if delta <= pd.Timedelta(0) or pd.Timedelta("1D") % delta != pd.Timedelta(0):
+        raise ValueError(f"Timeframe invalide: {timeframe} (doit diviser une journée)")
+    return delta
+
+
+def base_step(index: pd.DatetimeIndex) -> pd.Timedelta:
+    """Pas des bougies de base : plus petit écart positif entre deux horodatages"""
+    if len(index) < 2:
+        return pd.Timedelta(0)
+    diffs = np.diff(index.values)
+    diffs = diffs[diffs > np.timedelta64(0)]
+    return pd.Timedelta(diffs.min()) if len(diffs) else pd.Timedelta(0)
+
+
+def resample_ohlc(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    Bougies HTF (open / high / low / close, volumes sommés s'ils existent) indexées par
+    le début du seau, avec "end" = fin du seau et "bars" = nombre de bougies de base.
+    Les seaux sont alignés sur minuit (index naïf dans le fuseau du broker).
+    """
+    delta = timeframe_delta(timeframe)
+    if len(df) == 0:
+        return pd.DataFrame(columns=["open", "high", "low", "close", "bars", "end"])
+
+    stamps = df.index.values
+    unit = np.timedelta64(delta.to_timedelta64()).astype(f"timedelta64[{np.datetime_data(stamps.dtype)[0]}]")
+    ticks = stamps.astype(np.int64)
+    buckets = ticks - ticks % unit.astype(np.int64)
+    starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    ends = np.append(starts[1:], len(df))
+
+    bucket_index = pd.DatetimeIndex(buckets[starts].astype(stamps.dtype), name=df.index.name)
+    bars = pd.DataFrame({
+        "open": df["open"].to_numpy()[starts],
+        "high": np.maximum.reduceat(df["high"].to_numpy(), starts),
+        "low": np.minimum.reduceat(df["low"].to_numpy(), starts),
+        "close": df["close"].to_numpy()[ends - 1],
+    }, index=bucket_index)
+    for column in ("tickvol", "vol"):
+        if column in df.columns:
+            bars[column] = np.add.reduceat(df[column].to_numpy(), starts)
+    bars["bars"] = ends - starts
+    bars["end"] = bucket_index + delta
+    return bars
+
+
+def align_to_base(values: np.ndarray, htf_end: np.ndarray, base_index: pd.DatetimeIndex,
+                  step: Optional[pd.Timedelta] = None) -> np.ndarray:
+    """
+    Valeur HTF visible à chaque bougie de base : dernière bougie HTF dont la fin est
+    <= clôture de la bougie de base (horodatage + pas). NaN avant la première.
+    """
+    step = base_step(base_index) if step is None else step
+    closes = base_index.values + step.to_timedelta64()
+    position = np.searchsorted(np.asarray(htf_end, dtype=closes.dtype), closes, side="right") - 1
+    result = np.asarray(values, dtype=float)[np.maximum(position, 0)]
+    result[position < 0] = np.nan
+    return result
+
+
+class TimeframeResampler:
+    """
+    Cache des bougies HTF par symbole (load / update) et, pour la stratégie,
+    par empreinte du DataFrame de base (for_frame, LRU borné en nombre d'entrées).
+    """
+
+    def __init__(self, timeframes: Iterable[str] = ("1h", "4h", "D"), max_frames: int = 32):
+        self.timeframes = list(timeframes)
+        deltas = [timeframe_delta(tf) for tf in self.timeframes]
+        self._largest = max(deltas)
+        if any(self._largest % delta != pd.Timedelta(0) for delta in deltas):
+            raise ValueError("Chaque timeframe doit diviser le plus grand")
+        self.max_frames = max_frames
+        self._symbols: Dict[str, Dict] = {}
+        self._frames: "OrderedDict[str, Dict[str, pd.DataFrame]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _tail(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Bougies de base du dernier seau du plus grand timeframe (seau encore ouvert)"""
+        if len(df) == 0:
+            return df
+        last_bucket = df.index[-1].floor(self._largest)
+        return df.iloc[df.index.searchsorted(last_bucket, side="left"):]
+
+    def load(self, symbol: str, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """Construit (ou reconstruit) toutes les bougies HTF d'un symbole"""
+        entry = {
+            "bars": {tf: resample_ohlc(df, tf) for tf in self.timeframes},
+            "tail": self._tail(df),
+            "step": base_step(df.index),
+        }
+        with self._lock:
+            self._symbols[symbol] = entry
+        return entry["bars"]
+
+    def update(self, symbol: str, new_bars: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        Ajoute des bougies de base postérieures à la dernière connue ; seuls les seaux
+        à partir du dernier seau ouvert sont recalculés.
+        """
+        entry = self._symbols.get(symbol)
+        if entry is None:
+            return self.load(symbol, new_bars)
+
+        tail = entry["tail"]
+        if len(tail):
+            new_bars = new_bars[new_bars.index > tail.index[-1]]
+        if len(new_bars) == 0:
+            return entry["bars"]
+
+        segment = pd.concat([tail, new_bars]) if len(tail) else new_bars
+        start = segment.index[0].floor(self._largest)
+        for tf in self.timeframes:
+            bars = entry["bars"][tf]
+            kept = bars.iloc[:bars.index.searchsorted(start, side="left")]
+            entry["bars"][tf] = pd.concat([kept, resample_ohlc(segment, tf)]) if len(kept) else resample_ohlc(segment, tf)
+        entry["tail"] = self._tail(segment)
+        step = base_step(segment.index)
+        if step > pd.Timedelta(0):
+            entry["step"] = min(entry["step"], step) if entry["step"] > pd.Timedelta(0) else step
+        return entry["bars"]
+
+    def bars(self, symbol: str, timeframe: str) -> pd.DataFrame:
+        return self._symbols[symbol]["bars"][timeframe]
+
+    def aligned(self, symbol: str, timeframe: str, base_index: pd.DatetimeIndex, values) -> np.ndarray:
+        """Aligne une série calculée sur les bougies HTF d'un symbole sur un index de base"""
+        entry = self._symbols[symbol]
+        bars = entry["bars"][timeframe]
+        return align_to_base(np.asarray(values), bars["end"].to_numpy(), base_index, entry["step"])
+
+    def for_frame(self, df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+        """Bougies HTF d'un DataFrame de base, servies depuis le cache si déjà calculées"""
+        key = IndicatorCache.fingerprint(df.index.values.view(np.int64),
+                                         *(df[c].to_numpy() for c in ("open", "high", "low", "close")))
+        with self._lock:
+            frames = self._frames.get(key)
+            if frames is not None:
+                self._frames.move_to_end(key)
+                if timeframe in frames:
+                    self.hits += 1
+                    return frames[timeframe]
+        bars = resample_ohlc(df, timeframe)
+        with self._lock:
+            self.misses += 1
+            self._frames.setdefault(key, {})[timeframe] = bars
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_frames:
+                self._frames.popitem(last=False)
+        return bars
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"symbols": len(self._symbols), "frames": len(self._frames),
+                    "hits": self.hits, "misses": self.misses}
+
+
+# Resampler partagé par défaut (process courant)
+default_resampler = TimeframeResampler()
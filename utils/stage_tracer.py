@@ -0,0 +1,105 @@
+"""
+Stage Tracer
+------------
+Mesure par symbole et par étape (chargement, indicateurs, exécution, rapport, sauvegarde) :
+temps réel, temps CPU du thread et pic mémoire tracemalloc pendant l'étape.
+
+Le pic est relatif à la mémoire allouée au début de l'étape (tracemalloc.reset_peak) ;
+si des étapes de plusieurs threads se chevauchent, les pics mémoire sont approximatifs.
+"""
+
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+STAGES = ["load", "indicators", "execution", "report", "save"]
+
+
+class StageTracer:
+    """
+    with tracer.stage("XAUUSD", "load"): ...
+    tracer.for_symbol("XAUUSD") -> temps par étape ; tracer.summary() -> agrégat du run
+    """
+
+    def __init__(self, memory: bool = True):
+        self.memory = memory
+        self.records: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+
+    def start(self):
+        """Active tracemalloc si nécessaire (arrêté par stop() seulement si démarré ici)"""
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stop(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def stage(self, symbol: str, name: str) -> Iterator[None]:
+        tracing = self.memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            base_memory = tracemalloc.get_traced_memory()[0]
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            record = {
+                "wall_seconds": round(time.perf_counter() - wall, 6),
+                "cpu_seconds": round(time.thread_time() - cpu, 6),
+            }
+            if tracing:
+                record["peak_memory_mb"] = round(max(0, tracemalloc.get_traced_memory()[1] - base_memory) / 2**20, 3)
+            with self._lock:
+                self.records.setdefault(symbol, {})[name] = record
+
+    def add(self, symbol: str, stages: Dict[str, Dict[str, float]]):
+        """Ajoute des étapes mesurées ailleurs (ex. dans un process worker)"""
+        with self._lock:
+            self.records.setdefault(symbol, {}).update({name: dict(r) for name, r in stages.items()})
+
+    def for_symbol(self, symbol: str) -> Dict[str, Any]:
+        """Étapes d'un symbole + total (copie, sérialisable en JSON)"""
+        with self._lock:
+            stages = {name: dict(record) for name, record in self.records.get(symbol, {}).items()}
+        return {
+            "stages": stages,
+            "total_wall_seconds": round(sum(r["wall_seconds"] for r in stages.values()), 6),
+            "total_cpu_seconds": round(sum(r["cpu_seconds"] for r in stages.values()), 6),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Agrégat par étape sur tous les symboles, part du temps total et étape dominante"""
+        with self._lock:
+            records = {symbol: dict(stages) for symbol, stages in self.records.items()}
+
+        names: List[str] = [s for s in STAGES if any(s in stages for stages in records.values())]
+        names += sorted({s for stages in records.values() for s in stages} - set(names))
+        total_wall = sum(r["wall_seconds"] for stages in records.values() for r in stages.values())
+
+        per_stage = {}
+        for name in names:
+            rows = [stages[name] for stages in records.values() if name in stages]
+            wall = sum(r["wall_seconds"] for r in rows)
+            per_stage[name] = {
+                "wall_seconds": round(wall, 6),
+                "cpu_seconds": round(sum(r["cpu_seconds"] for r in rows), 6),
+                "max_wall_seconds": round(max(r["wall_seconds"] for r in rows), 6),
+                "share_percent": round(wall / total_wall * 100, 1) if total_wall > 0 else 0.0,
+            }
+            peaks = [r["peak_memory_mb"] for r in rows if "peak_memory_mb" in r]
+            if peaks:
+                per_stage[name]["max_peak_memory_mb"] = max(peaks)
+
+        return {
+            "symbols": len(records),
+            "total_wall_seconds": round(total_wall, 6),
+            "stages": per_stage,
+            "dominant_stage": max(per_stage, key=lambda s: per_stage[s]["wall_seconds"]) if per_stage else None,
+        }
@@ -0,0 +1,300 @@
+"""
+Synthetic Market Data
+---------------------
+Générateur de séries OHLC / tick volume / spread au format CSV MT5 (tabulations,
+<DATE> <TIME> <OPEN> <HIGH> <LOW> <CLOSE> <TICKVOL> <VOL> <SPREAD>) lu par FileManager.
+
+Modèle de prix : mouvement brownien géométrique, avec en option
+  - changement de régimes (calme / tendance haussière / baissière / volatil),
+    durées géométriques, chaîne de Markov entre régimes
+  - volatilité en grappes : log-volatilité AR(1) (volatilité stochastique)
+
+Les bougies sont produites par blocs de taille fixe alignés sur l'index absolu :
+la sortie ne dépend que de la graine, pas de la taille des chunks d'écriture,
+et un fichier de 100M bougies est écrit sans jamais être entièrement en mémoire.
+
+Usage :
+    python -m utils.synthetic_data --symbols SYNTH1 SYNTH2 --bars 1M --regimes --clustering --seed 42
+"""
+
+import argparse
+import os
+import zlib
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+MT5_COLUMNS = ["<DATE>", "<TIME>", "<OPEN>", "<HIGH>", "<LOW>", "<CLOSE>", "<TICKVOL>", "<VOL>", "<SPREAD>"]
+
+# Régimes : (dérive annuelle, multiplicateur de volatilité)
+REGIMES = {
+    "calm": (0.0, 0.6),
+    "trend_up": (0.8, 1.0),
+    "trend_down": (-0.8, 1.0),
+    "volatile": (0.0, 2.0),
+}
+
+_BLOCK = 65536  # bougies générées par tirage (indépendant de la taille des chunks)
+
+
+def parse_bars(value: str) -> int:
+    """'10k' -> 10000, '100M' -> 100000000"""
+    factors = {"k": 10**3, "M": 10**6}
+    if value[-1] in factors:
+        return int(float(value[:-1]) * factors[value[-1]])
+    return int(value)
+
+
+def _ar1(shocks: np.ndarray, phi: float, h0: float) -> np.ndarray:
+    """
+    h[t] = phi * h[t-1] + shocks[t], vectorisé par sous-blocs :
+    h[j] = phi^(j+1) * h0 + phi^j * cumsum(shocks[k] * phi^-k)
+    (sous-blocs assez courts pour que phi^-k reste borné)
+    """
+    n = len(shocks)
+    out = np.empty(n)
+    if phi == 0.0:
+        out[:] = shocks
+        return out
+    size = int(min(1024, max(1, 27.0 / -np.log(phi))))  # phi^-size <= ~1e12
+    powers = phi ** np.arange(size + 1)
+    inverse = 1.0 / powers[:size]
+    for start in range(0, n, size):
+        block = shocks[start:start + size]
+        m = len(block)
+        out[start:start + m] = powers[:m] * np.cumsum(block * inverse[:m]) + powers[1:m + 1] * h0
+        h0 = out[start + m - 1]
+    return out
+
+
+class SyntheticMarket:
+    """
+    Générateur de bougies reproductible (seed) pour un symbole.
+    frames() produit des DataFrames au format MT5 par chunks, write_csv() les écrit en flux.
+    """
+
+    def __init__(
+        self,
+        start_price: float = 2000.0,
+        annual_drift: float = 0.0,
+        annual_volatility: float = 0.15,
+        freq: str = "15min",
+        start: str = "2020-01-01",
+        digits: int = 2,
+        spread_points: int = 20,
+        tick_volume: int = 1000,
+        regime_switching: bool = False,
+        regime_duration: int = 2000,  # durée moyenne d'un régime (bougies)
+        volatility_clustering: bool = False,
+        vol_persistence: float = 0.98,
+        vol_of_vol: float = 0.5,
+        skip_weekends: bool = True,
+        seed: Optional[Union[int, np.random.SeedSequence]] = None
+    ):
+        if not 0.0 <= vol_persistence < 1.0:
+            raise ValueError("vol_persistence doit être dans [0, 1)")
+        self.start_price = start_price
+        self.annual_drift = annual_drift
+        self.annual_volatility = annual_volatility
+        self.step = pd.Timedelta(freq)
+        if pd.Timedelta("1D") % self.step != pd.Timedelta(0):
+            raise ValueError(f"Fréquence invalide: {freq} (doit diviser une journée)")
+        self.start = pd.Timestamp(start).normalize()
+        self.digits = digits
+        self.spread_points = spread_points
+        self.tick_volume = tick_volume
+        self.regime_switching = regime_switching
+        self.regime_duration = regime_duration
+        self.volatility_clustering = volatility_clustering
+        self.vol_persistence = vol_persistence
+        self.vol_of_vol = vol_of_vol
+        self.skip_weekends = skip_weekends
+        self.seed = seed
+
+        self.bars_per_day = int(pd.Timedelta("1D") / self.step)
+        days_per_year = 252 if skip_weekends else 365
+        self.dt = 1.0 / (days_per_year * self.bars_per_day)
+
+    # ------------------------------------------------------------------
+    # Génération par blocs
+    # ------------------------------------------------------------------
+
+    def _reset(self):
+        self._rng = np.random.default_rng(self.seed)
+        self._log_price = np.log(self.start_price)
+        self._log_vol = 0.0
+        self._regime = 0
+        self._regime_left = 0
+        self._position = 0
+
+    def _regimes(self, m: int):
+        """Dérive et multiplicateur de volatilité par bougie (segments de régimes)"""
+        params = np.array(list(REGIMES.values()))
+        ids = np.empty(m, dtype=np.int64)
+        filled = 0
+        while filled < m:
+            if self._regime_left == 0:
+                # Nouveau régime (différent du précédent) et nouvelle durée géométrique
+                self._regime = (self._regime + int(self._rng.integers(1, len(params)))) % len(params)
+                self._regime_left = int(self._rng.geometric(1.0 / self.regime_duration))
+            take = min(self._regime_left, m - filled)
+            ids[filled:filled + take] = self._regime
+            self._regime_left -= take
+            filled += take
+        return params[ids, 0], params[ids, 1]
+
+    def _timestamps(self, start: int, m: int) -> np.ndarray:
+        bars = np.arange(start, start + m)
+        day, slot = np.divmod(bars, self.bars_per_day)
+        first_day = np.datetime64(self.start.date())
+        if self.skip_weekends:
+            days = np.busday_offset(first_day, day, roll="forward")
+        else:
+            days = first_day + day.astype("timedelta64[D]")
+        return days.astype("datetime64[ns]") + slot * self.step.to_timedelta64()
+
+    def _block(self, m: int) -> Dict[str, np.ndarray]:
+        rng = self._rng
+        z = rng.standard_normal(m)
+        wicks = np.abs(rng.standard_normal((2, m)))
+        volume_noise = rng.lognormal(0.0, 0.3, m)
+        spread_noise = rng.integers(0, 3, m)
+
+        drift = np.full(m, self.annual_drift)
+        vol_mult = np.ones(m)
+        if self.regime_switching:
+            regime_drift, regime_vol = self._regimes(m)
+            drift = drift + regime_drift
+            vol_mult = vol_mult * regime_vol
+        if self.volatility_clustering:
+            phi, nu = self.vol_persistence, self.vol_of_vol
+            shocks = rng.standard_normal(m) * nu * np.sqrt(1.0 - phi * phi)
+            log_vol = _ar1(shocks, phi, self._log_vol)
+            self._log_vol = log_vol[-1]
+            vol_mult = vol_mult * np.exp(log_vol - 0.5 * nu * nu)  # moyenne ~1
+
+        sigma = self.annual_volatility * vol_mult
+        bar_sigma = sigma * np.sqrt(self.dt)
+        log_close = self._log_price + np.cumsum((drift - 0.5 * sigma * sigma) * self.dt + bar_sigma * z)
+        log_open = np.empty(m)
+        log_open[0] = self._log_price
+        log_open[1:] = log_close[:-1]
+        self._log_price = log_close[-1]
+
+        close = np.exp(log_close).round(self.digits)
+        open_ = np.exp(log_open).round(self.digits)
+        high = np.maximum(np.maximum(open_, close),
+                          (np.exp(np.maximum(log_open, log_close) + 0.5 * bar_sigma * wicks[0])).round(self.digits))
+        low = np.minimum(np.minimum(open_, close),
+                         (np.exp(np.minimum(log_open, log_close) - 0.5 * bar_sigma * wicks[1])).round(self.digits))
+
+        # Activité et spread plus élevés quand la volatilité et le mouvement sont forts
+        tickvol = np.maximum(1, np.round(self.tick_volume * vol_mult * (0.5 + np.abs(z)) * volume_noise)).astype(np.int64)
+        spread = np.maximum(1, np.round(self.spread_points * (0.7 + 0.3 * vol_mult)) + spread_noise).astype(np.int64)
+
+        return {"stamps": self._timestamps(self._position, m), "open": open_, "high": high,
+                "low": low, "close": close, "tickvol": tickvol, "spread": spread}
+
+    @staticmethod
+    def _format_values(values: np.ndarray, fmt) -> np.ndarray:
+        """Formate des dates / heures en ne convertissant que les valeurs distinctes"""
+        unique, inverse = np.unique(values, return_inverse=True)
+        return np.array([fmt(v) for v in unique], dtype=object)[inverse]
+
+    def _to_mt5(self, block: Dict[str, np.ndarray]) -> pd.DataFrame:
+        stamps = block["stamps"]
+        days = stamps.astype("datetime64[D]")
+        time_of_day = (stamps - days).astype("timedelta64[s]").astype(np.int64)
+        dates = self._format_values(days, lambda d: str(d).replace("-", "."))
+        times = self._format_values(time_of_day,
+                                    lambda s: f"{s // 3600:02d}:{s % 3600 // 60:02d}:{s % 60:02d}")
+        return pd.DataFrame({
+            "<DATE>": dates, "<TIME>": times,
+            "<OPEN>": block["open"], "<HIGH>": block["high"], "<LOW>": block["low"], "<CLOSE>": block["close"],
+            "<TICKVOL>": block["tickvol"], "<VOL>": np.zeros(len(stamps), dtype=np.int64),
+            "<SPREAD>": block["spread"],
+        }, columns=MT5_COLUMNS)
+
+    def frames(self, n_bars: int, chunk_size: int = 1_000_000) -> Iterator[pd.DataFrame]:
+        """Bougies au format MT5 par chunks de chunk_size (même série quelle que soit la taille)"""
+        self._reset()
+        pending: List[pd.DataFrame] = []
+        pending_rows = 0
+        while self._position < n_bars:
+            m = min(_BLOCK, n_bars - self._position)
+            frame = self._to_mt5(self._block(m))
+            self._position += m
+            pending.append(frame)
+            pending_rows += m
+            while pending_rows >= chunk_size or (self._position >= n_bars and pending_rows):
+                merged = pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0]
+                take = min(chunk_size, pending_rows)
+                yield merged.iloc[:take].reset_index(drop=True)
+                rest = merged.iloc[take:]
+                pending = [rest] if len(rest) else []
+                pending_rows = len(rest)
+
+    def generate(self, n_bars: int) -> pd.DataFrame:
+        """Série complète en mémoire (petites tailles)"""
+        return pd.concat(list(self.frames(n_bars, chunk_size=max(n_bars, 1))), ignore_index=True)
+
+    def write_csv(self, path: str, n_bars: int, chunk_size: int = 1_000_000) -> str:
+        """Écrit la série en flux (chunk par chunk), via un fichier temporaire renommé à la fin"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = path + ".tmp"
+        float_format = f"%.{self.digits}f"
+        with open(tmp_path, "w", newline="") as f:
+            for i, frame in enumerate(self.frames(n_bars, chunk_size)):
+                frame.to_csv(f, sep="\t", index=False, header=i == 0, float_format=float_format)
+        os.replace(tmp_path, path)
+        return path
+
+
+def symbol_seed(seed: Optional[int], symbol: str) -> np.random.SeedSequence:
+    """Graine propre à chaque symbole (stable quel que soit l'ordre des symboles)"""
+    return np.random.SeedSequence([0 if seed is None else seed, zlib.crc32(symbol.encode())])
+
+
+def write_symbols(symbols: List[str], n_bars: int, data_dir: str, seed: Optional[int] = None,
+                  chunk_size: int = 1_000_000, **market_kwargs) -> Dict[str, str]:
+    """Un CSV <data_dir>/<symbol>.csv par symbole ; retourne {symbole: chemin}"""
+    paths = {}
+    for symbol in symbols:
+        market = SyntheticMarket(seed=symbol_seed(seed, symbol), **market_kwargs)
+        paths[symbol] = market.write_csv(os.path.join(data_dir, f"{symbol}.csv"), n_bars, chunk_size)
+    return paths
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, str]:
+    parser = argparse.ArgumentParser(description="Génération de CSV MT5 synthétiques")
+    parser.add_argument("--symbols", nargs="+", default=["SYNTH"])
+    parser.add_argument("--bars", default="100k", help="Bougies par symbole (10k, 1M, 100M...)")
+    parser.add_argument("--out-dir", default="data/synthetic")
+    parser.add_argument("--chunk-size", default="1M")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--start-price", type=float, default=2000.0)
+    parser.add_argument("--volatility", type=float, default=0.15, help="Volatilité annualisée")
+    parser.add_argument("--drift", type=float, default=0.0, help="Dérive annualisée")
+    parser.add_argument("--freq", default="15min")
+    parser.add_argument("--start", default="2020-01-01")
+    parser.add_argument("--digits", type=int, default=2)
+    parser.add_argument("--regimes", action="store_true", help="Changements de régimes")
+    parser.add_argument("--clustering", action="store_true", help="Volatilité en grappes")
+    parser.add_argument("--with-weekends", action="store_true", help="Bougies aussi le week-end")
+    args = parser.parse_args(argv)
+
+    n_bars = parse_bars(args.bars)
+    paths = write_symbols(
+        args.symbols, n_bars, args.out_dir, seed=args.seed, chunk_size=parse_bars(args.chunk_size),
+        start_price=args.start_price, annual_volatility=args.volatility, annual_drift=args.drift,
+        freq=args.freq, start=args.start, digits=args.digits, regime_switching=args.regimes,
+        volatility_clustering=args.clustering, skip_weekends=not args.with_weekends,
+    )
+    for symbol, path in paths.items():
+        print(f"✅ {symbol}: {n_bars:,} bougies -> {path}")
+    return paths
+
+
+if __name__ == "__main__":
+    main()